@@ -1,14 +1,54 @@
 from time import sleep
-from utility import Utility, ThreadControl
+from collections.abc import Iterator
+from render_loop import RenderLoop, play_steps_async
 from text_color import TextColor
+from sound import Sound
+from text_style import style_text, style_text_bytes, style_glyphs, next_rainbow_index
 from random import choice
-import sys
 class Animation:
     """
     This class provides methods to create text animations in the console.
     It uses various text colors and can animate the text with a typing effect.
     """
 
+    @staticmethod
+    def animated_text_steps(static_text: str = "", animated_text: str = "...", end_text:str = "", static_text_color: TextColor = TextColor.RESET, animated_text_color: TextColor = TextColor.RESET, end_text_color: TextColor = TextColor.RESET, delay_between_chars: float = 0.1, stop_event = None) -> Iterator[tuple[bytes, float]]:
+        """
+        Generates the output of a typing animation one step at a time, without writing or sleeping itself, so any driver can play it.
+        The styled output comes precompiled from text_style. Each step only adds the next glyph to what is already on the line;
+        the line is rewritten only when the animation starts over with the static text.
+
+        Parameters:
+        - static_text (str): Text to remain static before the animated text.
+        - animated_text (str): Text to be animated, like a loading spinner.
+        - end_text (str): Text to display after the animation ends.
+        - static_text_color (TextColor): Color of the static text.
+        - animated_text_color (TextColor): Color of the animated text.
+        - end_text_color (TextColor): Color of the end text.
+        - delay_between_chars (float): Time in seconds between each character's animation.
+        - stop_event (threading.Event | asyncio.Event): Event to stop the animation. It is checked each time the animated text is complete; without one the animated text plays once.
+
+        Yields:
+        tuple[bytes, float]: The output to write and the time in seconds to wait after writing it.
+        """
+        static_text_with_color = style_text(static_text, static_text_color)
+        rainbow_index = next_rainbow_index(static_text) if static_text_color == TextColor.RAINBOW else 0
+        animated_glyphs, animated_rainbow_index = style_glyphs(animated_text, animated_text_color, rainbow_index)
+        if animated_text_color == TextColor.RAINBOW:
+            rainbow_index = animated_rainbow_index
+        end_text_with_color = style_text_bytes(end_text, end_text_color, rainbow_index)
+
+        # Restarting the line overwrites it in place and only then erases what is left of the previous pass, so it never flickers
+        restart_line = ("\r" + static_text_with_color + "\033[K").encode("utf-8")
+
+        while True:
+            yield restart_line, delay_between_chars
+            for glyph in animated_glyphs:
+                yield glyph, delay_between_chars
+            if stop_event is None or stop_event.is_set():
+                break
+        yield end_text_with_color, 0.0
+
     @staticmethod
     def animated_text(static_text: str = "", animated_text: str = "...", end_text:str = "", static_text_color: TextColor = TextColor.RESET, animated_text_color: TextColor = TextColor.RESET, end_text_color: TextColor = TextColor.RESET, delay_between_chars: float = 0.1, stop_event = None, continue_thread_after_stop_for = 0.001):
         """
@@ -26,72 +66,48 @@ class Animation:
         - continue_thread_after_stop_for (float): Time in seconds to continue the thread after a stop event is set.
 
         Returns:
-        ThreadControl: A thread control object for the animation thread.
+        RenderJob: A handle to stop the animation, which runs on the shared render loop.
         """
-        def animated_text_thread(stop_event=None):
-            """
-            Inner function that runs the animation loop. This function is designed to be run in a separate thread to allow asynchronous text animation.
-
-            Parameters:
-            - stop_event (threading.Event): Event to stop the animation thread externally.
-            """
-            while True:
-                if stop_event and stop_event.is_set():
-                    break
-                Utility.clear_line()
-                static_text_with_color = ""
-                if static_text_color == TextColor.RAINBOW:
-                    rainbow_index = 0
-                    for letter in static_text:
-                        static_text_with_color += static_text_color.value[rainbow_index] + letter + TextColor.RESET.value
-                        rainbow_index += 1
-                        if rainbow_index == len(TextColor.RAINBOW.value):
-                            rainbow_index = 0
-                else:
-                    static_text_with_color = f"{static_text_color.value}{static_text}{TextColor.RESET.value}"
-                sys.stdout.write(static_text_with_color)
-                sys.stdout.flush()
-                #print(f"{static_text_with_color}", end="")
-                sleep(delay_between_chars)
-                animated_text_with_color = ""
-                rainbow_index = rainbow_index if static_text_color == TextColor.RAINBOW else 0
-                for i in range(len(animated_text)):
-                    if animated_text_color == TextColor.RAINBOW:
-                        animated_text_with_color += animated_text_color.value[rainbow_index] + animated_text[i] + TextColor.RESET.value
-                        rainbow_index += 1
-                        if rainbow_index == len(TextColor.RAINBOW.value):
-                            rainbow_index = 0
-                        Utility.clear_line()
-                        sys.stdout.write(static_text_with_color + animated_text_with_color)
-                        sys.stdout.flush()
-                        #print(static_text_with_color + animated_text_with_color, end="")
-                        sleep(delay_between_chars)
-                    else:
-                        animated_text_with_color += f"{animated_text_color.value}{animated_text[i]}{TextColor.RESET.value}"
-                        Utility.clear_line()
-                        sys.stdout.write(static_text_with_color + animated_text_with_color)
-                        sys.stdout.flush()
-                        #print(f"{static_text_with_color}{animated_text_with_color}", end="")
-                        sleep(delay_between_chars)
-            if end_text_color == TextColor.RAINBOW:
-                if animated_text_color == TextColor.RAINBOW:
-                    rainbow_index = rainbow_index if animated_text_color == TextColor.RAINBOW else 0
-                elif static_text_color == TextColor.RAINBOW:
-                    rainbow_index = rainbow_index if static_text_color == TextColor.RAINBOW else 0
-                else:
-                    rainbow_index = 0
-                end_text_with_color = ""
-                for letter in end_text:
-                    end_text_with_color += end_text_color.value[rainbow_index] + letter + TextColor.RESET.value
-                    rainbow_index += 1
-                    if rainbow_index == len(TextColor.RAINBOW.value):
-                        rainbow_index = 0
-            else:
-                end_text_with_color = f"{end_text_color.value}{end_text}{TextColor.RESET.value}"
-            sys.stdout.write(end_text_with_color)
-            sys.stdout.flush()
-            #print("", end=end_text_with_color)
-        animation_thread = ThreadControl(animated_text_thread, stop_event)
-        animation_thread.start()
+        def make_steps(stop_event):
+            return Animation.animated_text_steps(static_text, animated_text, end_text, static_text_color, animated_text_color, end_text_color, delay_between_chars, stop_event)
+        animation_job = RenderLoop.shared().start_job(make_steps)
         sleep(continue_thread_after_stop_for)
-        return animation_thread
\ No newline at end of file
+        return animation_job
+
+    @staticmethod
+    def type_text_with_sound(animated_text: str, end_text: str = "\n", static_text: str = "", delay_between_chars: float = 0.03, sound_file: str = Sound.DIGITAL_TYPING, pause_after: float = 0.0):
+        """
+        Types out text once while a typing sound loops, and waits until it is done. The sound is tied to the animation, so it starts
+        with the first character and stops when the text is complete, however long the text is.
+
+        Parameters:
+        - animated_text (str): Text to type out.
+        - end_text (str): Text to display once the text is typed out.
+        - static_text (str): Text to remain static before the typed text.
+        - delay_between_chars (float): Time in seconds between each character.
+        - sound_file (str): The typing sound to loop.
+        - pause_after (float): Time in seconds to wait after the text is complete.
+        """
+        animation_job = RenderLoop.shared().start_job(lambda stop_event: Animation.animated_text_steps(static_text, animated_text, end_text, delay_between_chars=delay_between_chars))
+        typing_sound = Sound.play_looping(sound_file, stop_event=animation_job.finished_event)
+        animation_job.wait()
+        if typing_sound is not None:
+            typing_sound.stop()
+        sleep(pause_after)
+
+    @staticmethod
+    async def animated_text_async(static_text: str = "", animated_text: str = "...", end_text:str = "", static_text_color: TextColor = TextColor.RESET, animated_text_color: TextColor = TextColor.RESET, end_text_color: TextColor = TextColor.RESET, delay_between_chars: float = 0.1, stop_event = None):
+        """
+        Prints animated text to the console on the running asyncio event loop. Finishes once stop_event is set and the current pass of the animated text is complete.
+
+        Parameters:
+        - static_text (str): Text to remain static before the animated text.
+        - animated_text (str): Text to be animated, like a loading spinner.
+        - end_text (str): Text to display after the animation ends.
+        - static_text_color (TextColor): Color of the static text.
+        - animated_text_color (TextColor): Color of the animated text.
+        - end_text_color (TextColor): Color of the end text.
+        - delay_between_chars (float): Time in seconds between each character's animation.
+        - stop_event (asyncio.Event): Event to stop the animation. Without one the animated text plays once.
+        """
+        await play_steps_async(Animation.animated_text_steps(static_text, animated_text, end_text, static_text_color, animated_text_color, end_text_color, delay_between_chars, stop_event))
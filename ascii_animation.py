@@ -1,23 +1,157 @@
-from ascii_magic import AsciiArt  # type: ignore
+import numpy as np
+from PIL import Image
 import time, os, sys
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from utility import Utility, ThreadControl
+from frame_cache import AsciiFrameCache
+from frame_store import FrameStore, FRAME_STORE_EXTENSION, delta_stream_path, find_resolution_tiers, measure_frame
+from frame_diff import FrameDiffRenderer, downsample_frame, fit_frame_size
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from render_loop import RenderLoop, RenderJob, play_steps_async
 
-def _create_ascii_art_animation_from_images(image_folder_path: str, columns: int = 150) -> list[str]:
+# Glyphs ordered from least to most dense, matching ascii_magic so converted art looks the same
+CHARS_BY_DENSITY = ' .`-_\':,;^=+/"|)\\<>)iv%xclrs{*}I?!][1taeo7zjLunT#JCwfy325Fp6mqSghVd4EgXPGZbYkOA&8U$@KHDBWNMR0Q'
+
+# Terminal palette as (rgb, ANSI foreground code) pairs, in the order ascii_magic searches it
+ANSI_PALETTE = [
+    ((0, 0, 0), '\033[90m'),
+    ((0, 0, 255), '\033[34m'),
+    ((0, 255, 0), '\033[32m'),
+    ((255, 0, 0), '\033[31m'),
+    ((255, 255, 255), '\033[37m'),
+    ((255, 0, 255), '\033[35m'),
+    ((0, 255, 255), '\033[36m'),
+    ((255, 255, 0), '\033[33m'),
+]
+
+# Lookup tables indexed by an 8-bit channel value. They are built with Python floats so the vectorized
+# converter rounds exactly like the per-pixel one.
+_BRIGHTNESS_LUT = np.array([value / 255 for value in range(256)])
+_GLYPH_INDEX_LUT = np.array([int(value / 255 * (len(CHARS_BY_DENSITY) - 1)) for value in range(256)], dtype=np.intp)
+_LINEAR_RGB_LUT = np.array([(value / 255.0) ** 2.2 for value in range(256)])
+_PALETTE_LINEAR_RGB = np.array([[(value / 255.0) ** 2.2 for value in rgb] for rgb, _ in ANSI_PALETTE])
+# Identifies the converter output in frame cache keys. Change it whenever the output of _image_to_ascii changes.
+ASCII_CONVERTER_SETTINGS = "numpy-ascii-v1;width_ratio=2.2"
+
+_CELL_STRINGS = [color_code + char for _, color_code in ANSI_PALETTE for char in CHARS_BY_DENSITY]
+
+def _image_to_ascii(image: Image.Image, columns: int = 150, width_ratio: float = 2.2) -> str:
+    """
+    Converts a Pillow image to colored ASCII art using NumPy array operations.
+    Produces the same output as ascii_magic's AsciiArt.to_ascii(columns=columns) for RGB images.
+
+    Parameters:
+        image (Image.Image): The image to convert.
+        columns (int): The width of the ASCII art, in characters.
+        width_ratio (float): The height to width ratio of a terminal character cell.
+
+    Returns:
+        str: ASCII art representation of the image.
+    """
+    image_width, image_height = image.size
+    scalar = image_width * width_ratio / columns
+    resized_image = image.resize((int(image_width * width_ratio / scalar), int(image_height / scalar)))
+    grayscale = np.asarray(resized_image.convert("L"))
+    if resized_image.mode not in ("RGB", "RGBA"):
+        resized_image = resized_image.convert("RGB")
+    linear_rgb = _LINEAR_RGB_LUT[np.asarray(resized_image)[..., :3]]
+
+    # Pick the palette color closest to each pixel once the palette is scaled to the pixel's brightness
+    brightness = _BRIGHTNESS_LUT[grayscale]
+    difference = brightness[..., np.newaxis, np.newaxis] * _PALETTE_LINEAR_RGB - linear_rgb[..., np.newaxis, :]
+    squared = difference * difference
+    distance = squared[..., 0] + squared[..., 1] + squared[..., 2]
+    color_index = np.argmin(distance, axis=-1)
+    color_index[np.take_along_axis(distance, color_index[..., np.newaxis], axis=-1)[..., 0] >= 2] = 0
+
+    cell_index = color_index * len(CHARS_BY_DENSITY) + _GLYPH_INDEX_LUT[grayscale]
+    cell_strings = _CELL_STRINGS
+    lines = ["".join([cell_strings[i] for i in row]) for row in cell_index.tolist()]
+    return "\n".join(lines) + "\033[39m"
+
+def _convert_image_file_to_ascii(image_file_path: str, columns: int) -> str:
+    """
+    Converts one image file to ASCII art. Kept at module level so it can be sent to worker processes.
+
+    Parameters:
+        image_file_path (str): The path to the image file.
+        columns (int): The width of the ASCII art, in characters.
+
+    Returns:
+        str: ASCII art representation of the image.
+    """
+    with Image.open(image_file_path) as image:
+        return _image_to_ascii(image, columns=columns)
+
+def _print_conversion_progress(frames_done: int, frames_total: int, start_time: float):
+    """
+    Prints a single, self-overwriting progress line for an image sequence conversion.
+
+    Parameters:
+        frames_done (int): The number of frames converted so far.
+        frames_total (int): The total number of frames to convert.
+        start_time (float): The time.perf_counter() value taken when the conversion started.
+    """
+    elapsed = time.perf_counter() - start_time
+    frames_per_second = frames_done / elapsed if elapsed > 0 else 0.0
+    sys.stdout.write(f"\rConverted {frames_done}/{frames_total} frames ({frames_per_second:.1f} frames/sec)")
+    if frames_done == frames_total:
+        sys.stdout.write("\n")
+    sys.stdout.flush()
+
+def _create_ascii_art_animation_from_images(image_folder_path: str, columns: int = 150, workers: int | None = None, cache: AsciiFrameCache | None = None) -> list[str]:
     """
     Converts all images in a specified folder to ASCII art representations.
+    The sorted frame list is split into shards that are converted in parallel by a process pool; frames are returned in order.
 
     Parameters:
         image_folder_path (str): The path to the folder containing image files.
         columns (int): The width of the ASCII art, in characters.
+        workers (int | None): The number of worker processes to use. Defaults to the number of CPUs. A value of 1 converts in this process.
+        cache (AsciiFrameCache | None): An optional cache of converted frames. Only images that are not in it are converted.
 
     Returns:
         list[str]: A list of ASCII art strings, each representing an image.
     """
     # Get the list of image files
     image_files = sorted([f for f in os.listdir(image_folder_path) if os.path.isfile(os.path.join(image_folder_path, f))])
-    ascii_art_images = [AsciiArt.from_image(os.path.join(image_folder_path, image_file)).to_ascii(columns=columns) for image_file in image_files if image_file.endswith('.jpg')]
+    image_file_paths = [os.path.join(image_folder_path, image_file) for image_file in image_files if image_file.endswith('.jpg')]
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    ascii_art_images: list[str | None] = [None] * len(image_file_paths)
+    cache_keys: list[str | None] = [None] * len(image_file_paths)
+    if cache:
+        for i, image_file_path in enumerate(image_file_paths):
+            with open(image_file_path, 'rb') as f:
+                cache_keys[i] = AsciiFrameCache.make_key(f.read(), columns, ASCII_CONVERTER_SETTINGS)
+            ascii_art_images[i] = cache.get(cache_keys[i])
+    frames_to_convert = [i for i, ascii_art_image in enumerate(ascii_art_images) if ascii_art_image is None]
+    frames_done = len(image_file_paths) - len(frames_to_convert)
+    if cache:
+        print(f"{frames_done} of {len(image_file_paths)} frames loaded from cache")
+
+    def store_frame(i: int, ascii_art_image: str):
+        nonlocal frames_done
+        ascii_art_images[i] = ascii_art_image
+        if cache:
+            cache.put(cache_keys[i], ascii_art_image)
+        frames_done += 1
+        _print_conversion_progress(frames_done, len(image_file_paths), start_time)
+
+    if workers == 1 or len(frames_to_convert) <= 1:
+        for i in frames_to_convert:
+            store_frame(i, _convert_image_file_to_ascii(image_file_paths[i], columns))
+        return ascii_art_images
+    # Several shards per worker keeps every process busy when some frames take longer than others
+    chunksize = max(1, len(frames_to_convert) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        converted_frames = executor.map(_convert_image_file_to_ascii, [image_file_paths[i] for i in frames_to_convert], repeat(columns), chunksize=chunksize)
+        for i, ascii_art_image in zip(frames_to_convert, converted_frames):
+            store_frame(i, ascii_art_image)
     return ascii_art_images
 
 def _create_ascii_art_from_image(image_file_path: str, columns: int = 150) -> list[str]:
@@ -31,15 +165,15 @@ def _create_ascii_art_from_image(image_file_path: str, columns: int = 150) -> li
     Returns:
         list[str]: ASCII art representation of the image.
     """
-    ascii_art_image = AsciiArt.from_image(image_file_path).to_ascii(columns=columns)
-    return ascii_art_image
+    with Image.open(image_file_path) as image:
+        return _image_to_ascii(image, columns=columns)
 
-def clean_up_ascii_art_animation(ascii_art_animation: list[str]) -> list[str]:
+def clean_up_ascii_art_animation(ascii_art_animation: Sequence[str]) -> list[str]:
     """
     Cleans up ASCII art animation frames by replacing dark and bright black patterns with a space (no character).
 
     Parameters:
-        ascii_art_animation (list[str]): A list of ASCII art animation frames.
+        ascii_art_animation (Sequence[str]): A list of ASCII art animation frames.
 
     Returns:
         list[str]: The cleaned-up ASCII art animation frames.
@@ -66,67 +200,375 @@ def load_ascii_art_animation_from_json(json_file_path: str) -> list[str]:
     with open(json_file_path, 'r') as f:
         return json.load(f)
 
-def play_ascii_animation(ascii_art_animation: list[str], frames_per_second: int, loop_num_times: int = 1, stop_event = None, continue_thread_after_stop_for: float = 0.0) -> ThreadControl:
+def load_ascii_art_animation(file_path: str) -> Sequence[str]:
+    """
+    Loads ASCII art animation frames from a frame store file. Falls back to the JSON file of the same name when no frame store exists.
+
+    Parameters:
+        file_path (str): The path to the frame store (or JSON) file containing ASCII art animation frames.
+
+    Returns:
+        Sequence[str]: The ASCII art animation frames. Frame stores decompress each frame when it is accessed.
+    """
+    file_root, _extension = os.path.splitext(file_path)
+    if os.path.exists(file_root + FRAME_STORE_EXTENSION):
+        return FrameStore(file_root + FRAME_STORE_EXTENSION)
+    return load_ascii_art_animation_from_json(file_root + ".json")
+
+def load_ascii_art_delta_stream(file_path: str) -> Sequence[bytes] | None:
+    """
+    Loads the precomputed delta stream stored alongside an animation's frame store, if there is one.
+    Deltas are only ever written to the terminal, so they are returned as the encoded bytes stored in the file.
+
+    Parameters:
+        file_path (str): The path to the animation's frame store (or JSON) file.
+
+    Returns:
+        Sequence[bytes] | None: The per-frame deltas, or None if the animation has no delta stream.
+    """
+    file_root, _extension = os.path.splitext(file_path)
+    delta_stream_file_path = delta_stream_path(file_root + FRAME_STORE_EXTENSION)
+    if os.path.exists(delta_stream_file_path):
+        return FrameStore(delta_stream_file_path, encoding=None)
+    return None
+
+def load_ascii_art_animation_for_terminal(file_path: str, terminal_size: tuple[int, int] | None = None) -> tuple[Sequence[str], Sequence[bytes] | None]:
+    """
+    Loads the largest resolution tier of an animation that fits the terminal, together with its delta stream.
+    Tiers are built by 'frame_store.py --tiers'. When no tier fits, the full resolution animation is returned and play_ascii_animation downsamples it.
+
+    Parameters:
+        file_path (str): The path to the animation's full resolution frame store (or JSON) file.
+        terminal_size (tuple[int, int] | None): The columns and lines available. Detected from the terminal if not given.
+
+    Returns:
+        tuple[Sequence[str], Sequence[bytes] | None]: The ASCII art animation frames and their delta stream, if there is one.
+    """
+    columns, lines = terminal_size or Utility.get_terminal_size()
+    file_root, _extension = os.path.splitext(file_path)
+    frame_store_path = file_root + FRAME_STORE_EXTENSION
+    if os.path.exists(frame_store_path):
+        frames = FrameStore(frame_store_path)
+        if frames.columns > columns or frames.rows > lines:
+            for _tier_columns, tier_path in sorted(find_resolution_tiers(frame_store_path).items(), reverse=True):
+                tier_frames = FrameStore(tier_path)
+                if tier_frames.columns <= columns and tier_frames.rows <= lines:
+                    frames.close()
+                    return tier_frames, load_ascii_art_delta_stream(str(tier_path))
+                tier_frames.close()
+        return frames, load_ascii_art_delta_stream(frame_store_path)
+    return load_ascii_art_animation(file_path), load_ascii_art_delta_stream(file_path)
+
+class DownsampledAnimation(Sequence):
+    """
+    A smaller view of an ASCII art animation. Frames are downsampled the first time they are accessed and kept for later loops.
+
+    Attributes:
+        source_frames (Sequence[str]): The full resolution frames.
+        columns (int): The width of the downsampled frames, in characters.
+        rows (int): The height of the downsampled frames, in lines.
+    """
+
+    def __init__(self, source_frames: Sequence[str], columns: int, rows: int) -> None:
+        """
+        Initializes the view without downsampling anything yet.
+
+        Parameters:
+            source_frames (Sequence[str]): The full resolution frames.
+            columns (int): The width to downsample to, in characters.
+            rows (int): The height to downsample to, in lines.
+        """
+
+        self.source_frames = source_frames
+        self.columns = columns
+        self.rows = rows
+        self._frames: list[str | None] = [None] * len(source_frames)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        frame = self._frames[index]
+        if frame is None:
+            frame = self._frames[index] = downsample_frame(self.source_frames[index], self.columns, self.rows)
+        return frame
+
+# The most downsampled views kept. Each view holds its source animation and every frame downsampled so far,
+# so only the few most recently played are kept; older ones are dropped and their animations can be freed
+MAX_DOWNSAMPLED_ANIMATIONS = 4
+
+# Downsampled views of animations, keyed by the id of the source animation and the target size, least recently used first.
+# Each entry keeps its source so a recycled id is never mistaken for the original animation.
+_downsampled_animations: OrderedDict[tuple[int, int, int], DownsampledAnimation] = OrderedDict()
+
+def fit_ascii_art_animation(ascii_art_animation: Sequence[str], max_size: tuple[int, int]) -> Sequence[str]:
     """
-    Plays an ASCII art animation in the console.
+    Fits an ASCII art animation within the given size, downsampling it if it is too large.
+    The downsampled views of the few most recently fitted animations and sizes are cached, so replaying an animation in the same terminal
+    reuses the frames already downsampled.
 
     Parameters:
-        ascii_art_animation (list[str]): A list of ASCII art animation frames.
+        ascii_art_animation (Sequence[str]): The ASCII art animation frames.
+        max_size (tuple[int, int]): The columns and lines available.
+
+    Returns:
+        Sequence[str]: The original frames if they fit, otherwise a downsampled view of them.
+    """
+    if not ascii_art_animation:
+        return ascii_art_animation
+    if isinstance(ascii_art_animation, (FrameStore, DownsampledAnimation)):
+        frame_size = (ascii_art_animation.columns, ascii_art_animation.rows)
+    else:
+        frame_size = measure_frame(ascii_art_animation[0])
+    fitted_size = fit_frame_size(frame_size, max_size)
+    if fitted_size == frame_size:
+        return ascii_art_animation
+    cache_key = (id(ascii_art_animation), *fitted_size)
+    downsampled_animation = _downsampled_animations.get(cache_key)
+    if downsampled_animation is None or downsampled_animation.source_frames is not ascii_art_animation:
+        downsampled_animation = _downsampled_animations[cache_key] = DownsampledAnimation(ascii_art_animation, *fitted_size)
+    _downsampled_animations.move_to_end(cache_key)
+    while len(_downsampled_animations) > MAX_DOWNSAMPLED_ANIMATIONS:
+        _downsampled_animations.popitem(last=False)
+    return downsampled_animation
+
+class FrameScheduler:
+    """
+    Paces animation frames against absolute deadlines on a monotonic clock, so the time spent drawing never accumulates into drift.
+    Frame n is due at start_time + n / frames_per_second. A frame that is due while playback is still more than a whole frame behind
+    is skipped so playback catches up instead of running slow.
+
+    Attributes:
+        frames_per_second (float): The target playback rate.
+        start_time (float | None): The time.monotonic() value playback is timed from. Set by start(), or by the first frame if start() was never called.
+        frames_shown (int): The number of frames drawn.
+        frames_late (int): The number of frames drawn more than a quarter of a frame after their deadline.
+        frames_skipped (int): The number of frames dropped to catch up.
+    """
+
+    def __init__(self, frames_per_second: float) -> None:
+        """
+        Initializes a scheduler that has not started yet.
+
+        Parameters:
+            frames_per_second (float): The target playback rate.
+        """
+
+        self.frames_per_second = frames_per_second
+        self.frame_interval = 1 / frames_per_second
+        self.start_time: float | None = None
+        self.frame_number = 0
+        self.frames_shown = 0
+        self.frames_late = 0
+        self.frames_skipped = 0
+
+    def start(self, start_time: float | None = None) -> None:
+        """
+        Starts the playback clock. Call this when a soundtrack starts to keep the animation locked to it.
+
+        Parameters:
+            start_time (float | None): The time.monotonic() value to time playback from. Defaults to now.
+        """
+
+        self.start_time = time.monotonic() if start_time is None else start_time
+        self.frame_number = 0
+
+    def next_frame_delay(self) -> float | None:
+        """
+        Works out when the next frame is due without waiting for it, for drivers that do their own waiting.
+
+        Returns:
+            float | None: The time in seconds until the frame is due, or None if it should be skipped because playback is behind.
+        """
+
+        if self.start_time is None:
+            self.start()
+        deadline = self.start_time + self.frame_number * self.frame_interval
+        self.frame_number += 1
+        delay = deadline - time.monotonic()
+        if delay <= -self.frame_interval:
+            self.frames_skipped += 1
+            return None
+        if delay < -self.frame_interval / 4:
+            self.frames_late += 1
+        self.frames_shown += 1
+        return max(delay, 0.0)
+
+    def wait_for_next_frame(self) -> bool:
+        """
+        Waits until the next frame is due.
+
+        Returns:
+            bool: True if the frame should be drawn, False if it should be skipped because playback is behind.
+        """
+
+        delay = self.next_frame_delay()
+        if delay is None:
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+class PlaybackPlan:
+    """
+    A loop mode of an animation compiled once into a flat sequence of frame indices, together with the encoded output of every step
+    between frames as it is first drawn. Reusing a plan replays the animation without rebuilding the sequence or diffing frames again.
+
+    Attributes:
+        ascii_art_animation (Sequence[str]): The ASCII art animation frames the plan was compiled for.
+        loop_num_times (int): The loop mode, as passed to play_ascii_animation.
+        frame_indices (tuple[int, ...]): The frames drawn, in order. With a loop mode of 0 this is a single pass that repeats until stopped.
+        final_frame_index (int): The frame left on screen when playback ends.
+    """
+
+    def __init__(self, ascii_art_animation: Sequence[str], loop_num_times: int) -> None:
+        """
+        Compiles the frame sequence for a loop mode.
+
+        Parameters:
+            ascii_art_animation (Sequence[str]): The ASCII art animation frames.
+            loop_num_times (int): The number of times to loop. Negative values play forwards then in reverse that many times, 0 loops until stopped.
+        """
+
+        self.ascii_art_animation = ascii_art_animation
+        self.loop_num_times = loop_num_times
+        frame_count = len(ascii_art_animation)
+        if loop_num_times < 0:
+            ping_pong = tuple(range(1, frame_count)) + tuple(range(frame_count - 2, -1, -1))
+            self.frame_indices = ping_pong * -loop_num_times
+            self.final_frame_index = 0
+        else:
+            self.frame_indices = tuple(range(frame_count)) * max(loop_num_times, 1)
+            self.final_frame_index = frame_count - 1
+        self._transition_animation: Sequence[str] | None = None
+        self._transition_cache: dict[tuple[int, int], bytes] = {}
+
+    def matches(self, ascii_art_animation: Sequence[str], loop_num_times: int) -> bool:
+        """
+        Checks whether the plan was compiled for these exact frames and loop mode.
+
+        Parameters:
+            ascii_art_animation (Sequence[str]): The ASCII art animation frames.
+            loop_num_times (int): The loop mode.
+
+        Returns:
+            bool: True if the plan can be used to play them.
+        """
+
+        return self.ascii_art_animation is ascii_art_animation and self.loop_num_times == loop_num_times
+
+    def transition_cache_for(self, drawn_animation: Sequence[str]) -> dict[tuple[int, int], bytes]:
+        """
+        Returns the cached step output for the frames actually drawn, which differ from the plan's frames when they were downsampled to fit the terminal.
+        The cache starts over whenever the drawn frames change.
+
+        Parameters:
+            drawn_animation (Sequence[str]): The frames being drawn.
+
+        Returns:
+            dict[tuple[int, int], bytes]: The encoded output keyed by (previous frame index, frame index).
+        """
+
+        if drawn_animation is not self._transition_animation:
+            self._transition_animation = drawn_animation
+            self._transition_cache = {}
+        return self._transition_cache
+
+def ascii_animation_steps(ascii_art_animation: Sequence[str], frames_per_second: int, loop_num_times: int = 1, stop_event = None, delta_stream: Sequence[bytes] | None = None, scheduler: FrameScheduler | None = None, fit_to_terminal: bool = True, plan: PlaybackPlan | None = None) -> Iterator[tuple[bytes, float]]:
+    """
+    Generates the output of an ASCII art animation one step at a time, without writing or sleeping itself, so any driver can play it.
+    After the first frame only the cells that change between frames are redrawn. Frames are timed by a FrameScheduler, which drops frames
+    when playback falls behind. Animations larger than the terminal are downsampled to fit, since wrapped lines would break the redraw.
+
+    Parameters:
+        ascii_art_animation (Sequence[str]): A list of ASCII art animation frames, or a FrameStore.
+        frames_per_second (int): The number of frames to display per second.
+        loop_num_times (int): The number of times to loop the animation. A value of 0 will loop until stop_event is set.
+        stop_event (threading.Event): An event to stop an animation that loops indefinitely. It is checked each time the animation starts over.
+        delta_stream (Sequence[bytes] | None): Optional precomputed deltas for the animation, see load_ascii_art_delta_stream.
+        scheduler (FrameScheduler | None): Optional scheduler to time the frames with, e.g. one started together with a soundtrack.
+            Its counters report late and skipped frames once playback is done. A new one is created if not given.
+        fit_to_terminal (bool): Whether to downsample the animation when it does not fit the terminal.
+        plan (PlaybackPlan | None): Optional plan compiled earlier for these frames and loop mode. A new one is compiled if not given or if it does not match.
+
+    Yields:
+        tuple[bytes, float]: The output to write and the time in seconds to wait after writing it.
+    """
+
+    if plan is None or not plan.matches(ascii_art_animation, loop_num_times):
+        plan = PlaybackPlan(ascii_art_animation, loop_num_times)
+    if fit_to_terminal:
+        fitted_animation = fit_ascii_art_animation(ascii_art_animation, Utility.get_terminal_size())
+        if fitted_animation is not ascii_art_animation:
+            # The precomputed deltas are for the full size frames
+            ascii_art_animation, delta_stream = fitted_animation, None
+    renderer = FrameDiffRenderer(delta_stream, plan.transition_cache_for(ascii_art_animation))
+    scheduler = scheduler or FrameScheduler(frames_per_second)
+
+    def frame_steps():
+        for frame_index in plan.frame_indices:
+            delay = scheduler.next_frame_delay()
+            if delay is None:
+                continue
+            if delay > 0:
+                yield b"", delay
+            yield renderer.render(ascii_art_animation[frame_index], frame_index), 0.0
+
+    if loop_num_times != 0:
+        yield from frame_steps()
+    else:
+        while not (stop_event and stop_event.is_set()):
+            yield from frame_steps()
+    yield renderer.finish(ascii_art_animation[plan.final_frame_index]), 0.0
+
+def play_ascii_animation(ascii_art_animation: Sequence[str], frames_per_second: int, loop_num_times: int = 1, stop_event = None, continue_thread_after_stop_for: float = 0.0, delta_stream: Sequence[bytes] | None = None, scheduler: FrameScheduler | None = None, fit_to_terminal: bool = True, plan: PlaybackPlan | None = None) -> ThreadControl | RenderJob:
+    """
+    Plays an ASCII art animation in the console on the shared render loop, see ascii_animation_steps.
+
+    Parameters:
+        ascii_art_animation (Sequence[str]): A list of ASCII art animation frames, or a FrameStore.
         frames_per_second (int): The number of frames to display per second.
         loop_num_times (int): The number of times to loop the animation. A value of 0 will loop indefinitely.
         stop_event (threading.Event): An optional threading event to stop the animation.
         continue_thread_after_stop_for (float): Time in seconds to continue the thread after a stop event is set.
+        delta_stream (Sequence[bytes] | None): Optional precomputed deltas for the animation, see load_ascii_art_delta_stream.
+        scheduler (FrameScheduler | None): Optional scheduler to time the frames with, e.g. one started together with a soundtrack.
+            Its counters report late and skipped frames once playback is done. A new one is created if not given.
+        fit_to_terminal (bool): Whether to downsample the animation when it does not fit the terminal.
+        plan (PlaybackPlan | None): Optional plan compiled earlier for these frames and loop mode. A new one is compiled if not given or if it does not match.
 
     Returns:
-        ThreadControl | None: A control object for the animation thread if looping indefinitely, otherwise None.
-    """
-
-    if loop_num_times < 0:
-        loop_num_times = -1 * loop_num_times
-        last_frame = ascii_art_animation[0]
-        for _ in range(loop_num_times):
-            for i, frame in enumerate(ascii_art_animation):
-                if i == 0:
-                    continue
-                sys.stdout.write(frame)
-                sys.stdout.flush()
-                time.sleep(1/frames_per_second)
-                Utility.clear_multi_line(frame)
-            for i, frame in enumerate(reversed(ascii_art_animation)):
-                if i == 0:
-                    continue
-                sys.stdout.write(frame)
-                sys.stdout.flush()
-                time.sleep(1/frames_per_second)
-                Utility.clear_multi_line(frame)
-            print(last_frame)
-    elif loop_num_times > 0:
-        last_frame = ascii_art_animation[-1]
-        for _ in range(loop_num_times):
-            for frame in ascii_art_animation:
-                sys.stdout.write(frame)
-                sys.stdout.flush()
-                time.sleep(1/frames_per_second)
-                Utility.clear_multi_line(frame)
-        print(last_frame)
-    else:
-        while True:
-            def play_ascii_animation_thread(stop_event=None):
-                while True:
-                    if stop_event and stop_event.is_set():
-                        break
-                    for frame in ascii_art_animation:
-                        sys.stdout.write(frame)
-                        sys.stdout.flush()
-                        time.sleep(1/frames_per_second)
-                        Utility.clear_multi_line(frame)
-                    sys.stdout.write(ascii_art_animation[-1])
-                    sys.stdout.flush()
-            ascii_animation_thread = ThreadControl(play_ascii_animation_thread, stop_event)
-            ascii_animation_thread.start()
-            time.sleep(continue_thread_after_stop_for)
-            return ascii_animation_thread
-    return ThreadControl(None, None)
+        ThreadControl | RenderJob: A handle to stop the animation if looping indefinitely. Otherwise playback has finished when this returns.
+    """
+
+    def make_steps(job_stop_event):
+        return ascii_animation_steps(ascii_art_animation, frames_per_second, loop_num_times, job_stop_event, delta_stream, scheduler, fit_to_terminal, plan)
+
+    animation_job = RenderLoop.shared().start_job(make_steps)
+    if loop_num_times != 0:
+        animation_job.wait()
+        return ThreadControl(None, None)
+    time.sleep(continue_thread_after_stop_for)
+    return animation_job
+
+async def play_ascii_animation_async(ascii_art_animation: Sequence[str], frames_per_second: int, loop_num_times: int = 1, stop_event = None, delta_stream: Sequence[bytes] | None = None, scheduler: FrameScheduler | None = None, fit_to_terminal: bool = True, plan: PlaybackPlan | None = None):
+    """
+    Plays an ASCII art animation in the console on the running asyncio event loop, see ascii_animation_steps.
+
+    Parameters:
+        ascii_art_animation (Sequence[str]): A list of ASCII art animation frames, or a FrameStore.
+        frames_per_second (int): The number of frames to display per second.
+        loop_num_times (int): The number of times to loop the animation. A value of 0 will loop until stop_event is set.
+        stop_event (asyncio.Event): An event to stop an animation that loops indefinitely.
+        delta_stream (Sequence[bytes] | None): Optional precomputed deltas for the animation, see load_ascii_art_delta_stream.
+        scheduler (FrameScheduler | None): Optional scheduler to time the frames with, e.g. one started together with a soundtrack.
+        fit_to_terminal (bool): Whether to downsample the animation when it does not fit the terminal.
+        plan (PlaybackPlan | None): Optional plan compiled earlier for these frames and loop mode.
+    """
+
+    await play_steps_async(ascii_animation_steps(ascii_art_animation, frames_per_second, loop_num_times, stop_event, delta_stream, scheduler, fit_to_terminal, plan))
 
 if __name__ == "__main__":
     def main():
@@ -134,7 +576,7 @@ if __name__ == "__main__":
         Main function that processes command-line arguments and initiates ASCII art conversion or animation.
 
         Usage:
-            python script_name.py <path to image folder> <optional: true for folder of image sequence> <optional: number of columns>
+            python script_name.py <path to image folder> <optional: true for folder of image sequence> <optional: number of columns> <optional: number of worker processes>
         """
 
         if len(sys.argv) == 1:
@@ -164,7 +606,7 @@ if __name__ == "__main__":
                         continue
         elif len(sys.argv) == 3:
             if sys.argv[2] == "true" or sys.argv[2] == "True" or sys.argv[2] == "TRUE" or sys.argv[2] == "t" or sys.argv[2] == "T":
-                ascii_art_animation = _create_ascii_art_animation_from_images(image_folder_path)
+                ascii_art_animation = _create_ascii_art_animation_from_images(image_folder_path, cache=AsciiFrameCache())
                 while True:
                     try:
                         with open(f'animation_images_json/{filename}.json', 'w') as f:
@@ -191,14 +633,21 @@ if __name__ == "__main__":
                     else:
                         print("Invalid image file type. Skipping file...")
                         continue
-        elif len(sys.argv) == 4:
+        elif len(sys.argv) == 4 or len(sys.argv) == 5:
             if sys.argv[2] == "true" or sys.argv[2] == "True" or sys.argv[2] == "TRUE" or sys.argv[2] == "t" or sys.argv[2] == "T":
                 try:
                     columns = int(sys.argv[3])
                 except ValueError:
                     print("Invalid number of columns. Exiting...")
                     sys.exit(1)
-                ascii_art_animation = _create_ascii_art_animation_from_images(image_folder_path, columns=columns)
+                workers = None
+                if len(sys.argv) == 5:
+                    try:
+                        workers = int(sys.argv[4])
+                    except ValueError:
+                        print("Invalid number of worker processes. Exiting...")
+                        sys.exit(1)
+                ascii_art_animation = _create_ascii_art_animation_from_images(image_folder_path, columns=columns, workers=workers, cache=AsciiFrameCache())
                 while True:
                     try:
                         with open(f'animation_images_json/{filename}.json', 'w') as f:
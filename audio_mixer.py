@@ -0,0 +1,734 @@
+import os
+import struct
+import threading
+import wave
+from collections import OrderedDict
+from collections.abc import Callable
+from time import monotonic, sleep
+import numpy as np
+
+# WAVE format codes, see the fmt chunk of the RIFF WAVE specification
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# The (format code, bits per sample) pairs read_wav can decode
+_SUPPORTED_SAMPLE_FORMATS = {(_WAVE_FORMAT_PCM, 8), (_WAVE_FORMAT_PCM, 16), (_WAVE_FORMAT_PCM, 24), (_WAVE_FORMAT_PCM, 32), (_WAVE_FORMAT_IEEE_FLOAT, 32), (_WAVE_FORMAT_IEEE_FLOAT, 64)}
+
+class WavFormatError(Exception):
+    """
+    Raised when a file is not a RIFF WAVE file or uses a sample format the mixer cannot decode.
+    """
+
+class PcmBuffer:
+    """
+    Decoded audio held in memory as floating point samples between -1 and 1.
+
+    Attributes:
+        samples (np.ndarray): The samples, one row per frame and one column per channel.
+        sample_rate (int): The number of frames per second.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int) -> None:
+        """
+        Initializes a buffer around decoded samples.
+
+        Parameters:
+            samples (np.ndarray): The samples, shaped (frames, channels).
+            sample_rate (int): The number of frames per second.
+        """
+        self.samples = samples
+        self.sample_rate = sample_rate
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def duration(self) -> float:
+        """
+        The length of the audio in seconds.
+        """
+        return len(self.samples) / self.sample_rate
+
+    def converted(self, sample_rate: int, channels: int) -> 'PcmBuffer':
+        """
+        Converts the audio to another sample rate and channel count, resampling by linear interpolation.
+
+        Parameters:
+            sample_rate (int): The sample rate to convert to.
+            channels (int): The number of channels to convert to. Mono is copied to every channel; anything else is mixed down or truncated.
+
+        Returns:
+            PcmBuffer: The converted audio, or this buffer if it already has that format.
+        """
+        samples = self.samples
+        if samples.shape[1] != channels:
+            if samples.shape[1] == 1:
+                samples = np.repeat(samples, channels, axis=1)
+            elif channels == 1:
+                samples = samples.mean(axis=1, keepdims=True)
+            else:
+                samples = samples[:, :channels]
+        if sample_rate != self.sample_rate and len(samples):
+            frame_count = int(round(len(samples) * sample_rate / self.sample_rate))
+            source_positions = np.arange(frame_count) * (self.sample_rate / sample_rate)
+            source_frames = np.arange(len(samples))
+            samples = np.stack([np.interp(source_positions, source_frames, samples[:, channel]) for channel in range(samples.shape[1])], axis=1)
+        if samples is self.samples:
+            return self
+        return PcmBuffer(np.ascontiguousarray(samples, dtype=np.float32), sample_rate)
+
+def read_wav_pcm(file_path: str) -> tuple[int, int, int, int, bytes]:
+    """
+    Reads the format and the raw sample data of a RIFF WAVE file, without decoding the samples.
+
+    Parameters:
+        file_path (str): The path of the WAV file.
+
+    Returns:
+        tuple[int, int, int, int, bytes]: The format code, sample rate, number of channels, bits per sample, and the sample data cut to whole frames.
+
+    Raises:
+        WavFormatError: If the file is not a WAV file.
+    """
+    with open(file_path, "rb") as file:
+        data = file.read()
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise WavFormatError(f"'{file_path}' is not a RIFF WAVE file.")
+
+    audio_format = channels = sample_rate = bits_per_sample = None
+    sample_data = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id, chunk_size = struct.unpack_from("<4sI", data, offset)
+        chunk_start = offset + 8
+        chunk = data[chunk_start:chunk_start + chunk_size]
+        if chunk_id == b"fmt ":
+            audio_format, channels, sample_rate, _byte_rate, _block_align, bits_per_sample = struct.unpack_from("<HHIIHH", chunk)
+            if audio_format == _WAVE_FORMAT_EXTENSIBLE and len(chunk) >= 26:
+                # The real format code is the first two bytes of the sub format GUID
+                audio_format = struct.unpack_from("<H", chunk, 24)[0]
+        elif chunk_id == b"data":
+            sample_data = chunk
+        # Chunks are padded to an even number of bytes
+        offset = chunk_start + chunk_size + (chunk_size & 1)
+
+    if audio_format is None or sample_data is None:
+        raise WavFormatError(f"'{file_path}' has no fmt or data chunk.")
+    frame_bytes = bits_per_sample // 8 * channels
+    return audio_format, sample_rate, channels, bits_per_sample, sample_data[:len(sample_data) // frame_bytes * frame_bytes]
+
+def decode_pcm(sample_data: bytes, audio_format: int, sample_rate: int, channels: int, bits_per_sample: int) -> PcmBuffer:
+    """
+    Decodes raw WAV sample data into floating point samples.
+
+    Parameters:
+        sample_data (bytes): The interleaved sample data, in whole frames.
+        audio_format (int): The WAVE format code.
+        sample_rate (int): The number of frames per second.
+        channels (int): The number of channels.
+        bits_per_sample (int): The size of one sample in bits.
+
+    Returns:
+        PcmBuffer: The decoded audio.
+
+    Raises:
+        WavFormatError: If the sample format is not supported.
+    """
+    if audio_format == _WAVE_FORMAT_PCM and bits_per_sample == 8:
+        samples = (np.frombuffer(sample_data, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif audio_format == _WAVE_FORMAT_PCM and bits_per_sample == 16:
+        samples = np.frombuffer(sample_data, dtype="<i2").astype(np.float32) / 32768
+    elif audio_format == _WAVE_FORMAT_PCM and bits_per_sample == 24:
+        sample_bytes = np.frombuffer(sample_data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        # Place the three bytes in the top of a 32-bit integer so the sign carries over, then scale back down
+        samples = ((sample_bytes[:, 0] << 8) | (sample_bytes[:, 1] << 16) | (sample_bytes[:, 2] << 24)).astype(np.float32) / 2**31
+    elif audio_format == _WAVE_FORMAT_PCM and bits_per_sample == 32:
+        samples = np.frombuffer(sample_data, dtype="<i4").astype(np.float32) / 2**31
+    elif audio_format == _WAVE_FORMAT_IEEE_FLOAT and bits_per_sample in (32, 64):
+        samples = np.frombuffer(sample_data, dtype="<f4" if bits_per_sample == 32 else "<f8").astype(np.float32)
+    else:
+        raise WavFormatError(f"Unsupported format {audio_format:#06x} with {bits_per_sample} bits per sample.")
+    return PcmBuffer(samples.reshape(-1, channels), sample_rate)
+
+def read_wav(file_path: str) -> PcmBuffer:
+    """
+    Reads and decodes a RIFF WAVE file.
+    Unlike the standard library's wave module this also reads WAVE_FORMAT_EXTENSIBLE files, which most of the game's sounds are,
+    and 24-bit and floating point samples.
+
+    Parameters:
+        file_path (str): The path of the WAV file.
+
+    Returns:
+        PcmBuffer: The decoded audio.
+
+    Raises:
+        WavFormatError: If the file is not a WAV file or uses an unsupported sample format.
+    """
+    audio_format, sample_rate, channels, bits_per_sample, sample_data = read_wav_pcm(file_path)
+    try:
+        return decode_pcm(sample_data, audio_format, sample_rate, channels, bits_per_sample)
+    except WavFormatError as error:
+        raise WavFormatError(f"'{file_path}': {error}") from None
+
+class WavInfo:
+    """
+    The format and length of a WAV file, read from its header without decoding the samples.
+
+    Attributes:
+        sample_rate (int): The number of frames per second.
+        channels (int): The number of channels.
+        bits_per_sample (int): The size of one sample in bits.
+        frame_count (int): The number of frames in the file.
+    """
+
+    def __init__(self, sample_rate: int, channels: int, bits_per_sample: int, frame_count: int) -> None:
+        """
+        Initializes the header information of a WAV file.
+
+        Parameters:
+            sample_rate (int): The number of frames per second.
+            channels (int): The number of channels.
+            bits_per_sample (int): The size of one sample in bits.
+            frame_count (int): The number of frames in the file.
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.bits_per_sample = bits_per_sample
+        self.frame_count = frame_count
+
+    @property
+    def duration(self) -> float:
+        """
+        The length of the audio in seconds.
+        """
+        return self.frame_count / self.sample_rate
+
+def read_wav_info(file_path: str) -> WavInfo:
+    """
+    Reads the header of a RIFF WAVE file, skipping over the sample data, and checks that read_wav can decode it.
+
+    Parameters:
+        file_path (str): The path of the WAV file.
+
+    Returns:
+        WavInfo: The format and length of the audio.
+
+    Raises:
+        OSError: If the file cannot be read.
+        WavFormatError: If the file is not a WAV file or uses an unsupported sample format.
+    """
+    file_size = os.path.getsize(file_path)
+    audio_format = channels = sample_rate = bits_per_sample = data_size = None
+    with open(file_path, "rb") as file:
+        header = file.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise WavFormatError(f"'{file_path}' is not a RIFF WAVE file.")
+        while True:
+            chunk_header = file.read(8)
+            if len(chunk_header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                chunk = file.read(chunk_size + (chunk_size & 1))
+                audio_format, channels, sample_rate, _byte_rate, _block_align, bits_per_sample = struct.unpack_from("<HHIIHH", chunk)
+                if audio_format == _WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                    audio_format = struct.unpack_from("<H", chunk, 24)[0]
+            else:
+                if chunk_id == b"data":
+                    # A truncated file holds less sample data than its chunk claims
+                    data_size = min(chunk_size, file_size - file.tell())
+                file.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+    if audio_format is None or data_size is None:
+        raise WavFormatError(f"'{file_path}' has no fmt or data chunk.")
+    if (audio_format, bits_per_sample) not in _SUPPORTED_SAMPLE_FORMATS:
+        raise WavFormatError(f"'{file_path}' uses unsupported format {audio_format:#06x} with {bits_per_sample} bits per sample.")
+    return WavInfo(sample_rate, channels, bits_per_sample, data_size // (bits_per_sample // 8 * channels))
+
+class BufferCache:
+    """
+    Decoded sounds kept in memory, bounded by their total size. When a new sound does not fit, the least recently used ones are dropped
+    and decoded again the next time they are played. Voices keep their own reference, so dropping a sound never cuts off a voice playing it.
+
+    Attributes:
+        max_bytes (int): The most memory the decoded sounds may take up.
+        size_bytes (int): The memory the decoded sounds take up now.
+        evictions (int): The number of sounds dropped to make room.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        Initializes an empty cache.
+
+        Parameters:
+            max_bytes (int): The most memory the decoded sounds may take up.
+        """
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._buffers: OrderedDict[str, PcmBuffer] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, file_path: str) -> bool:
+        with self._lock:
+            return file_path in self._buffers
+
+    def get(self, file_path: str) -> PcmBuffer | None:
+        """
+        Returns a decoded sound and marks it as recently used.
+
+        Parameters:
+            file_path (str): The path of the sound.
+
+        Returns:
+            PcmBuffer | None: The decoded sound, or None if it is not in memory.
+        """
+        with self._lock:
+            buffer = self._buffers.get(file_path)
+            if buffer is not None:
+                self._buffers.move_to_end(file_path)
+            return buffer
+
+    def put(self, file_path: str, buffer: PcmBuffer) -> PcmBuffer:
+        """
+        Keeps a decoded sound in memory, dropping the least recently used sounds until it fits.
+        If another thread decoded the same sound first, that copy is kept and returned instead.
+
+        Parameters:
+            file_path (str): The path of the sound.
+            buffer (PcmBuffer): The decoded sound.
+
+        Returns:
+            PcmBuffer: The sound as kept in the cache.
+        """
+        with self._lock:
+            cached_buffer = self._buffers.get(file_path)
+            if cached_buffer is not None:
+                self._buffers.move_to_end(file_path)
+                return cached_buffer
+            if buffer.samples.nbytes > self.max_bytes:
+                return buffer
+            while self.size_bytes + buffer.samples.nbytes > self.max_bytes:
+                _evicted_path, evicted_buffer = self._buffers.popitem(last=False)
+                self.size_bytes -= evicted_buffer.samples.nbytes
+                self.evictions += 1
+            self._buffers[file_path] = buffer
+            self.size_bytes += buffer.samples.nbytes
+            return buffer
+
+class Voice:
+    """
+    One playing instance of a sound in the mixer.
+
+    Attributes:
+        file_path (str): The path of the sound being played.
+        volume (float): The gain applied to the sound.
+        loop (bool): Whether the sound starts over without a gap when it reaches its end.
+        frames_left (int | None): The number of frames the voice still plays for, or None to play until the sound ends.
+        stop_event (threading.Event | None): An event that stops the voice at the next block once it is set.
+        position (int): The next frame of the sound to be mixed.
+        stolen (bool): Whether the voice was cut off to make room for a newer one.
+    """
+
+    def __init__(self, file_path: str, buffer: PcmBuffer, volume: float = 1.0, loop: bool = False, duration: float | None = None, stop_event: threading.Event | None = None) -> None:
+        """
+        Initializes a voice at the start of a sound.
+
+        Parameters:
+            file_path (str): The path of the sound.
+            buffer (PcmBuffer): The decoded sound, in the mixer's format.
+            volume (float): The gain to apply.
+            loop (bool): Whether to loop the sound without gaps until the duration passes, the stop event is set or the voice is stopped.
+            duration (float | None): How long to play for, in seconds, cut to the exact frame. None plays the sound once, or forever if looping.
+            stop_event (threading.Event | None): An event that stops the voice once it is set.
+        """
+        self.file_path = file_path
+        self.buffer = buffer
+        self.volume = volume
+        self.loop = loop
+        self.frames_left = None if duration is None else int(round(duration * buffer.sample_rate))
+        self.stop_event = stop_event
+        self.position = 0
+        self.stolen = False
+        self._finished = threading.Event()
+        self._done_callbacks: list[Callable[['Voice'], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        """
+        The length of the sound in seconds.
+        """
+        return self.buffer.duration
+
+    def is_finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Waits for the voice to finish playing.
+
+        Parameters:
+            timeout (float | None): The longest time to wait, in seconds.
+
+        Returns:
+            bool: True if the voice finished.
+        """
+        return self._finished.wait(timeout)
+
+    def stop(self):
+        """
+        Stops the voice. The mixer drops it before mixing the next block.
+        """
+        self._finish()
+
+    def add_done_callback(self, callback: Callable[['Voice'], None]):
+        """
+        Registers a function to call with the voice once it finishes. It is called right away if the voice has already finished.
+        Callbacks run on the mixer thread, so they should only hand off work.
+
+        Parameters:
+            callback (Callable[[Voice], None]): The function to call.
+        """
+        with self._lock:
+            if not self._finished.is_set():
+                self._done_callbacks.append(callback)
+                return
+        callback(self)
+
+    def _finish(self):
+        """
+        Marks the voice finished and runs its callbacks once.
+        """
+        with self._lock:
+            if self._finished.is_set():
+                return
+            self._finished.set()
+            callbacks, self._done_callbacks = self._done_callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+class NullOutput:
+    """
+    An output that discards the mixed audio, for running without an audio device.
+
+    Attributes:
+        paces_itself (bool): False, the mixer keeps real time for this output.
+        frames_written (int): The number of frames the mixer produced.
+    """
+
+    paces_itself = False
+
+    def __init__(self) -> None:
+        self.frames_written = 0
+
+    def open(self, sample_rate: int, channels: int):
+        pass
+
+    def write(self, block: np.ndarray):
+        self.frames_written += len(block)
+
+    def close(self):
+        pass
+
+class WavFileOutput:
+    """
+    An output that records the mixed audio to a 16-bit WAV file, for checking the mix without an audio device.
+
+    Attributes:
+        file_path (str): The path of the WAV file to write.
+        paces_itself (bool): False, the mixer keeps real time for this output.
+    """
+
+    paces_itself = False
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self._wav_file: wave.Wave_write | None = None
+
+    def open(self, sample_rate: int, channels: int):
+        self._wav_file = wave.open(self.file_path, "wb")
+        self._wav_file.setnchannels(channels)
+        self._wav_file.setsampwidth(2)
+        self._wav_file.setframerate(sample_rate)
+
+    def write(self, block: np.ndarray):
+        self._wav_file.writeframes((block * 32767).astype("<i2").tobytes())
+
+    def close(self):
+        if self._wav_file:
+            self._wav_file.close()
+            self._wav_file = None
+
+class SoundDeviceOutput:
+    """
+    An output that plays the mixed audio on the default audio device through the optional sounddevice package.
+
+    Attributes:
+        paces_itself (bool): True, writes block until the device has room, which keeps the mixer in real time.
+    """
+
+    paces_itself = True
+
+    def __init__(self) -> None:
+        """
+        Raises:
+            ImportError: If sounddevice is not installed.
+            OSError: If sounddevice cannot find the PortAudio library, or there is no audio device to play on.
+        """
+        import sounddevice
+        # Probe the device now rather than when the mixer thread opens it, so a missing device falls back to playsound
+        try:
+            sounddevice.check_output_settings()
+        except sounddevice.PortAudioError as error:
+            raise OSError(f"No audio output device: {error}") from error
+        self._sounddevice = sounddevice
+        self._stream = None
+
+    def open(self, sample_rate: int, channels: int):
+        self._stream = self._sounddevice.OutputStream(samplerate=sample_rate, channels=channels, dtype="float32")
+        self._stream.start()
+
+    def write(self, block: np.ndarray):
+        self._stream.write(block)
+
+    def close(self):
+        if self._stream:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+def create_default_output():
+    """
+    Creates the output the game's mixer plays through.
+    The HACK_THE_PLANET_AUDIO_OUTPUT environment variable selects 'null' or 'wav:<path>' for running headless; otherwise the audio device is used.
+
+    Returns:
+        NullOutput | WavFileOutput | SoundDeviceOutput | None: The output, or None if no audio device backend is available.
+    """
+    output_setting = os.environ.get("HACK_THE_PLANET_AUDIO_OUTPUT", "")
+    if output_setting == "null":
+        return NullOutput()
+    if output_setting.startswith("wav:"):
+        return WavFileOutput(output_setting[len("wav:"):])
+    try:
+        return SoundDeviceOutput()
+    except (ImportError, OSError):
+        return None
+
+class AudioMixer:
+    """
+    Mixes any number of sounds into one output on a single audio thread.
+    Every sound file is decoded once, converted to the mixer's format and kept in memory up to a size limit, so playing a sound again costs nothing but a new voice.
+    At most max_voices sounds play at once; starting another one steals the oldest voice.
+
+    Attributes:
+        output: The output backend the mix is written to.
+        sample_rate (int): The sample rate of the mix.
+        channels (int): The number of channels of the mix.
+        block_frames (int): The number of frames mixed and written at a time.
+        max_voices (int): The most voices that play at once.
+        voices_stolen (int): The number of voices cut off to make room for newer ones.
+        output_error (Exception | None): Why the output last failed to open or write, or None if it is working.
+        buffers (BufferCache): The decoded sounds kept in memory.
+        decoder (Callable[[str], PcmBuffer]): Reads and decodes a sound file.
+    """
+
+    def __init__(self, output, sample_rate: int = 48000, channels: int = 2, block_frames: int = 512, max_voices: int = 24, max_buffer_bytes: int = 64 * 1024 * 1024, decoder: Callable[[str], PcmBuffer] = read_wav) -> None:
+        """
+        Initializes the mixer. The audio thread starts with the first sound played.
+
+        Parameters:
+            output: The output backend, such as NullOutput, WavFileOutput or SoundDeviceOutput.
+            sample_rate (int): The sample rate of the mix.
+            channels (int): The number of channels of the mix.
+            block_frames (int): The number of frames mixed and written at a time.
+            max_voices (int): The most voices that play at once.
+            max_buffer_bytes (int): The most memory the decoded sounds kept in memory may take up.
+            decoder (Callable[[str], PcmBuffer]): Reads and decodes a sound file, such as read_wav or sound_store.read_sound.
+        """
+        self.output = output
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_frames = block_frames
+        self.max_voices = max_voices
+        self.voices_stolen = 0
+        self.output_error: Exception | None = None
+        self.buffers = BufferCache(max_buffer_bytes)
+        self.decoder = decoder
+        self._voices: list[Voice] = []
+        self._voices_changed = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def load(self, file_path: str) -> PcmBuffer:
+        """
+        Decodes a sound file into the mixer's format, or returns it from memory if it was loaded before.
+
+        Parameters:
+            file_path (str): The path of the sound file.
+
+        Returns:
+            PcmBuffer: The decoded sound.
+
+        Raises:
+            OSError: If the file cannot be read.
+            WavFormatError: If the file cannot be decoded.
+        """
+        buffer = self.buffers.get(file_path)
+        if buffer is None:
+            buffer = self.buffers.put(file_path, self.decoder(file_path).converted(self.sample_rate, self.channels))
+        return buffer
+
+    def play(self, file_path: str, volume: float = 1.0, loop: bool = False, duration: float | None = None, stop_event: threading.Event | None = None) -> Voice:
+        """
+        Starts playing a sound.
+
+        Parameters:
+            file_path (str): The path of the WAV file.
+            volume (float): The gain to apply.
+            loop (bool): Whether to loop the sound without gaps until the duration passes, the stop event is set or the voice is stopped.
+            duration (float | None): How long to play for, in seconds, cut to the exact frame. None plays the sound once, or forever if looping.
+            stop_event (threading.Event | None): An event that stops the voice once it is set.
+
+        Returns:
+            Voice: The playing voice.
+
+        Raises:
+            OSError: If the file cannot be read.
+            WavFormatError: If the file cannot be decoded.
+        """
+        voice = Voice(file_path, self.load(file_path), volume, loop, duration, stop_event)
+        self._add_voice(voice)
+        return voice
+
+    def stop_all(self):
+        """
+        Stops every playing voice.
+        """
+        with self._voices_changed:
+            voices, self._voices = self._voices, []
+        for voice in voices:
+            voice._finish()
+
+    def close(self):
+        """
+        Stops every voice, stops the audio thread and closes the output. Playing another sound opens the output again.
+        """
+        self.stop_all()
+        with self._voices_changed:
+            self._closed = True
+            thread = self._thread
+            self._voices_changed.notify()
+        if thread:
+            thread.join()
+        with self._voices_changed:
+            self._closed = False
+
+    def _add_voice(self, voice: Voice):
+        """
+        Hands a voice to the audio thread, stealing the oldest voice if the mixer is full.
+
+        Parameters:
+            voice (Voice): The voice to add.
+        """
+        stolen_voices = []
+        with self._voices_changed:
+            while len(self._voices) >= self.max_voices:
+                stolen_voice = self._voices.pop(0)
+                stolen_voice.stolen = True
+                stolen_voices.append(stolen_voice)
+            self._voices.append(voice)
+            self.voices_stolen += len(stolen_voices)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audio-mixer", daemon=True)
+                self._thread.start()
+            self._voices_changed.notify()
+        for stolen_voice in stolen_voices:
+            stolen_voice._finish()
+
+    def _mix_block(self, voices: list[Voice]) -> np.ndarray:
+        """
+        Mixes the next block of every voice, finishing the voices that reach their end.
+
+        Parameters:
+            voices (list[Voice]): The voices to mix.
+
+        Returns:
+            np.ndarray: The mixed block, clipped to the range -1 to 1.
+        """
+        block = np.zeros((self.block_frames, self.channels), dtype=np.float32)
+        for voice in voices:
+            if voice.stop_event is not None and voice.stop_event.is_set():
+                voice._finish()
+            if voice.is_finished():
+                continue
+            samples = voice.buffer.samples
+            block_position = 0
+            # A looping voice may wrap around several times within one block, so copy it a run at a time
+            while block_position < self.block_frames:
+                run_frames = min(self.block_frames - block_position, len(samples) - voice.position)
+                if voice.frames_left is not None:
+                    run_frames = min(run_frames, voice.frames_left)
+                    voice.frames_left -= run_frames
+                if voice.volume == 1.0:
+                    block[block_position:block_position + run_frames] += samples[voice.position:voice.position + run_frames]
+                else:
+                    block[block_position:block_position + run_frames] += samples[voice.position:voice.position + run_frames] * voice.volume
+                block_position += run_frames
+                voice.position += run_frames
+                if voice.frames_left == 0 or not len(samples):
+                    voice._finish()
+                    break
+                if voice.position >= len(samples):
+                    if not voice.loop:
+                        voice._finish()
+                        break
+                    voice.position = 0
+        np.clip(block, -1.0, 1.0, out=block)
+        return block
+
+    def _run(self):
+        """
+        Runs the audio thread: mixes and writes a block at a time while voices are playing, and sleeps while none are.
+        Outputs that do not block on write are kept in real time against a monotonic clock.
+        If the output fails to open or write, the error is kept in output_error and the thread stops, finishing every voice
+        so nothing waits on them. The next sound played starts the thread again.
+        """
+        block_duration = self.block_frames / self.sample_rate
+        next_block_time = None
+        try:
+            self.output.open(self.sample_rate, self.channels)
+            self.output_error = None
+            while True:
+                with self._voices_changed:
+                    self._voices = [voice for voice in self._voices if not voice.is_finished()]
+                    while not self._voices and not self._closed:
+                        next_block_time = None
+                        self._voices_changed.wait()
+                    if self._closed:
+                        break
+                    voices = list(self._voices)
+                block = self._mix_block(voices)
+                if not self.output.paces_itself:
+                    now = monotonic()
+                    if next_block_time is None or next_block_time < now - block_duration:
+                        next_block_time = now
+                    if next_block_time > now:
+                        sleep(next_block_time - now)
+                    next_block_time += block_duration
+                self.output.write(block)
+        except Exception as error:
+            self.output_error = error
+        finally:
+            try:
+                self.output.close()
+            except Exception as error:
+                self.output_error = self.output_error or error
+            with self._voices_changed:
+                voices, self._voices = self._voices, []
+                self._thread = None
+            for voice in voices:
+                voice._finish()
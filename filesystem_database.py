@@ -0,0 +1,633 @@
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from filesystem_journal import FilesystemJournal, read_filesystem, snapshot_exists
+
+# Environment variable selecting where terminal filesystems are saved: 'json' (the default) for a snapshot and journal per terminal,
+# or 'sqlite' for one database holding every terminal
+FILESYSTEM_BACKEND_VARIABLE = "HACK_THE_PLANET_FILESYSTEM_BACKEND"
+
+# Name of the database, kept in the same directory as the JSON snapshots
+DATABASE_FILENAME = "filesystems.db"
+
+# Suffix of the JSON snapshot of each terminal, e.g. gibson_filesystem.json
+SNAPSHOT_SUFFIX = "_filesystem.json"
+
+# Seconds a connection waits for another connection to finish writing before giving up with 'database is locked'
+BUSY_TIMEOUT = 30
+
+# Every file and directory is one row, keyed by terminal and absolute path. Rows are loaded in id order, which keeps the order
+# entries were created in and always puts a directory before its contents. A row's content is the JSON of the file, NULL for a directory.
+# The terminals table counts each commit of a terminal, so a terminal can tell when something else changed its rows.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    terminal TEXT NOT NULL,
+    path TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_directory INTEGER NOT NULL,
+    content TEXT,
+    UNIQUE (terminal, path)
+);
+CREATE INDEX IF NOT EXISTS nodes_by_parent ON nodes (terminal, parent);
+CREATE INDEX IF NOT EXISTS nodes_by_name ON nodes (terminal, name, path);
+CREATE TABLE IF NOT EXISTS terminals (
+    terminal TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+"""
+
+_UPSERT_NODE = """
+INSERT INTO nodes (terminal, path, parent, name, is_directory, content) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (terminal, path) DO UPDATE SET is_directory = excluded.is_directory, content = excluded.content
+"""
+
+def database_backend_selected() -> bool:
+    """
+    Checks whether the HACK_THE_PLANET_FILESYSTEM_BACKEND environment variable selects the SQLite backend.
+
+    Returns:
+        bool: True if filesystems are saved in the database.
+    """
+    return os.environ.get(FILESYSTEM_BACKEND_VARIABLE, "json") == "sqlite"
+
+def database_path(snapshot_path: str | Path) -> Path:
+    """
+    Returns the path of the database kept next to the JSON snapshots.
+
+    Parameters:
+        snapshot_path (str | Path): The path of any terminal's snapshot, or of the directory holding them.
+
+    Returns:
+        Path: The path of the database.
+    """
+    snapshot_path = Path(snapshot_path)
+    directory = snapshot_path if snapshot_path.suffix != ".json" else snapshot_path.parent
+    return directory / DATABASE_FILENAME
+
+def terminal_name_of(snapshot_path: str | Path) -> str:
+    """
+    Returns the name of the terminal a JSON snapshot belongs to, e.g. gibson for gibson_filesystem.json.
+    """
+    name = Path(snapshot_path).name
+    return name[:-len(SNAPSHOT_SUFFIX)] if name.endswith(SNAPSHOT_SUFFIX) else Path(snapshot_path).stem
+
+def _descendant_range(path: str) -> tuple[str, str]:
+    """
+    Returns the bounds of the paths below a path: every such path is at least the first bound and less than the second,
+    since '0' is the character after '/'.
+    """
+    prefix = path.rstrip("/") + "/"
+    return prefix, prefix[:-1] + "0"
+
+def _split(path: str) -> tuple[str, str]:
+    """
+    Returns the parent path and the name of an absolute path.
+    """
+    parent, name = path.rsplit("/", 1)
+    return parent or "/", name
+
+def _rows(path: str, value) -> list[tuple[str, str, str, int, str | None]]:
+    """
+    Flattens a file or directory into node rows, a directory before its contents.
+
+    Returns:
+        list[tuple[str, str, str, int, str | None]]: The path, parent path, name, directory flag and content of each row.
+    """
+    parent, name = _split(path)
+    rows = []
+    stack = [(path, parent, name, value)]
+    while stack:
+        path, parent, name, value = stack.pop()
+        if isinstance(value, dict):
+            rows.append((path, parent, name, 1, None))
+            stack.extend((f"{path}/{child_name}", path, child_name, child) for child_name, child in reversed(value.items()))
+        else:
+            rows.append((path, parent, name, 0, json.dumps(value)))
+    return rows
+
+def _connect(path: Path) -> sqlite3.Connection:
+    """
+    Opens the database, creating its tables if they do not exist yet. Every terminal has its own connection,
+    so a connection waits up to BUSY_TIMEOUT seconds for another one to finish writing instead of failing.
+    WAL mode is kept in the database file, so it is only switched on when the database is created.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+    if connection.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+        connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.executescript(_SCHEMA)
+    return connection
+
+def _load_tree(connection: sqlite3.Connection, terminal: str) -> dict | None:
+    """
+    Builds a terminal's filesystem from its rows.
+
+    Returns:
+        dict | None: The filesystem, or None if the terminal was never saved.
+    """
+    if connection.execute("SELECT 1 FROM terminals WHERE terminal = ?", (terminal,)).fetchone() is None:
+        return None
+    root = {}
+    directories = {"/": root}
+    for path, parent, name, is_directory, content in connection.execute("SELECT path, parent, name, is_directory, content FROM nodes WHERE terminal = ? ORDER BY id", (terminal,)):
+        directory = directories.get(parent)
+        if directory is None:
+            continue # Its directory was deleted; nothing can reach it
+        if is_directory:
+            directory[name] = directories[path] = {}
+        else:
+            directory[name] = json.loads(content)
+    return {"/": root}
+
+def _tree_rows(filesystem: dict) -> list[tuple[str, str, str, int, str | None]]:
+    """
+    Flattens a whole filesystem into node rows, each directory before its contents.
+    """
+    return [row for name, value in filesystem["/"].items() for row in _rows("/" + name, value)]
+
+def _write_tree(connection: sqlite3.Connection, terminal: str, rows: list[tuple[str, str, str, int, str | None]]):
+    """
+    Replaces all the rows of a terminal with the rows of a whole filesystem. Called inside a transaction.
+    """
+    connection.execute("DELETE FROM nodes WHERE terminal = ?", (terminal,))
+    connection.executemany("INSERT INTO nodes (terminal, path, parent, name, is_directory, content) VALUES (?, ?, ?, ?, ?, ?)",
+        ((terminal, *row) for row in rows))
+
+class FilesystemDatabase:
+    """
+    Keeps a terminal's filesystem in a SQLite database shared by all terminals, as one row per file and directory.
+    It saves the same changes as FilesystemJournal and can take its place in a Terminal. Instead of appending records to a file,
+    each change becomes a few row writes, which a background writer thread commits in batches, one transaction per batch.
+
+    The rows are indexed by path, by parent directory and by name, so listing a directory, finding names and reading a single file
+    are queries that never load the whole filesystem.
+
+    Changes must be made while holding lock, so they are queued in the order they are made. The writer takes the queued batch
+    and commits it while holding only the connection lock, so a slow commit never holds up changes to the filesystem in memory.
+    The locks are always taken in the order lock, connection lock, pending lock.
+
+    Attributes:
+        database_path (Path): The path of the database.
+        terminal (str): The name of the terminal whose rows this object manages.
+        lock (threading.RLock): Held while changing the filesystem and while it is flattened to be written whole.
+        dirty (bool): Whether the whole filesystem must be written again, such as after it was replaced.
+        generation (int | None): The commit count of the terminal last loaded or committed, or None if it was never saved.
+        batches_committed (int): The number of transactions committed.
+    """
+
+    def __init__(self, database_path: str | Path, terminal: str, get_filesystem: Callable[[], dict]) -> None:
+        """
+        Initializes the database storage of a terminal's filesystem.
+
+        Parameters:
+            database_path (str | Path): The path of the database.
+            terminal (str): The name of the terminal.
+            get_filesystem (Callable[[], dict]): Returns the current filesystem, for writing it whole.
+        """
+        self.database_path = Path(database_path)
+        self.terminal = terminal
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.generation: int | None = None
+        self.batches_committed = 0
+        self._get_filesystem = get_filesystem
+        self._connection: sqlite3.Connection | None = None
+        self._connection_lock = threading.RLock() # Held while using the connection, so batches are committed one at a time and in order
+        self._pending_lock = threading.RLock() # Held only briefly, while the queue and the writer thread are looked at or changed
+        self._pending: list[tuple] = []
+        self._written = False
+        self._write_thread: threading.Thread | None = None
+        self._write_requested = False
+        self._closed = False
+        atexit.register(self.wait)
+
+    def _database(self) -> sqlite3.Connection:
+        """
+        Returns the connection to the database, opening it the first time. Called with the connection lock held.
+        """
+        if self._connection is None:
+            self._connection = _connect(self.database_path)
+        return self._connection
+
+    def _stored_generation(self) -> int | None:
+        """
+        Returns the commit count of the terminal in the database, or None if it was never saved. Called with the connection lock held.
+        """
+        row = self._database().execute("SELECT generation FROM terminals WHERE terminal = ?", (self.terminal,)).fetchone()
+        return row[0] if row else None
+
+    def exists(self) -> bool:
+        """
+        Checks whether the filesystem was saved before.
+
+        Returns:
+            bool: True if the database holds the terminal.
+        """
+        with self._connection_lock:
+            return self.database_path.exists() and self._stored_generation() is not None
+
+    def is_current(self) -> bool:
+        """
+        Checks whether the database still holds what this object last loaded or committed, so the filesystem in memory is up to date.
+        Changes waiting for the writer count as current, since they are changes to the filesystem in memory.
+
+        Returns:
+            bool: False if the terminal's rows were committed by something else.
+        """
+        with self._connection_lock:
+            return self._stored_generation() == self.generation
+
+    def load(self) -> dict | None:
+        """
+        Loads the filesystem from the database, after committing the queued changes.
+
+        Returns:
+            dict | None: The filesystem, or None if the terminal was never saved.
+        """
+        with self.lock:
+            if self._written:
+                self._queue_rewrite()
+                self._commit_pending()
+            with self._connection_lock:
+                self.generation = self._stored_generation()
+                filesystem = _load_tree(self._database(), self.terminal)
+            with self._pending_lock:
+                self._written = filesystem is not None
+            return filesystem
+
+    def record_set(self, path: list[str], value):
+        """
+        Queues writing the rows of the entry at a path, which was set to a value.
+
+        Parameters:
+            path (list[str]): The names leading from the root directory to the entry.
+            value: The file content or directory the entry was set to.
+        """
+        self._append(("set", "/" + "/".join(path), _rows("/" + "/".join(path), value)))
+
+    def record_copy(self, source_path: list[str], path: list[str]):
+        """
+        Queues copying the rows of the entry at one path to another path. The rows are copied inside the database.
+
+        Parameters:
+            source_path (list[str]): The names leading from the root directory to the entry copied.
+            path (list[str]): The names leading from the root directory to the copy.
+        """
+        self._append(("copy", "/" + "/".join(source_path), "/" + "/".join(path)))
+
+    def record_delete(self, path: list[str]):
+        """
+        Queues deleting the rows of the entry at a path and everything below it.
+
+        Parameters:
+            path (list[str]): The names leading from the root directory to the entry.
+        """
+        self._append(("delete", "/" + "/".join(path)))
+
+    def _append(self, operation: tuple):
+        """
+        Queues a change for the writer thread. Changes to a filesystem that was never saved are not queued,
+        since writing it whole includes them.
+        """
+        with self._pending_lock:
+            if self._closed:
+                return
+            if not self._written or self.dirty:
+                self.dirty = True
+                return
+            self._pending.append(operation)
+            self._write_in_background()
+
+    def _queue_rewrite(self):
+        """
+        Queues writing the whole filesystem in place of the queued changes, if it was replaced or never saved.
+        The filesystem is flattened while holding the lock, so it cannot change halfway, before any other lock is taken.
+        """
+        with self._pending_lock:
+            if self._closed or (self._written and not self.dirty):
+                return
+        with self.lock:
+            rows = _tree_rows(self._get_filesystem())
+            with self._pending_lock:
+                self._pending = [("replace", rows)]
+                self.dirty = False
+                self._written = True
+
+    def _apply(self, connection: sqlite3.Connection, operation: tuple):
+        """
+        Applies a queued change to the terminal's rows. Called inside a transaction.
+        """
+        if operation[0] == "replace":
+            _write_tree(connection, self.terminal, operation[1])
+            return
+        kind, path, *arguments = operation
+        lower, upper = _descendant_range(path)
+        if kind == "copy":
+            destination = arguments[0]
+            source = connection.execute("SELECT is_directory, content FROM nodes WHERE terminal = ? AND path = ?", (self.terminal, path)).fetchone()
+            if source is None:
+                return
+            destination_lower, destination_upper = _descendant_range(destination)
+            connection.execute("DELETE FROM nodes WHERE terminal = ? AND path >= ? AND path < ?", (self.terminal, destination_lower, destination_upper))
+            connection.execute(_UPSERT_NODE, (self.terminal, destination, *_split(destination), *source))
+            connection.execute("""
+                INSERT INTO nodes (terminal, path, parent, name, is_directory, content)
+                SELECT terminal, ? || substr(path, ?), ? || substr(parent, ?), name, is_directory, content FROM nodes
+                WHERE terminal = ? AND path >= ? AND path < ? ORDER BY id
+                """, (destination, len(path) + 1, destination, len(path) + 1, self.terminal, lower, upper))
+            return
+        connection.execute("DELETE FROM nodes WHERE terminal = ? AND path >= ? AND path < ?", (self.terminal, lower, upper))
+        if kind == "delete":
+            connection.execute("DELETE FROM nodes WHERE terminal = ? AND path = ?", (self.terminal, path))
+        else:
+            connection.executemany(_UPSERT_NODE, ((self.terminal, *row) for row in arguments[0]))
+
+    def _commit_pending(self):
+        """
+        Takes the queued changes and commits them in one transaction. Only the connection lock is held while committing,
+        so changes made meanwhile are queued for the next batch. If the commit fails, the whole filesystem is written next time.
+        """
+        with self._connection_lock:
+            with self._pending_lock:
+                if self._closed or not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+            connection = self._database()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for operation in batch:
+                    self._apply(connection, operation)
+                connection.execute("INSERT INTO terminals (terminal, generation) VALUES (?, 1) ON CONFLICT (terminal) DO UPDATE SET generation = generation + 1", (self.terminal,))
+                generation = self._stored_generation()
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                with self._pending_lock:
+                    self.dirty = True
+                raise
+            self.generation = generation
+            self.batches_committed += 1
+
+    def _write_in_background(self):
+        """
+        Asks the writer thread to commit the queued changes, starting the thread if it is not running.
+        Changes queued while a batch is being committed are committed together in the next batch.
+        """
+        with self._pending_lock:
+            self._write_requested = True
+            if self._write_thread is None:
+                self._write_thread = threading.Thread(target=self._write_while_requested, name=f"database-{self.terminal}", daemon=True)
+                self._write_thread.start()
+
+    def _write_while_requested(self):
+        """
+        Runs the writer thread: commits batches until no more are requested.
+        """
+        try:
+            while True:
+                with self._pending_lock:
+                    if not self._write_requested:
+                        self._write_thread = None
+                        return
+                    self._write_requested = False
+                self._queue_rewrite()
+                self._commit_pending()
+        except BaseException:
+            with self._pending_lock:
+                self._write_thread = None
+            raise
+
+    def compact_in_background(self):
+        """
+        Commits the queued changes, or the whole filesystem if it was replaced or never saved, on the writer thread.
+        Named after FilesystemJournal.compact_in_background, which it stands in for.
+        """
+        with self._pending_lock:
+            if not self._closed:
+                self._write_in_background()
+
+    def wait(self):
+        """
+        Waits for the writer thread to commit every queued change.
+        """
+        while True:
+            with self._pending_lock:
+                write_thread = self._write_thread
+            if write_thread is None or write_thread is threading.current_thread():
+                return
+            write_thread.join()
+
+    def _query(self, sql: str, parameters: tuple) -> list[tuple]:
+        """
+        Runs a query on the terminal's rows once the writer has committed the queued changes, so the result matches the filesystem in memory.
+        Must not be called with the lock held, since the writer may need it to write the whole filesystem.
+        """
+        with self._pending_lock:
+            if self._pending or self.dirty or not self._written:
+                self._write_in_background()
+        self.wait()
+        with self._connection_lock:
+            return self._database().execute(sql, parameters).fetchall()
+
+    def list_directory(self, path: str) -> list[tuple[str, bool]] | None:
+        """
+        Lists a directory with an indexed lookup of its entries.
+
+        Parameters:
+            path (str): The absolute path of the directory.
+
+        Returns:
+            list[tuple[str, bool]] | None: The name of each entry and whether it is a directory, in the order they were created,
+            or None if there is no directory at the path.
+        """
+        if path != "/" and not self._query("SELECT 1 FROM nodes WHERE terminal = ? AND path = ? AND is_directory", (self.terminal, path)):
+            return None
+        return [(name, bool(is_directory)) for name, is_directory in self._query("SELECT name, is_directory FROM nodes WHERE terminal = ? AND parent = ? ORDER BY id", (self.terminal, path))]
+
+    def search(self, term: str, under: str = "/", show_hidden: bool = False) -> list[tuple[str, bool]]:
+        """
+        Finds the files and directories whose name contains a term, or matches it if the term is a glob pattern such as '*.log',
+        with a range scan of the path index below the directory searched.
+
+        Parameters:
+            term (str): The substring or glob pattern to look for.
+            under (str): The absolute path of the directory to search in.
+            show_hidden (bool): Whether to include names starting with '.'.
+
+        Returns:
+            list[tuple[str, bool]]: The absolute path of each match and whether it is a directory, sorted by path.
+        """
+        lower, upper = _descendant_range(under)
+        if any(character in term for character in "*?["):
+            condition, pattern = "name GLOB ?", term.replace("[!", "[^")
+        else:
+            condition, pattern = "instr(name, ?) > 0", term
+        hidden = "" if show_hidden else " AND name NOT LIKE '.%'"
+        rows = self._query(f"SELECT path, is_directory FROM nodes WHERE terminal = ? AND path >= ? AND path < ? AND {condition}{hidden} ORDER BY path", (self.terminal, lower, upper, pattern))
+        return [(path, bool(is_directory)) for path, is_directory in rows]
+
+    def name_exists(self, name: str, under: str = "/") -> bool:
+        """
+        Checks whether a file or directory with exactly this name is anywhere in a directory, with a lookup of the name index.
+
+        Parameters:
+            name (str): The name to look for.
+            under (str): The absolute path of the directory to look in.
+
+        Returns:
+            bool: True if the name is found.
+        """
+        lower, upper = _descendant_range(under)
+        return bool(self._query("SELECT 1 FROM nodes WHERE terminal = ? AND name = ? AND path >= ? AND path < ? LIMIT 1", (self.terminal, name, lower, upper)))
+
+    def read(self, path: str, default=None):
+        """
+        Reads a single file with a lookup of the path index.
+
+        Parameters:
+            path (str): The absolute path of the file.
+            default: What to return if there is no file at the path.
+
+        Returns:
+            The content of the file, or default.
+        """
+        rows = self._query("SELECT content FROM nodes WHERE terminal = ? AND path = ? AND NOT is_directory", (self.terminal, path))
+        return json.loads(rows[0][0]) if rows else default
+
+    def close(self):
+        """
+        Commits the queued changes, stops saving changes and closes the database. Used before the saved files are deleted.
+        """
+        self.wait()
+        self._queue_rewrite()
+        self._commit_pending()
+        with self._connection_lock:
+            with self._pending_lock:
+                self._closed = True
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+def open_filesystem_storage(snapshot_path: str | Path, terminal: str, get_filesystem: Callable[[], dict]) -> FilesystemJournal | FilesystemDatabase:
+    """
+    Opens the storage of a terminal's filesystem selected by the HACK_THE_PLANET_FILESYSTEM_BACKEND environment variable.
+
+    Parameters:
+        snapshot_path (str | Path): The path of the terminal's JSON snapshot. The database is kept next to it.
+        terminal (str): The name of the terminal.
+        get_filesystem (Callable[[], dict]): Returns the current filesystem.
+
+    Returns:
+        FilesystemJournal | FilesystemDatabase: The storage.
+    """
+    if database_backend_selected():
+        return FilesystemDatabase(database_path(snapshot_path), terminal, get_filesystem)
+    return FilesystemJournal(snapshot_path, get_filesystem)
+
+def saved_filesystem_exists(snapshot_path: str | Path) -> bool:
+    """
+    Checks whether a terminal's filesystem was saved, in the storage selected by the HACK_THE_PLANET_FILESYSTEM_BACKEND environment variable.
+
+    Parameters:
+        snapshot_path (str | Path): The path of the terminal's JSON snapshot.
+
+    Returns:
+        bool: True if the filesystem can be loaded.
+    """
+    if not database_backend_selected():
+        return snapshot_exists(snapshot_path)
+    path = database_path(snapshot_path)
+    if not path.exists():
+        return False
+    connection = _connect(path)
+    try:
+        return connection.execute("SELECT 1 FROM terminals WHERE terminal = ?", (terminal_name_of(snapshot_path),)).fetchone() is not None
+    finally:
+        connection.close()
+
+def read_saved_filesystem(snapshot_path: str | Path) -> dict | None:
+    """
+    Reads a terminal's saved filesystem from the storage selected by the HACK_THE_PLANET_FILESYSTEM_BACKEND environment variable,
+    without opening it for changes.
+
+    Parameters:
+        snapshot_path (str | Path): The path of the terminal's JSON snapshot.
+
+    Returns:
+        dict | None: The filesystem, or None if it was never saved.
+    """
+    if not database_backend_selected():
+        loaded = read_filesystem(snapshot_path)
+        return loaded[0] if loaded else None
+    path = database_path(snapshot_path)
+    if not path.exists():
+        return None
+    connection = _connect(path)
+    try:
+        return _load_tree(connection, terminal_name_of(snapshot_path))
+    finally:
+        connection.close()
+
+def migrate_json_filesystems(filesystem_dir: str | Path) -> dict[str, int]:
+    """
+    Imports every terminal's JSON snapshot, with the changes in its journal, into the database in the same directory.
+    A terminal already in the database is replaced. The JSON files are left as they are.
+
+    Parameters:
+        filesystem_dir (str | Path): The directory holding the snapshots.
+
+    Returns:
+        dict[str, int]: The number of files and directories imported, by terminal name.
+    """
+    filesystem_dir = Path(filesystem_dir)
+    imported = {}
+    connection = _connect(database_path(filesystem_dir))
+    try:
+        for snapshot_path in sorted(filesystem_dir.glob("*" + SNAPSHOT_SUFFIX)):
+            loaded = read_filesystem(snapshot_path)
+            if loaded is None:
+                continue
+            terminal = terminal_name_of(snapshot_path)
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                _write_tree(connection, terminal, _tree_rows(loaded[0]))
+                connection.execute("INSERT INTO terminals (terminal, generation) VALUES (?, 1) ON CONFLICT (terminal) DO UPDATE SET generation = generation + 1", (terminal,))
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            imported[terminal] = connection.execute("SELECT count(*) FROM nodes WHERE terminal = ?", (terminal,)).fetchone()[0]
+    finally:
+        connection.close()
+    return imported
+
+if __name__ == "__main__":
+    def main():
+        """
+        Imports the JSON filesystems into the database. Run the game with HACK_THE_PLANET_FILESYSTEM_BACKEND=sqlite to use it.
+
+        Usage:
+            python filesystem_database.py [<filesystems directory>]
+        """
+
+        from utility import Utility
+        args = sys.argv[1:]
+        if len(args) > 1:
+            print("Usage: python filesystem_database.py [<filesystems directory>]")
+            sys.exit(1)
+        filesystem_dir = Path(args[0]) if args else Utility.get_app_support_directory() / "filesystems"
+        imported = migrate_json_filesystems(filesystem_dir)
+        if not imported:
+            print(f"No JSON filesystems found in {filesystem_dir}")
+        for terminal, node_count in imported.items():
+            print(f"{terminal}: {node_count:,} files and directories imported into {database_path(filesystem_dir)}")
+
+    main()
@@ -0,0 +1,494 @@
+import atexit
+import copy
+import json
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+# Extension of the journal kept next to a filesystem snapshot, e.g. localhost_filesystem.journal for localhost_filesystem.json
+JOURNAL_EXTENSION = ".journal"
+
+# Extension of the file holding how many times a filesystem's snapshot and journal were written, e.g. localhost_filesystem.generation
+GENERATION_EXTENSION = ".generation"
+
+# Suffix of the previous generation of a snapshot, kept as a backup while the next one is written
+BACKUP_SUFFIX = ".bak"
+
+# Key of the snapshot holding the sequence number of the last journal record the snapshot includes
+SNAPSHOT_SEQUENCE_KEY = "journal_sequence"
+
+def journal_path(snapshot_path: str | Path) -> Path:
+    """
+    Returns the path of the journal kept next to a filesystem snapshot.
+
+    Parameters:
+        snapshot_path (str | Path): The path of the snapshot.
+
+    Returns:
+        Path: The path of the journal.
+    """
+    return Path(snapshot_path).with_suffix(JOURNAL_EXTENSION)
+
+def generation_path(snapshot_path: str | Path) -> Path:
+    """
+    Returns the path of the generation counter kept next to a filesystem snapshot.
+
+    Parameters:
+        snapshot_path (str | Path): The path of the snapshot.
+
+    Returns:
+        Path: The path of the generation counter.
+    """
+    return Path(snapshot_path).with_suffix(GENERATION_EXTENSION)
+
+def backup_path(snapshot_path: str | Path) -> Path:
+    """
+    Returns the path of the backup of a filesystem snapshot, which holds the snapshot's previous generation.
+
+    Parameters:
+        snapshot_path (str | Path): The path of the snapshot.
+
+    Returns:
+        Path: The path of the backup, e.g. localhost_filesystem.json.bak.
+    """
+    snapshot_path = Path(snapshot_path)
+    return snapshot_path.with_name(snapshot_path.name + BACKUP_SUFFIX)
+
+def snapshot_exists(snapshot_path: str | Path) -> bool:
+    """
+    Checks whether a filesystem was saved, either as its snapshot or, if saving was cut off, as its backup.
+
+    Parameters:
+        snapshot_path (str | Path): The path of the snapshot.
+
+    Returns:
+        bool: True if the filesystem can be loaded.
+    """
+    return os.path.exists(snapshot_path) or backup_path(snapshot_path).exists()
+
+def _write_file_atomically(file_path: Path, text: str, backup_file_path: Path | None = None):
+    """
+    Writes a file so that it is always either completely old or completely new, even if the game crashes or the power goes out.
+    The text goes to a temporary file first, which is flushed to disk and then renamed over the file.
+    With a backup path, the old file is kept there instead of being replaced.
+    """
+    temporary_path = file_path.with_name(file_path.name + ".tmp")
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    if backup_file_path is not None and file_path.exists():
+        os.replace(file_path, backup_file_path)
+    os.replace(temporary_path, file_path)
+    # Make the renames themselves durable. Not every platform can open a directory, in which case the rename is left to the OS
+    try:
+        directory = os.open(file_path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory)
+    except OSError:
+        pass
+    finally:
+        os.close(directory)
+
+def _read_records(journal_file_path: Path) -> list[dict]:
+    """
+    Reads the records of a journal. Reading stops at the first line that is not a complete record, which is where a write was cut off.
+    """
+    records = []
+    try:
+        with open(journal_file_path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    except FileNotFoundError:
+        pass
+    return records
+
+def apply_record(filesystem: dict, record: dict):
+    """
+    Applies a journal record to a filesystem.
+
+    Parameters:
+        filesystem (dict): The filesystem, with its root directory under "/".
+        record (dict): The record, setting, copying or deleting the entry at its path below the root.
+    """
+    *directory_parts, name = record["path"]
+    directory = _directory_at(filesystem, directory_parts)
+    if directory is None:
+        return
+    if record["op"] == "set":
+        directory[name] = record["value"]
+    elif record["op"] == "copy":
+        *source_directory_parts, source_name = record["from"]
+        source_directory = _directory_at(filesystem, source_directory_parts)
+        if source_directory is not None and source_name in source_directory:
+            directory[name] = copy.deepcopy(source_directory[source_name])
+    else:
+        directory.pop(name, None)
+
+def _directory_at(filesystem: dict, directory_parts: list[str]) -> dict | None:
+    """
+    Returns the directory at the names leading from the root directory, or None if there is no directory there.
+    """
+    directory = filesystem["/"]
+    for part in directory_parts:
+        directory = directory.get(part)
+        if not isinstance(directory, dict):
+            return None
+    return directory
+
+def _read_snapshot(snapshot_path: str | Path) -> tuple[dict, int] | None:
+    """
+    Reads a filesystem snapshot, or its backup if the snapshot is missing or damaged.
+
+    Returns:
+        tuple[dict, int] | None: The filesystem and the sequence number of the last journal record it includes, or None if neither can be read.
+    """
+    for file_path in (Path(snapshot_path), backup_path(snapshot_path)):
+        try:
+            with open(file_path, encoding="utf-8") as file:
+                filesystem = json.load(file)
+        except FileNotFoundError:
+            continue
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        return filesystem, filesystem.pop(SNAPSHOT_SEQUENCE_KEY, 0)
+    return None
+
+def _replay_records(filesystem: dict, sequence: int, journal_file_path: Path) -> int:
+    """
+    Applies the journal records newer than a snapshot to the snapshot's filesystem.
+
+    Returns:
+        int: The sequence number of the last record.
+    """
+    for record in _read_records(journal_file_path):
+        if record["seq"] > sequence:
+            apply_record(filesystem, record)
+            sequence = record["seq"]
+    return sequence
+
+def read_filesystem(snapshot_path: str | Path) -> tuple[dict, int] | None:
+    """
+    Reads a filesystem as it was last changed: its snapshot with the journal records made since the snapshot replayed on top.
+    If the snapshot is damaged, the backup is used instead; the journal keeps the records made since the backup, so no change is lost.
+
+    Parameters:
+        snapshot_path (str | Path): The path of the snapshot.
+
+    Returns:
+        tuple[dict, int] | None: The filesystem and the sequence number of its last change, or None if there is no snapshot.
+    """
+    snapshot = _read_snapshot(snapshot_path)
+    if snapshot is None:
+        return None
+    filesystem, sequence = snapshot
+    return filesystem, _replay_records(filesystem, sequence, journal_path(snapshot_path))
+
+class FilesystemJournal:
+    """
+    Keeps a terminal's filesystem on disk as a snapshot plus an append-only journal of the changes made since.
+    Every change is appended to the journal as one small record, so saving costs as much as the change rather than the whole filesystem.
+    Compacting writes the whole filesystem as a new snapshot on a background writer thread, when the terminal saves or exits
+    and once enough records have piled up.
+
+    Records are only replayed on top of a snapshot, so the first change to a filesystem that has no snapshot yet writes one right away.
+    Snapshots are written atomically and the previous one is kept as a backup. The journal keeps every record the backup does not include,
+    so a damaged snapshot falls back to the backup without losing changes. Pending compactions are finished before the game exits.
+
+    Changes must be made while holding lock, so a compaction never sees a change that is not yet in the journal.
+
+    Attributes:
+        snapshot_path (Path): The path of the snapshot.
+        journal_path (Path): The path of the journal.
+        generation_path (Path): The path of the generation counter, which every write of the snapshot or the journal counts up.
+        lock (threading.RLock): Held while changing the filesystem and while compaction reads it.
+        generation (int): The generation counter as this journal last loaded or wrote it.
+        sequence (int): The sequence number of the last record.
+        snapshot_sequence (int): The sequence number of the last record the snapshot includes.
+        dirty (bool): Whether there are changes the snapshot does not include.
+        records_since_compaction (int): The number of records appended since the last compaction.
+        compact_after (int): The number of records after which the journal is compacted in the background.
+    """
+
+    def __init__(self, snapshot_path: str | Path, get_filesystem: Callable[[], dict], compact_after: int = 256) -> None:
+        """
+        Initializes the journal of a filesystem snapshot.
+
+        Parameters:
+            snapshot_path (str | Path): The path of the snapshot.
+            get_filesystem (Callable[[], dict]): Returns the current filesystem, for compaction.
+            compact_after (int): The number of records after which the journal is compacted in the background.
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.journal_path = journal_path(snapshot_path)
+        self.generation_path = generation_path(snapshot_path)
+        self.lock = threading.RLock()
+        self.generation = 0
+        self.sequence = 0
+        self.snapshot_sequence = 0
+        self.dirty = False
+        self.records_since_compaction = 0
+        self.compact_after = compact_after
+        self._get_filesystem = get_filesystem
+        self._journal_file = None
+        self._compact_lock = threading.Lock()
+        self._compact_thread: threading.Thread | None = None
+        self._compact_requested = False
+        self._closed = False
+        self._known_signature: tuple | None = None
+        self._writing = False
+        self._has_snapshot = False
+        atexit.register(self.wait)
+
+    def _signature(self) -> tuple:
+        """
+        Returns the modification time and size of the snapshot and the journal, or None for a file that does not exist.
+        """
+        signature = []
+        for file_path in (self.snapshot_path, self.journal_path):
+            try:
+                stat = os.stat(file_path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _stored_generation(self) -> int | None:
+        """
+        Returns the generation counter on disk, 0 if there is none yet, or None if it cannot be read.
+        """
+        try:
+            return int(self.generation_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError):
+            return None
+
+    def _count_generation(self):
+        """
+        Counts up the generation counter after writing the snapshot or the journal. Called with the lock held.
+        """
+        self.generation += 1
+        self.generation_path.write_text(str(self.generation), encoding="utf-8")
+
+    def _remember_signature(self):
+        """
+        Records that the files on disk hold what this journal last loaded or wrote. Called with the lock held.
+        """
+        self._known_signature = self._signature()
+
+    def is_current(self) -> bool:
+        """
+        Checks whether the files on disk still hold what this journal last loaded or wrote, so the filesystem in memory is up to date.
+        The generation counter is checked first, since it catches a write that left the modification time and size of the files unchanged,
+        then the modification time and size of the snapshot and the journal, which catch a write by something that does not count generations.
+        Files being written by the background writer count as current, since the writer is writing the filesystem in memory.
+
+        Returns:
+            bool: False if the files were changed by something else, or were never loaded.
+        """
+        with self.lock:
+            if self._writing:
+                return True
+            return self._known_signature is not None and self._stored_generation() == self.generation and self._signature() == self._known_signature
+
+    def exists(self) -> bool:
+        """
+        Checks whether the filesystem was saved before.
+
+        Returns:
+            bool: True if there is a snapshot or a backup to load.
+        """
+        return snapshot_exists(self.snapshot_path)
+
+    def load(self) -> dict | None:
+        """
+        Loads the filesystem from its snapshot and journal, and continues the journal from its last record.
+        Without a snapshot, any journal left over is discarded, since it has nothing to apply to. The first change to a new filesystem
+        writes its snapshot, so a journal is only left without one if that write failed.
+
+        Returns:
+            dict | None: The filesystem, or None if there is no snapshot.
+        """
+        with self.lock:
+            snapshot = _read_snapshot(self.snapshot_path)
+            if snapshot is None:
+                self._close_journal_file()
+                self.journal_path.unlink(missing_ok=True)
+                self.sequence = self.snapshot_sequence = 0
+                self._has_snapshot = False
+                self.generation = self._stored_generation() or 0
+                self._remember_signature()
+                return None
+            filesystem, self.snapshot_sequence = snapshot
+            self._has_snapshot = True
+            self.sequence = _replay_records(filesystem, self.snapshot_sequence, self.journal_path)
+            self.dirty = self.sequence > self.snapshot_sequence
+            self.records_since_compaction = 0
+            self.generation = self._stored_generation() or 0
+            self._remember_signature()
+            return filesystem
+
+    def record_set(self, path: list[str], value):
+        """
+        Appends a record that the entry at a path was set to a value.
+
+        Parameters:
+            path (list[str]): The names leading from the root directory to the entry.
+            value: The file content or directory the entry was set to.
+        """
+        self._append({"op": "set", "path": path, "value": value})
+
+    def record_copy(self, source_path: list[str], path: list[str]):
+        """
+        Appends a record that the entry at a path was set to a copy of the entry at another path.
+        Unlike a set record, the record does not hold the copied content, so it is small however large the copy is.
+
+        Parameters:
+            source_path (list[str]): The names leading from the root directory to the entry copied.
+            path (list[str]): The names leading from the root directory to the copy.
+        """
+        self._append({"op": "copy", "from": source_path, "path": path})
+
+    def record_delete(self, path: list[str]):
+        """
+        Appends a record that the entry at a path was deleted.
+
+        Parameters:
+            path (list[str]): The names leading from the root directory to the entry.
+        """
+        self._append({"op": "delete", "path": path})
+
+    def _append(self, record: dict):
+        """
+        Numbers a record and appends it to the journal, starting a background compaction if the journal has grown long.
+        If the filesystem has no snapshot yet and none is being written, the snapshot is written instead, with the change in it.
+        """
+        with self.lock:
+            if self._closed:
+                return
+            if not self._has_snapshot and not self._writing:
+                self._write_first_snapshot()
+                return
+            self.sequence += 1
+            if self._journal_file is None:
+                self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+            self._journal_file.write(json.dumps({"seq": self.sequence, **record}, separators=(",", ":")) + "\n")
+            self._journal_file.flush()
+            self._count_generation()
+            self._remember_signature()
+            self.dirty = True
+            self.records_since_compaction += 1
+            if self.records_since_compaction >= self.compact_after:
+                self.compact_in_background()
+
+    def _write_first_snapshot(self):
+        """
+        Writes the snapshot of a filesystem that has none yet, before it has had time to grow. Called with the lock held.
+        """
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_file_atomically(self.snapshot_path, json.dumps({**self._get_filesystem(), SNAPSHOT_SEQUENCE_KEY: self.sequence}, indent=4))
+        self.snapshot_sequence = self.sequence
+        self.dirty = False
+        self._has_snapshot = True
+        self._count_generation()
+        self._remember_signature()
+
+    def compact_in_background(self):
+        """
+        Asks the background writer thread to compact the journal, starting the thread if it is not running.
+        A request made while a compaction is running is picked up by another compaction right after it.
+        """
+        with self.lock:
+            if self._closed:
+                return
+            self._compact_requested = True
+            if self._compact_thread is None:
+                self._compact_thread = threading.Thread(target=self._compact_while_requested, name=f"compact-{self.snapshot_path.stem}", daemon=True)
+                self._compact_thread.start()
+
+    def _compact_while_requested(self):
+        """
+        Runs the background writer thread: compacts until no more compactions are requested.
+        """
+        while True:
+            with self.lock:
+                if not self._compact_requested:
+                    self._compact_thread = None
+                    return
+                self._compact_requested = False
+            self.compact()
+
+    def wait(self):
+        """
+        Waits for the background writer thread to finish its compactions.
+        """
+        while True:
+            with self.lock:
+                compact_thread = self._compact_thread
+            if compact_thread is None or compact_thread is threading.current_thread():
+                return
+            compact_thread.join()
+
+    def compact(self):
+        """
+        Writes the whole filesystem as a new snapshot, keeping the previous one as the backup,
+        and drops the journal records the backup includes. Does nothing if the snapshot already includes every change.
+        """
+        with self._compact_lock:
+            with self.lock:
+                if self._closed or (not self.dirty and self.snapshot_path.exists()):
+                    return
+                sequence = self.sequence
+                snapshot = json.dumps({**self._get_filesystem(), SNAPSHOT_SEQUENCE_KEY: sequence}, indent=4)
+                self.dirty = False
+                self.records_since_compaction = 0
+                self._writing = True
+            try:
+                self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+                _write_file_atomically(self.snapshot_path, snapshot, backup_path(self.snapshot_path))
+                with self.lock:
+                    previous_snapshot_sequence, self.snapshot_sequence = self.snapshot_sequence, sequence
+                    self._has_snapshot = True
+                    self._drop_records_through(previous_snapshot_sequence)
+                    self._count_generation()
+                    self._remember_signature()
+            finally:
+                with self.lock:
+                    self._writing = False
+
+    def _drop_records_through(self, sequence: int):
+        """
+        Rewrites the journal without the records up to and including a sequence number.
+        The journal only holds the records made since the previous compaction, so this is cheap.
+        """
+        self._close_journal_file()
+        remaining_records = [record for record in _read_records(self.journal_path) if record["seq"] > sequence]
+        if not remaining_records:
+            self.journal_path.unlink(missing_ok=True)
+            return
+        _write_file_atomically(self.journal_path, "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in remaining_records))
+
+    def _close_journal_file(self):
+        """
+        Closes the journal file if it is open. It is opened again by the next record.
+        """
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    def close(self):
+        """
+        Waits for a running compaction and stops recording changes. Used before the saved files are deleted.
+        """
+        self.wait()
+        with self.lock:
+            self._closed = True
+            self._close_journal_file()
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+class AsciiFrameCache:
+    """
+    A content-addressed, size-capped on-disk cache for converted ASCII art frames.
+    Entries are keyed by a hash of the image bytes together with the conversion settings, so an unchanged image is never converted twice.
+    Each entry's modification time doubles as its last-used time, which is what the least recently used eviction goes by.
+
+    Attributes:
+        cache_directory (Path): The directory the cached frames are stored in.
+        max_size_bytes (int): The total size the cache is trimmed back to when it grows past it.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that were not in the cache.
+    """
+
+    def __init__(self, cache_directory: str | Path = ".ascii_frame_cache", max_size_bytes: int = 512 * 1024 * 1024) -> None:
+        """
+        Initializes the cache, creating its directory if needed.
+
+        Parameters:
+            cache_directory (str | Path): The directory to store cached frames in.
+            max_size_bytes (int): The maximum total size of the cached frames, in bytes.
+        """
+
+        self.cache_directory = Path(cache_directory)
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size_bytes = sum(entry.stat().st_size for entry in self._entries())
+
+    @staticmethod
+    def make_key(image_bytes: bytes, columns: int, converter_settings: str) -> str:
+        """
+        Builds the cache key for an image converted with the given settings.
+
+        Parameters:
+            image_bytes (bytes): The raw contents of the image file.
+            columns (int): The width of the ASCII art, in characters.
+            converter_settings (str): A description of the converter and its options. Changing it invalidates every entry made with the old value.
+
+        Returns:
+            str: A hexadecimal cache key.
+        """
+
+        digest = hashlib.sha256(image_bytes)
+        digest.update(f"\0{columns}\0{converter_settings}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """
+        Looks up a converted frame and marks it as recently used.
+
+        Parameters:
+            key (str): The cache key from make_key.
+
+        Returns:
+            str | None: The cached ASCII art, or None if it is not cached.
+        """
+
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as file:
+                ascii_art = file.read()
+            os.utime(entry_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return ascii_art
+
+    def put(self, key: str, ascii_art: str) -> None:
+        """
+        Stores a converted frame, evicting the least recently used frames if the cache grows past its size cap.
+
+        Parameters:
+            key (str): The cache key from make_key.
+            ascii_art (str): The converted ASCII art.
+        """
+
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(exist_ok=True)
+        data = ascii_art.encode("utf-8")
+        previous_size = entry_path.stat().st_size if entry_path.exists() else 0
+        # Write to a temporary file first so an interrupted run never leaves a truncated entry behind
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=entry_path.parent)
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, entry_path)
+        self._size_bytes += len(data) - previous_size
+        if self._size_bytes > self.max_size_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Deletes the least recently used frames until the cache is back under its size cap.
+        """
+
+        entries = sorted(((entry.stat(), entry) for entry in self._entries()), key=lambda item: item[0].st_mtime_ns)
+        self._size_bytes = sum(stat.st_size for stat, _ in entries)
+        for stat, entry in entries:
+            if self._size_bytes <= self.max_size_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            self._size_bytes -= stat.st_size
+
+    def _entry_path(self, key: str) -> Path:
+        """
+        Returns the file a cache key is stored in. Entries are fanned out over subdirectories named after the first two characters of the key.
+
+        Parameters:
+            key (str): The cache key.
+
+        Returns:
+            Path: The path of the entry file.
+        """
+
+        return self.cache_directory / key[:2] / f"{key}.txt"
+
+    def _entries(self):
+        """
+        Returns an iterator over every entry file in the cache.
+        """
+
+        return self.cache_directory.glob("*/*.txt")
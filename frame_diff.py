@@ -0,0 +1,270 @@
+import re
+from collections.abc import Sequence
+
+# Splits a line of a frame into escape sequences and the visible characters between them
+_FRAME_TOKEN_PATTERN = re.compile(r"(\033\[[0-9;?]*[A-Za-z])|(.)")
+
+# Unchanged cells between two changed runs that are cheaper to rewrite than to skip with a cursor move
+_MAX_RUN_GAP = 4
+
+def parse_frame_cells(frame: str) -> list[list[tuple[str, str]]]:
+    """
+    Parses an ASCII art frame into a grid of screen cells.
+    Each cell is a (style, character) pair, where style is the escape sequence run in effect when the character was drawn.
+
+    Parameters:
+        frame (str): The ASCII art frame.
+
+    Returns:
+        list[list[tuple[str, str]]]: One list of cells per line of the frame.
+    """
+
+    rows = []
+    style = ""
+    for line in frame.split("\n"):
+        cells = []
+        pending_style = ""
+        for escape_sequence, char in _FRAME_TOKEN_PATTERN.findall(line):
+            if escape_sequence:
+                pending_style += escape_sequence
+                continue
+            if pending_style:
+                style = pending_style
+                pending_style = ""
+            cells.append((style, char))
+        if pending_style:
+            style = pending_style
+        rows.append(cells)
+    return rows
+
+def serialize_frame_cells(cells: list[list[tuple[str, str]]]) -> str:
+    """
+    Turns a grid of screen cells back into an ASCII art frame, writing each style only where it changes.
+
+    Parameters:
+        cells (list[list[tuple[str, str]]]): One list of cells per line, as returned by parse_frame_cells.
+
+    Returns:
+        str: The ASCII art frame, ending with a foreground color reset like the frames the converter produces.
+    """
+
+    output = []
+    active_style = None
+    for row_index, row_cells in enumerate(cells):
+        if row_index:
+            output.append("\n")
+        for style, char in row_cells:
+            if style != active_style:
+                output.append(style)
+                active_style = style
+            output.append(char)
+    output.append("\033[39m")
+    return "".join(output)
+
+def fit_frame_size(frame_size: tuple[int, int], max_size: tuple[int, int]) -> tuple[int, int]:
+    """
+    Scales a frame size down, keeping its aspect ratio, until it fits within a maximum size. Frames that already fit keep their size.
+
+    Parameters:
+        frame_size (tuple[int, int]): The columns and rows of the frame.
+        max_size (tuple[int, int]): The columns and rows available.
+
+    Returns:
+        tuple[int, int]: The columns and rows to draw the frame at.
+    """
+
+    columns, rows = frame_size
+    max_columns, max_rows = max_size
+    if columns <= max_columns and rows <= max_rows:
+        return columns, rows
+    scale = min(max_columns / columns, max_rows / rows)
+    return max(1, int(columns * scale)), max(1, int(rows * scale))
+
+def downsample_frame(frame: str, columns: int, rows: int) -> str:
+    """
+    Shrinks an ASCII art frame to the given size by sampling the nearest source cell for every target cell.
+    Frames with fewer cells send fewer bytes to the terminal.
+
+    Parameters:
+        frame (str): The ASCII art frame.
+        columns (int): The width of the downsampled frame, in characters.
+        rows (int): The height of the downsampled frame, in lines.
+
+    Returns:
+        str: The downsampled ASCII art frame.
+    """
+
+    cells = parse_frame_cells(frame)
+    source_columns = max(len(row_cells) for row_cells in cells)
+    source_rows = len(cells)
+    sampled_cells = []
+    for row in range(rows):
+        source_row = cells[int((row + 0.5) * source_rows / rows)]
+        sampled_row = []
+        for column in range(columns):
+            source_column = int((column + 0.5) * source_columns / columns)
+            if source_column >= len(source_row):
+                break
+            sampled_row.append(source_row[source_column])
+        sampled_cells.append(sampled_row)
+    return serialize_frame_cells(sampled_cells)
+
+def frame_home_sequence(rows: int) -> str:
+    """
+    Returns the escape sequence that moves the cursor from anywhere on a frame's last line back to the frame's top left corner.
+
+    Parameters:
+        rows (int): The number of lines in the frame.
+
+    Returns:
+        str: The cursor movement escape sequence.
+    """
+
+    return "\r" + (f"\033[{rows - 1}A" if rows > 1 else "")
+
+def diff_frame_cells(previous_cells: list[list[tuple[str, str]]], cells: list[list[tuple[str, str]]]) -> str:
+    """
+    Builds the output that turns a drawn frame into the next one by rewriting only the cells that changed.
+    The output expects the cursor at the frame's top left corner and leaves it there. It does not depend on the style that was active
+    before it, so the same output can be precomputed and replayed later.
+
+    Parameters:
+        previous_cells (list[list[tuple[str, str]]]): The cells currently on screen, as returned by parse_frame_cells.
+        cells (list[list[tuple[str, str]]]): The cells of the frame to draw. Must have the same number of rows as previous_cells.
+
+    Returns:
+        str: The escape sequences and characters to write.
+    """
+
+    output = []
+    cursor_row = 0
+    active_style = None
+    for row, (previous_row, row_cells) in enumerate(zip(previous_cells, cells)):
+        if previous_row == row_cells:
+            continue
+        changed_columns = [column for column, cell in enumerate(row_cells) if column >= len(previous_row) or previous_row[column] != cell]
+
+        # Group the changed columns into runs, absorbing short gaps of unchanged cells
+        runs = []
+        for column in changed_columns:
+            if runs and column - runs[-1][1] <= _MAX_RUN_GAP:
+                runs[-1][1] = column
+            else:
+                runs.append([column, column])
+
+        if row > cursor_row:
+            output.append(f"\033[{row - cursor_row}B")
+            cursor_row = row
+        for start_column, end_column in runs:
+            output.append(f"\033[{start_column + 1}G")
+            for style, char in row_cells[start_column:end_column + 1]:
+                if style != active_style:
+                    output.append(style)
+                    active_style = style
+                output.append(char)
+        if len(row_cells) < len(previous_row):
+            # The new line is shorter, erase what is left of the old one
+            output.append(f"\033[{len(row_cells) + 1}G\033[K")
+    if output:
+        output.append(frame_home_sequence(cursor_row + 1))
+    return "".join(output)
+
+def build_delta_stream(frames: Sequence[str]) -> list[str]:
+    """
+    Precomputes the diff output for every step of a looping animation.
+    Entry i draws frame i over frame i - 1; entry 0 draws the first frame over the last one so the stream loops.
+
+    Parameters:
+        frames (Sequence[str]): The ASCII art frames, in playback order. All frames must have the same number of lines.
+
+    Returns:
+        list[str]: The delta for each frame.
+    """
+
+    frame_cells = [parse_frame_cells(frame) for frame in frames]
+    return [diff_frame_cells(frame_cells[i - 1], frame_cells[i]) for i in range(len(frame_cells))]
+
+class FrameDiffRenderer:
+    """
+    Keeps a model of the screen cells an animation has drawn and turns each new frame into only the output needed to update the cells that changed.
+    After every render the cursor is left at the frame's top left corner, so frames can be drawn in any order.
+    Output is returned as UTF-8 bytes, ready to be written to the terminal in a single call.
+
+    Attributes:
+        delta_stream (Sequence[bytes] | None): Optional precomputed deltas from build_delta_stream, encoded once, used when frames are drawn in order.
+        transition_cache (dict[tuple[int, int], bytes] | None): Optional store of the output for every (previous frame index, frame index) step drawn,
+            shared between renderers that draw the same frames so repeated steps are only diffed once.
+    """
+
+    def __init__(self, delta_stream: Sequence[str] | Sequence[bytes] | None = None, transition_cache: dict[tuple[int, int], bytes] | None = None) -> None:
+        """
+        Initializes a renderer with nothing drawn yet.
+
+        Parameters:
+            delta_stream (Sequence[str] | Sequence[bytes] | None): Optional precomputed deltas for the animation being drawn.
+                A stream held in memory as strings is encoded up front; a stream that yields bytes, such as a FrameStore opened without an encoding, is used as is.
+            transition_cache (dict[tuple[int, int], bytes] | None): Optional cache of step output to read from and add to.
+        """
+
+        if isinstance(delta_stream, list) and delta_stream and isinstance(delta_stream[0], str):
+            delta_stream = [delta.encode("utf-8") for delta in delta_stream]
+        self.delta_stream = delta_stream
+        self.transition_cache = transition_cache
+        self._frame: str | None = None
+        self._frame_index: int | None = None
+        self._cells: list[list[tuple[str, str]]] | None = None
+
+    def render(self, frame: str, frame_index: int | None = None) -> bytes:
+        """
+        Returns the output that draws a frame over whatever this renderer drew last.
+        The first frame, and any frame with a different number of lines, is drawn in full.
+
+        Parameters:
+            frame (str): The ASCII art frame to draw.
+            frame_index (int | None): The frame's index in the animation. Needed to use the precomputed delta stream.
+
+        Returns:
+            bytes: The encoded escape sequences and characters to write.
+        """
+
+        previous_frame, previous_frame_index, previous_cells = self._frame, self._frame_index, self._cells
+        self._frame, self._frame_index, self._cells = frame, frame_index, None
+        if previous_frame is None:
+            return (frame + frame_home_sequence(frame.count("\n") + 1)).encode("utf-8")
+        if frame is previous_frame:
+            self._cells = previous_cells
+            return b""
+        if self.delta_stream is not None and frame_index is not None and previous_frame_index is not None and frame_index == (previous_frame_index + 1) % len(self.delta_stream):
+            delta = self.delta_stream[frame_index]
+            return delta.encode("utf-8") if isinstance(delta, str) else delta
+        transition_key = None
+        if self.transition_cache is not None and frame_index is not None and previous_frame_index is not None:
+            transition_key = (previous_frame_index, frame_index)
+            output = self.transition_cache.get(transition_key)
+            if output is not None:
+                return output
+        previous_cells = previous_cells or parse_frame_cells(previous_frame)
+        self._cells = parse_frame_cells(frame)
+        if len(previous_cells) != len(self._cells):
+            output = ("\033[J" + frame + frame_home_sequence(len(self._cells))).encode("utf-8")
+        else:
+            output = diff_frame_cells(previous_cells, self._cells).encode("utf-8")
+        if transition_key is not None:
+            self.transition_cache[transition_key] = output
+        return output
+
+    def finish(self, frame: str) -> bytes:
+        """
+        Returns the output that draws a final frame and moves the cursor to the line below it, ready for normal output.
+
+        Parameters:
+            frame (str): The ASCII art frame to leave on screen.
+
+        Returns:
+            bytes: The encoded escape sequences and characters to write.
+        """
+
+        rows = frame.count("\n") + 1
+        output = self.render(frame) + b"\033[0m" + (f"\033[{rows - 1}B" if rows > 1 else "").encode("utf-8") + b"\n"
+        self._frame = self._frame_index = self._cells = None
+        return output
@@ -0,0 +1,339 @@
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from frame_diff import build_delta_stream, downsample_frame, fit_frame_size
+
+# File extension used for frame store files
+FRAME_STORE_EXTENSION = ".frames"
+
+# Frame store layout (all integers little endian):
+#   header: magic, format version, flags, frames per second, columns, rows, frame count
+#   index:  one (payload offset, compressed length, decompressed length) entry per frame
+#   body:   the zlib compressed UTF-8 payload of every frame, in frame order
+FRAME_STORE_MAGIC = b"HTPF"
+FRAME_STORE_VERSION = 1
+
+# Header flag marking a store whose entries are precomputed frame deltas rather than whole frames
+FRAME_STORE_FLAG_DELTA_STREAM = 0x1
+
+# Suffix inserted before the extension of a delta stream stored alongside an animation
+DELTA_STREAM_SUFFIX = ".delta"
+_HEADER = struct.Struct("<4sHHfHHI")
+_INDEX_ENTRY = struct.Struct("<QII")
+
+_ESCAPE_SEQUENCE_PATTERN = re.compile(r"\033\[[0-9;?]*[A-Za-z]")
+
+class FrameStoreError(Exception):
+    """
+    Raised when a file is not a frame store or uses a format version this module cannot read.
+    """
+
+def measure_frame(frame: str) -> tuple[int, int]:
+    """
+    Measures the size of an ASCII art frame as it appears on screen, ignoring escape sequences.
+
+    Parameters:
+        frame (str): The ASCII art frame.
+
+    Returns:
+        tuple[int, int]: The number of columns and rows the frame covers.
+    """
+
+    lines = frame.split("\n")
+    columns = max(len(_ESCAPE_SEQUENCE_PATTERN.sub("", line)) for line in lines)
+    return columns, len(lines)
+
+def write_frame_store(file_path: str | Path, frames: Sequence[str], frames_per_second: float = 0.0, flags: int = 0, frame_size: tuple[int, int] | None = None) -> None:
+    """
+    Writes ASCII art frames to a frame store file.
+
+    Parameters:
+        file_path (str | Path): The path of the frame store file to write.
+        frames (Sequence[str]): The ASCII art frames, in playback order.
+        frames_per_second (float): The playback rate to record in the header. 0 means unspecified.
+        flags (int): Header flags, such as FRAME_STORE_FLAG_DELTA_STREAM.
+        frame_size (tuple[int, int] | None): The columns and rows to record in the header. Measured from the first frame if not given.
+    """
+
+    columns, rows = frame_size or (measure_frame(frames[0]) if frames else (0, 0))
+    payloads = [frame.encode("utf-8") for frame in frames]
+    compressed_payloads = [zlib.compress(payload, 9) for payload in payloads]
+
+    offset = _HEADER.size + _INDEX_ENTRY.size * len(frames)
+    index = bytearray()
+    for payload, compressed_payload in zip(payloads, compressed_payloads):
+        index += _INDEX_ENTRY.pack(offset, len(compressed_payload), len(payload))
+        offset += len(compressed_payload)
+
+    temporary_path = f"{file_path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(FRAME_STORE_MAGIC, FRAME_STORE_VERSION, flags, frames_per_second, columns, rows, len(frames)))
+        file.write(index)
+        for compressed_payload in compressed_payloads:
+            file.write(compressed_payload)
+    os.replace(temporary_path, file_path)
+
+class FrameStore(Sequence):
+    """
+    Read access to a frame store file through the same interface as a list of frame strings.
+    The file is memory-mapped, so opening a store only reads its header no matter how many frames it holds.
+    Frames are decompressed when they are accessed, and a background thread decodes the next few frames in the direction of playback
+    so they are ready before they are needed. At most a bounded window of decoded frames is kept in memory.
+
+    Attributes:
+        file_path (Path): The path of the frame store file.
+        frames_per_second (float): The playback rate recorded in the file, or 0 if unspecified.
+        columns (int): The width of the frames, in characters.
+        rows (int): The height of the frames, in lines.
+        flags (int): The header flags, such as FRAME_STORE_FLAG_DELTA_STREAM.
+        read_ahead (int): The number of frames decoded ahead of the most recently accessed one.
+        encoding (str | None): The text encoding frames are decoded with, or None to return the raw UTF-8 bytes.
+    """
+
+    def __init__(self, file_path: str | Path, read_ahead: int = 8, encoding: str | None = "utf-8") -> None:
+        """
+        Opens and memory-maps a frame store file.
+
+        Parameters:
+            file_path (str | Path): The path of the frame store file.
+            read_ahead (int): The number of frames to decode ahead of playback. 0 disables read-ahead.
+            encoding (str | None): The text encoding to decode frames with. None returns frames as bytes, ready to be written to the terminal.
+
+        Raises:
+            FrameStoreError: If the file is not a frame store or has an unsupported version.
+        """
+
+        self.file_path = Path(file_path)
+        self.read_ahead = read_ahead
+        self.encoding = encoding
+        with open(self.file_path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                raise FrameStoreError(f"'{self.file_path}' is too short to be a frame store.")
+            # The mapping stays valid after the file object is closed
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.flags, self.frames_per_second, self.columns, self.rows, self._frame_count = _HEADER.unpack_from(self._data)
+        if magic != FRAME_STORE_MAGIC:
+            raise FrameStoreError(f"'{self.file_path}' is not a frame store.")
+        if version != FRAME_STORE_VERSION:
+            raise FrameStoreError(f"'{self.file_path}' uses frame store version {version}, expected {FRAME_STORE_VERSION}.")
+        self._decoded_frames: OrderedDict[int, Future] = OrderedDict()
+        self._decoded_frames_lock = threading.Lock()
+        self._read_ahead_executor: ThreadPoolExecutor | None = None
+        self._last_index = -1
+        self._step = 1
+
+    def __len__(self) -> int:
+        return self._frame_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += self._frame_count
+        if not 0 <= index < self._frame_count:
+            raise IndexError("frame index out of range")
+        if not self.read_ahead:
+            return self._decode_frame(index)
+        with self._decoded_frames_lock:
+            future = self._decoded_frames.pop(index, None)
+        frame = future.result() if future else self._decode_frame(index)
+        self._schedule_read_ahead(index)
+        return frame
+
+    def __repr__(self) -> str:
+        return f"FrameStore('{self.file_path}', frames={len(self)}, columns={self.columns}, rows={self.rows})"
+
+    def close(self) -> None:
+        """
+        Stops the read-ahead thread and unmaps the file. The store cannot be read afterwards.
+        """
+
+        if self._read_ahead_executor:
+            self._read_ahead_executor.shutdown(wait=True, cancel_futures=True)
+            self._read_ahead_executor = None
+        with self._decoded_frames_lock:
+            self._decoded_frames.clear()
+        self._data.close()
+
+    def __enter__(self) -> "FrameStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _decode_frame(self, index: int) -> str | bytes:
+        """
+        Decompresses a single frame straight from the memory-mapped file.
+
+        Parameters:
+            index (int): The non-negative index of the frame.
+
+        Returns:
+            str | bytes: The decoded frame, as bytes if the store has no encoding.
+        """
+
+        offset, compressed_length, _length = _INDEX_ENTRY.unpack_from(self._data, _HEADER.size + index * _INDEX_ENTRY.size)
+        payload = zlib.decompress(self._data[offset:offset + compressed_length])
+        return payload.decode(self.encoding) if self.encoding else payload
+
+    def _schedule_read_ahead(self, index: int) -> None:
+        """
+        Queues the frames following the one just accessed for decoding in the background.
+        Playback direction is taken from the previous access, so reversed playback reads ahead backwards.
+
+        Parameters:
+            index (int): The index of the frame that was just accessed.
+        """
+
+        if index == (self._last_index - 1) % self._frame_count:
+            self._step = -1
+        elif index == (self._last_index + 1) % self._frame_count:
+            self._step = 1
+        self._last_index = index
+        step = self._step
+        if self._read_ahead_executor is None:
+            self._read_ahead_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-store-read-ahead")
+        with self._decoded_frames_lock:
+            for distance in range(1, self.read_ahead + 1):
+                next_index = (index + step * distance) % self._frame_count
+                if next_index not in self._decoded_frames:
+                    self._decoded_frames[next_index] = self._read_ahead_executor.submit(self._decode_frame, next_index)
+            # Drop the oldest decoded frames so memory stays bounded by the read-ahead window
+            while len(self._decoded_frames) > self.read_ahead * 2:
+                _stale_index, stale_future = self._decoded_frames.popitem(last=False)
+                stale_future.cancel()
+
+def delta_stream_path(frame_store_path: str | Path) -> Path:
+    """
+    Returns the path of the delta stream stored alongside a frame store, e.g. 'clip.delta.frames' for 'clip.frames'.
+
+    Parameters:
+        frame_store_path (str | Path): The path of the animation's frame store.
+
+    Returns:
+        Path: The path of the delta stream.
+    """
+
+    frame_store_path = Path(frame_store_path)
+    return frame_store_path.with_name(frame_store_path.stem + DELTA_STREAM_SUFFIX + FRAME_STORE_EXTENSION)
+
+def resolution_tier_path(frame_store_path: str | Path, columns: int) -> Path:
+    """
+    Returns the path of a smaller resolution tier of an animation, e.g. 'clip.80.frames' for the 80 column tier of 'clip.frames'.
+
+    Parameters:
+        frame_store_path (str | Path): The path of the animation's full resolution frame store.
+        columns (int): The width of the tier, in characters.
+
+    Returns:
+        Path: The path of the tier's frame store.
+    """
+
+    frame_store_path = Path(frame_store_path)
+    return frame_store_path.with_name(f"{frame_store_path.stem}.{columns}{FRAME_STORE_EXTENSION}")
+
+def find_resolution_tiers(frame_store_path: str | Path) -> dict[int, Path]:
+    """
+    Finds the resolution tiers built for an animation.
+
+    Parameters:
+        frame_store_path (str | Path): The path of the animation's full resolution frame store.
+
+    Returns:
+        dict[int, Path]: The path of each tier's frame store, keyed by its width in characters.
+    """
+
+    frame_store_path = Path(frame_store_path)
+    tier_pattern = re.compile(rf"{re.escape(frame_store_path.stem)}\.(\d+){re.escape(FRAME_STORE_EXTENSION)}")
+    tiers = {}
+    for candidate_path in frame_store_path.parent.glob(f"{frame_store_path.stem}.*{FRAME_STORE_EXTENSION}"):
+        match = tier_pattern.fullmatch(candidate_path.name)
+        if match:
+            tiers[int(match.group(1))] = candidate_path
+    return tiers
+
+def convert_json_to_frame_store(json_file_path: str | Path, frames_per_second: float = 0.0, write_delta_stream: bool = False, tier_columns: Sequence[int] = ()) -> Path:
+    """
+    Converts an ASCII art animation JSON file into a frame store file next to it.
+
+    Parameters:
+        json_file_path (str | Path): The path of the JSON file, a list of frame strings.
+        frames_per_second (float): The playback rate to record in the header.
+        write_delta_stream (bool): Whether to also write a precomputed delta stream alongside each frame store.
+        tier_columns (Sequence[int]): The widths of the smaller resolution tiers to build, in characters. Widths that are not smaller than the animation are skipped.
+
+    Returns:
+        Path: The path of the full resolution frame store file that was written.
+    """
+
+    json_file_path = Path(json_file_path)
+    with open(json_file_path, "r") as f:
+        frames = json.load(f)
+    frame_store_path = json_file_path.with_suffix(FRAME_STORE_EXTENSION)
+    frame_stores = [(frame_store_path, frames)]
+    if frames:
+        columns, rows = measure_frame(frames[0])
+        for tier_column_count in tier_columns:
+            if tier_column_count >= columns:
+                continue
+            tier_size = fit_frame_size((columns, rows), (tier_column_count, rows))
+            frame_stores.append((resolution_tier_path(frame_store_path, tier_column_count), [downsample_frame(frame, *tier_size) for frame in frames]))
+    for path, tier_frames in frame_stores:
+        write_frame_store(path, tier_frames, frames_per_second)
+        if write_delta_stream and tier_frames:
+            write_frame_store(delta_stream_path(path), build_delta_stream(tier_frames), frames_per_second, FRAME_STORE_FLAG_DELTA_STREAM, measure_frame(tier_frames[0]))
+    return frame_store_path
+
+if __name__ == "__main__":
+    def main():
+        """
+        Converts ASCII art animation JSON files into frame store files.
+
+        Usage:
+            python frame_store.py <json file> [<json file> ...] <optional: --fps frames per second> <optional: --delta> <optional: --tiers columns,columns,...>
+        """
+
+        args = sys.argv[1:]
+        frames_per_second = 0.0
+        if "--fps" in args:
+            fps_index = args.index("--fps")
+            try:
+                frames_per_second = float(args[fps_index + 1])
+            except (IndexError, ValueError):
+                print("Invalid frames per second. Exiting...")
+                sys.exit(1)
+            del args[fps_index:fps_index + 2]
+        tier_columns = []
+        if "--tiers" in args:
+            tiers_index = args.index("--tiers")
+            try:
+                tier_columns = [int(columns) for columns in args[tiers_index + 1].split(",")]
+            except (IndexError, ValueError):
+                print("Invalid resolution tiers. Exiting...")
+                sys.exit(1)
+            del args[tiers_index:tiers_index + 2]
+        write_delta_stream = "--delta" in args
+        args = [arg for arg in args if arg != "--delta"]
+        if not args:
+            print("Usage: python frame_store.py <json file> [<json file> ...] <optional: --fps frames per second> <optional: --delta> <optional: --tiers columns,columns,...>")
+            sys.exit(1)
+        for json_file_path in args:
+            frame_store_path = convert_json_to_frame_store(json_file_path, frames_per_second, write_delta_stream, tier_columns)
+            json_size = os.path.getsize(json_file_path)
+            frame_store_size = os.path.getsize(frame_store_path)
+            print(f"{json_file_path} -> {frame_store_path} ({json_size:,} -> {frame_store_size:,} bytes)")
+            if write_delta_stream:
+                print(f"{json_file_path} -> {delta_stream_path(frame_store_path)} ({os.path.getsize(delta_stream_path(frame_store_path)):,} bytes)")
+            for tier_column_count, tier_path in sorted(find_resolution_tiers(frame_store_path).items(), reverse=True):
+                print(f"{json_file_path} -> {tier_path} ({tier_column_count} columns, {os.path.getsize(tier_path):,} bytes)")
+
+    main()
@@ -1,36 +1,46 @@
 from utility import Utility
-from ascii_animation import load_ascii_art_animation_from_json, play_ascii_animation, clean_up_ascii_art_animation
+from ascii_animation import load_ascii_art_animation, load_ascii_art_animation_for_terminal, play_ascii_animation, FrameScheduler, clean_up_ascii_art_animation
 from animation import Animation
+from filesystem_database import read_saved_filesystem, saved_filesystem_exists
 from sound import Sound
 from time import sleep
 from terminal import Terminal
-import re, sys, os
+import re, sys
+import asyncio
 from mission import Mission
 import json
 from text_color import TextColor
 
 animated_text = Animation.animated_text
 
-def animate_text_with_sound(text_to_animate: str, static_text: str = "", end_text: str = "\n", sound_file: str = Sound.DIGITAL_TYPING, pause=0.083, delay_between_chars: float = 0.03, stop_event = None, continue_thread_after_stop_for = 0.000, loop_offset = 0, thread_stop_freeze = 0.5):
+def animate_text_with_sound(text_to_animate: str, static_text: str = "", end_text: str = "\n", sound_file: str = Sound.DIGITAL_TYPING, delay_between_chars: float = 0.03, thread_stop_freeze = 0.5):
     """
-    Animates text with accompanying sound.
+    Animates text with accompanying sound. The sound loops for exactly as long as the text takes to type out.
 
     Parameters:
         text_to_animate (str): The text to be animated.
         static_text (str): Static text displayed before the animated text.
         end_text (str): Text displayed at the end of the animation.
-        sound_file (str): The sound file to play during the animation.
-        pause (float): The pause duration between sound loops.
+        sound_file (str): The sound file to loop during the animation.
         delay_between_chars (float): Delay between each character animation.
-        stop_event (threading.Event): Event to stop the animation thread.
-        continue_thread_after_stop_for (float): Time to continue the thread after a stop event is set.
-        loop_offset (int): Offset to adjust sound looping to match text length.
-        thread_stop_freeze (float): Time to freeze the thread after stopping the animation.
+        thread_stop_freeze (float): Time to freeze after the animation is complete.
     """
+    Animation.type_text_with_sound(text_to_animate, end_text=end_text, static_text=static_text, delay_between_chars=delay_between_chars, sound_file=sound_file, pause_after=thread_stop_freeze)
 
-    animated_text_thread = animated_text(static_text=static_text, animated_text=text_to_animate, end_text=end_text, delay_between_chars=delay_between_chars, stop_event = stop_event, continue_thread_after_stop_for=continue_thread_after_stop_for)
-    Sound.play(sound_file, loop=int((len(text_to_animate)*(delay_between_chars * 10)) + loop_offset), pause=pause)
-    animated_text_thread.stop(thread_stop_freeze)
+async def boot_up_system():
+    """
+    Plays the system boot sequence: each loading step animates for a few seconds, then completes with a notification sound.
+    """
+    complete_notifications = []
+    for loading_text, pause_after_complete in (("Loading Kernel", 1), ("Loading system configuration settings", 1), ("Booting up system", 1.5)):
+        loading_complete = asyncio.Event()
+        loading_text_animation = asyncio.create_task(Animation.animated_text_async(static_text=loading_text, animated_text="...", end_text=f"{TextColor.GREEN.value}Complete!{TextColor.RESET.value}\n", delay_between_chars=0.15, stop_event=loading_complete))
+        await asyncio.sleep(3)
+        complete_notifications.append(asyncio.create_task(Sound.play_async(Sound.COMPLETE_NOTIFICATION)))
+        loading_complete.set()
+        await loading_text_animation
+        await asyncio.sleep(pause_after_complete)
+    await asyncio.gather(*complete_notifications)
 
 def update_messenger_and_display(messenger, msg_lst, animate: bool = False):
     """
@@ -62,23 +72,23 @@ def access_terminal(user_terminal: Terminal, incoming_message: bool, messages: l
     user_terminal.hacker_messages.append(messages)
     Utility.hide_cursor()
     if not user_terminal.active_user:
-        animate_text_with_sound("Welcome to your user terminal", loop_offset=2,thread_stop_freeze=0.1)
-        animate_text_with_sound("-----------------------------", loop_offset=2, thread_stop_freeze=0.1)
+        animate_text_with_sound("Welcome to your user terminal",thread_stop_freeze=0.1)
+        animate_text_with_sound("-----------------------------", thread_stop_freeze=0.1)
         user_terminal.prompt_for_login()
         Utility.clear_screen()
     else:
-        animate_text_with_sound("Welcome to your user terminal", loop_offset=2,thread_stop_freeze=0.1)
-        animate_text_with_sound("-----------------------------", loop_offset=2, thread_stop_freeze=0.1)
-        animate_text_with_sound(f"Logged in as {user_terminal.active_user.username}!", loop_offset=2, thread_stop_freeze=0.1)
+        animate_text_with_sound("Welcome to your user terminal",thread_stop_freeze=0.1)
+        animate_text_with_sound("-----------------------------", thread_stop_freeze=0.1)
+        animate_text_with_sound(f"Logged in as {user_terminal.active_user.username}!", thread_stop_freeze=0.1)
         sleep(1)
         Utility.clear_screen()
     while not user_terminal.exit_requested:
         Utility.show_cursor()
         if user_terminal.active_user:
-            user_terminal.load_filesystem()
+            user_terminal.refresh_filesystem()
             if incoming_message and messages:
                 Utility.hide_cursor()
-                animate_text_with_sound("New message incoming", end_text="", loop_offset=1,thread_stop_freeze=0.1)
+                animate_text_with_sound("New message incoming", end_text="",thread_stop_freeze=0.1)
                 animated_text_thread = animated_text(static_text="New message incoming", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=2)
                 animated_text_thread.stop(0.5)
                 Utility.clear_screen()
@@ -93,7 +103,7 @@ def access_terminal(user_terminal: Terminal, incoming_message: bool, messages: l
         if user_terminal.exit_requested:
             user_terminal.exit_requested = False
             break
-    animate_text_with_sound(f"Exited out of {user_terminal.terminal_name} terminal successfully!", loop_offset=4,thread_stop_freeze=0.1)
+    animate_text_with_sound(f"Exited out of {user_terminal.terminal_name} terminal successfully!",thread_stop_freeze=0.1)
     sleep(1)
 
 def prompt_to_reload_terminal():
@@ -103,7 +113,7 @@ def prompt_to_reload_terminal():
 
     while True:
         Utility.hide_cursor()
-        animate_text_with_sound("Would you like to reload your terminal attempt to complete the mission? (yes/no): ",end_text="", loop_offset=6,thread_stop_freeze=0.1)
+        animate_text_with_sound("Would you like to reload your terminal attempt to complete the mission? (yes/no): ",end_text="",thread_stop_freeze=0.1)
         Utility.show_cursor()
         user_input = input("")
         if re.match(r"yes|y", user_input):
@@ -111,7 +121,7 @@ def prompt_to_reload_terminal():
         elif re.match(r"no|n", user_input):
             sys.exit(0)
         else:
-            animate_text_with_sound("Invalid input. Please enter 'yes|y' or 'no|n'.", end_text="\n", loop_offset=1,thread_stop_freeze=0.1)
+            animate_text_with_sound("Invalid input. Please enter 'yes|y' or 'no|n'.", end_text="\n",thread_stop_freeze=0.1)
 
 def main():
     """
@@ -120,59 +130,56 @@ def main():
     Utility.set_terminal_window_size(150, 46)
     Utility.clear_screen()
     Utility.hide_cursor()
+    # Decode the sounds in the background while the intro animation plays
+    Sound.preload()
     # Test animation
-    hackers_animation = load_ascii_art_animation_from_json(Utility.resource_path("./animation_images_json/hackers_animation.json"))
+    hackers_animation, hackers_animation_deltas = load_ascii_art_animation_for_terminal(Utility.resource_path("./animation_images_json/hackers_animation.frames"))
     #hackers_animation = clean_up_ascii_art_animation(hackers_animation)
+    # Start the frame clock with the soundtrack so the animation stays in sync with it
+    hackers_animation_scheduler = FrameScheduler(frames_per_second=28)
     Sound.play(Sound.HACKERS_ANIMATION, loop=1, pause=0.0)
-    hackers_animation_thread = play_ascii_animation(hackers_animation, frames_per_second=28, loop_num_times=0, continue_thread_after_stop_for=0.01)
+    hackers_animation_scheduler.start()
+    hackers_animation_thread = play_ascii_animation(hackers_animation, frames_per_second=28, loop_num_times=0, continue_thread_after_stop_for=0.01, delta_stream=hackers_animation_deltas, scheduler=hackers_animation_scheduler)
     hackers_animation_thread.stop()
     Utility.clear_screen()
 
 
     # Add opening animated logo and display on screen
     Utility.hide_cursor()
-    hack_the_planet_animation = load_ascii_art_animation_from_json(Utility.resource_path("./animation_images_json/hack_the_planet_animation.json"))
+    hack_the_planet_animation = load_ascii_art_animation(Utility.resource_path("./animation_images_json/hack_the_planet_animation.frames"))
     hack_the_planet_animation = clean_up_ascii_art_animation(hack_the_planet_animation)
     hack_the_planet_animation_thread = play_ascii_animation(hack_the_planet_animation, frames_per_second=24, loop_num_times=0, continue_thread_after_stop_for=4.00)
-    Sound.play(Sound.DIGITAL_TYPING, loop=15, pause=0.083)
+    Sound.play_looping(Sound.DIGITAL_TYPING, duration=1.25)
+    sleep(1.25)
     hack_the_planet_animation_thread.stop()
     Utility.clear_screen()
 
     # Opening text animation with sound
     filesystems_directory = Utility.get_app_support_directory() / "filesystems"
     filesystems_directory.mkdir(parents=True, exist_ok=True)
-    if not os.path.exists(filesystems_directory / "localhost_filesystem.json"):
-        animate_text_with_sound("Welcome to Hack The Planet!", loop_offset=2)
-        animate_text_with_sound("In just a moment you will be asked to create a login for your terminal.", loop_offset=5)
-        animate_text_with_sound("Once logged into your terminal, you can type 'help' to get a list of commands available to you.", loop_offset=8)
-        animate_text_with_sound("Good luck on your hacking adventure!", loop_offset=2)
+    if not saved_filesystem_exists(filesystems_directory / "localhost_filesystem.json"):
+        animate_text_with_sound("Welcome to Hack The Planet!")
+        animate_text_with_sound("In just a moment you will be asked to create a login for your terminal.")
+        animate_text_with_sound("Once logged into your terminal, you can type 'help' to get a list of commands available to you.")
+        animate_text_with_sound("Good luck on your hacking adventure!")
         sleep(2)
         Utility.clear_screen()
     else:
-        with open(filesystems_directory / "localhost_filesystem.json", "r") as file:
-            local_loaded_filesystem = json.load(file)
+        local_loaded_filesystem = read_saved_filesystem(filesystems_directory / "localhost_filesystem.json")
         username = list(local_loaded_filesystem["/"]["home"].keys())[0]
         password = local_loaded_filesystem["/"]["etc"][".passwd"]
-        animate_text_with_sound("Welcome back to Hack The Planet!", loop_offset=2)
-        animate_text_with_sound(f"Your user credentials are user: \'{username}\' and password: \'{password}\' in case you forgot.", loop_offset=7)
-        animate_text_with_sound("Once logged into your terminal, you can type 'help' to get a list of commands available to you.", loop_offset=8)
-        animate_text_with_sound("Good luck on your hacking adventure!", loop_offset=3)
+        animate_text_with_sound("Welcome back to Hack The Planet!")
+        animate_text_with_sound(f"Your user credentials are user: \'{username}\' and password: \'{password}\' in case you forgot.")
+        animate_text_with_sound("Once logged into your terminal, you can type 'help' to get a list of commands available to you.")
+        animate_text_with_sound("Good luck on your hacking adventure!")
         sleep(2)
         Utility.clear_screen()
 
     # Booting up system text animation
-    loading_kernel_text_animation = animated_text(static_text="Loading Kernel", animated_text="...", end_text=f"{TextColor.GREEN.value}Complete!{TextColor.RESET.value}\n", delay_between_chars=0.15, continue_thread_after_stop_for=3)
-    Sound.play(Sound.COMPLETE_NOTIFICATION, loop=1, pause=0.0)
-    loading_kernel_text_animation.stop(1)
-    configuring_system_settings_text_animation = animated_text(static_text="Loading system configuration settings", animated_text="...", end_text=f"{TextColor.GREEN.value}Complete!{TextColor.RESET.value}\n", delay_between_chars=0.15, continue_thread_after_stop_for=3)
-    Sound.play(Sound.COMPLETE_NOTIFICATION, loop=1, pause=0.0)
-    configuring_system_settings_text_animation.stop(1)
-    booting_up_system_text_animation = animated_text(static_text="Booting up system", animated_text="...", end_text=f"{TextColor.GREEN.value}Complete!{TextColor.RESET.value}\n", delay_between_chars=0.15, continue_thread_after_stop_for=3)
-    Sound.play(Sound.COMPLETE_NOTIFICATION, loop=1, pause=0.0)
-    booting_up_system_text_animation.stop(1.5)
+    asyncio.run(boot_up_system())
     Utility.clear_screen()
     sleep(0.5)
-    access_granted_animation = load_ascii_art_animation_from_json(Utility.resource_path("./animation_images_json/access_granted.json"))
+    access_granted_animation = load_ascii_art_animation(Utility.resource_path("./animation_images_json/access_granted.frames"))
     access_granted_animation = clean_up_ascii_art_animation(access_granted_animation)
     access_granted_animation_thread = play_ascii_animation(access_granted_animation, frames_per_second=24, loop_num_times=0, continue_thread_after_stop_for=0.5)
     Sound.play(Sound.MAC_OS_STARTUP_MODERN_SOUND)
@@ -252,13 +259,12 @@ def main():
             access_terminal(user_terminal, incoming_message=True, messages=mission_1.hacker_messages)
         else:
             access_terminal(user_terminal, incoming_message=False, messages=mission_1.hacker_messages)
-        if not mission_1.enemy_terminal.find(["connections.log", "/"]):
-            Utility.clear_multi_line("\n")
+        if not mission_1.enemy_terminal.exists("connections.log"):
             mission_1.is_a_success()
             Utility.hide_cursor()
             Utility.clear_screen()
             sleep(1)
-            animate_text_with_sound("New message incoming", end_text="", loop_offset=1,thread_stop_freeze=0.1)
+            animate_text_with_sound("New message incoming", end_text="",thread_stop_freeze=0.1)
             animated_text_thread = animated_text(static_text="New message incoming", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=2)
             animated_text_thread.stop(0.5)
             mission_1.enemy_terminal.messenger.enqueue_messages(mission_1.enemy_messages)
@@ -270,11 +276,10 @@ def main():
             Utility.clear_screen()
         else:
             Utility.hide_cursor()
-            Utility.clear_multi_line("\n")
             mission_1_failed_already = True
             Utility.clear_screen()
             sleep(0.5)
-            animate_text_with_sound("New message incoming", end_text="", loop_offset=1,thread_stop_freeze=0.1)
+            animate_text_with_sound("New message incoming", end_text="",thread_stop_freeze=0.1)
             animated_text_thread = animated_text(static_text="New message incoming", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=2)
             animated_text_thread.stop(0.5)
             mission_1.load_hacker_messages(mission_messages["1_FAIL"])
@@ -402,13 +407,12 @@ int main() {
             access_terminal(user_terminal, incoming_message=True, messages=mission_2.hacker_messages)
         else:
             access_terminal(user_terminal, incoming_message=False, messages=mission_2.hacker_messages)
-        if not mission_2.enemy_terminal.find(["microsoft_edge.c", "/"]) and not mission_2.enemy_terminal.find(["windows_os.c", "/"]) and mission_2.enemy_terminal.filesystem["/"]["etc"][".passwd"] == "hacked":
-            Utility.clear_multi_line("\n")
+        if not mission_2.enemy_terminal.exists("microsoft_edge.c") and not mission_2.enemy_terminal.exists("windows_os.c") and mission_2.enemy_terminal.filesystem["/"]["etc"][".passwd"] == "hacked":
             mission_2.is_a_success()
             Utility.hide_cursor()
             Utility.clear_screen()
             sleep(1)
-            animate_text_with_sound("New message incoming", end_text="", loop_offset=1,thread_stop_freeze=0.1)
+            animate_text_with_sound("New message incoming", end_text="",thread_stop_freeze=0.1)
             animated_text_thread = animated_text(static_text="New message incoming", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=2)
             animated_text_thread.stop(0.5)
             mission_2.enemy_terminal.messenger.enqueue_messages(mission_2.enemy_messages)
@@ -419,13 +423,12 @@ int main() {
             Utility.hide_cursor()
             sleep(2)
             Utility.clear_screen()
-        elif not mission_2.enemy_terminal.find(["microsoft_edge.c", "/"]) and not mission_2.enemy_terminal.find(["windows_os.c", "/"]):
+        elif not mission_2.enemy_terminal.exists("microsoft_edge.c") and not mission_2.enemy_terminal.exists("windows_os.c"):
             Utility.hide_cursor()
-            Utility.clear_multi_line("\n")
             mission_2_failed_already = True
             Utility.clear_screen()
             sleep(0.5)
-            animate_text_with_sound("New message incoming", end_text="", loop_offset=1,thread_stop_freeze=0.1)
+            animate_text_with_sound("New message incoming", end_text="",thread_stop_freeze=0.1)
             animated_text_thread = animated_text(static_text="New message incoming", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=2)
             animated_text_thread.stop(0.5)
             mission_2.load_hacker_messages(mission_messages["2_FAIL_CHANGE_PASSWORD"])
@@ -439,11 +442,10 @@ int main() {
             Utility.clear_screen()
         else:
             Utility.hide_cursor()
-            Utility.clear_multi_line("\n")
             mission_2_failed_already = True
             Utility.clear_screen()
             sleep(0.5)
-            animate_text_with_sound("New message incoming", end_text="", loop_offset=1,thread_stop_freeze=0.1)
+            animate_text_with_sound("New message incoming", end_text="",thread_stop_freeze=0.1)
             animated_text_thread = animated_text(static_text="New message incoming", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=2)
             animated_text_thread.stop(0.5)
             mission_2.load_hacker_messages(mission_messages["2_FAIL_DELETE_FILES"])
@@ -461,8 +463,8 @@ int main() {
     # Build Mission 3: Apple Terminal
     mission_3 = Mission("Mission 3: Apple Terminal", user_terminal, apple_terminal, mission_messages["3"], mission_messages["3_SUCCESS"])
     if mission_1.is_complete and mission_2.is_complete and not mission_3.is_complete:
-        computer_room = load_ascii_art_animation_from_json(Utility.resource_path("./animation_images_json/security.json"))
-        street = load_ascii_art_animation_from_json(Utility.resource_path("./animation_images_json/street.json"))
+        computer_room = list(load_ascii_art_animation(Utility.resource_path("./animation_images_json/security.frames")))
+        street = list(load_ascii_art_animation(Utility.resource_path("./animation_images_json/street.frames")))
         mission_3.enemy_terminal._add_file_to_filesystem(f"/home/{apple_terminal.valid_users[0].username}/Movies", "security_footage.mp4", street)
         mission_3.enemy_terminal._add_file_to_filesystem(f"/home/{apple_terminal.valid_users[0].username}/Movies", "security_footage2.mp4", computer_room)
         mission_3.user_terminal._add_file_to_filesystem(f"/home/{user_terminal.valid_users[0].username}/Downloads", "apple_credentials.info",
@@ -483,13 +485,12 @@ f"""    Apple Terminal Credentials
             access_terminal(user_terminal, incoming_message=True, messages=mission_3.hacker_messages)
         else:
             access_terminal(user_terminal, incoming_message=False, messages=mission_3.hacker_messages)
-        if not mission_3.enemy_terminal.find(["security_footage2.mp4", "/"]):
-            Utility.clear_multi_line("\n")
+        if not mission_3.enemy_terminal.exists("security_footage2.mp4"):
             mission_3.is_a_success()
             Utility.hide_cursor()
             Utility.clear_screen()
             sleep(1)
-            animate_text_with_sound("New message incoming", end_text="", loop_offset=1,thread_stop_freeze=0.1)
+            animate_text_with_sound("New message incoming", end_text="",thread_stop_freeze=0.1)
             animated_text_thread = animated_text(static_text="New message incoming", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=2)
             animated_text_thread.stop(0.5)
             mission_3.enemy_terminal.messenger.enqueue_messages(mission_3.enemy_messages)
@@ -502,11 +503,10 @@ f"""    Apple Terminal Credentials
             Utility.clear_screen()
         else:
             Utility.hide_cursor()
-            Utility.clear_multi_line("\n")
             mission_3_failed_already = True
             Utility.clear_screen()
             sleep(0.5)
-            animate_text_with_sound("New message incoming", end_text="", loop_offset=1,thread_stop_freeze=0.1)
+            animate_text_with_sound("New message incoming", end_text="",thread_stop_freeze=0.1)
             animated_text_thread = animated_text(static_text="New message incoming", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=2)
             animated_text_thread.stop(0.5)
             mission_3.load_hacker_messages(mission_messages["3_FAIL"])
@@ -521,7 +521,7 @@ f"""    Apple Terminal Credentials
 
     # END GAME
     Utility.hide_cursor()
-    animate_text_with_sound("New message incoming", end_text="", loop_offset=1,thread_stop_freeze=0.1)
+    animate_text_with_sound("New message incoming", end_text="",thread_stop_freeze=0.1)
     animated_text_thread = animated_text(static_text="New message incoming", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=2)
     animated_text_thread.stop(0.5)
     Utility.clear_screen()
@@ -531,13 +531,13 @@ f"""    Apple Terminal Credentials
     sleep(1)
     hacker_messenger.wait_for_window_to_close()
 
-    # animate_text_with_sound("All missions completed successfully!", loop_offset=2)
-    # animate_text_with_sound("You are now a certified hacker!", loop_offset=2)
-    # animate_text_with_sound("You have successfully hacked the planet!", loop_offset=2)
-    # animate_text_with_sound("Congratulations!", loop_offset=2)
+    # animate_text_with_sound("All missions completed successfully!")
+    # animate_text_with_sound("You are now a certified hacker!")
+    # animate_text_with_sound("You have successfully hacked the planet!")
+    # animate_text_with_sound("Congratulations!")
 
     Utility.hide_cursor()
-    animate_text_with_sound("Would you like to reset the game? (yes/no): ", end_text="", loop_offset=2)
+    animate_text_with_sound("Would you like to reset the game? (yes/no): ", end_text="")
     Utility.show_cursor()
     reset_game = input("")
     if re.match(r"yes|y", reset_game):
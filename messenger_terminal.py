@@ -175,9 +175,7 @@ class MessageTerminal(ABC):
         while time() - start_time < timeout:
             if not self.is_messages_terminal_open():
                 animated_text = f"You have disconnected from {self.window_name}'s messenger service..."
-                disconnected_from_messenger_service_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="\n", delay_between_chars=0.03)
-                Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+5), pause=0.083)
-                disconnected_from_messenger_service_text_thread.stop(0.5)
+                Animation.type_text_with_sound(animated_text, end_text="\n", pause_after=0.5)
                 sleep(1)
                 Utility.clear_screen()
                 Utility.show_cursor()
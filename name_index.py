@@ -0,0 +1,226 @@
+import re
+from fnmatch import fnmatchcase
+
+# Length of the longest n-grams indexed. Every name is indexed by all its substrings up to this length,
+# so a search term of any length can be narrowed down to the names containing its n-grams
+MAX_GRAM_LENGTH = 3
+
+# Characters that make a search term a glob pattern rather than a plain substring
+GLOB_CHARACTERS = "*?["
+
+# The parts of a glob pattern that match themselves, between wildcards and character sets
+_GLOB_WILDCARDS = re.compile(r"\*|\?|\[[^\]]*\]")
+
+def _grams(text: str, length: int) -> set[str]:
+    """
+    Returns the substrings of a text of the given length, or the text itself if it is shorter.
+    """
+    if len(text) <= length:
+        return {text}
+    return {text[index:index + length] for index in range(len(text) - length + 1)}
+
+def _all_grams(name: str) -> set[str]:
+    """
+    Returns every substring of a name up to MAX_GRAM_LENGTH characters long, the keys the name is indexed under.
+    """
+    return set().union(*(_grams(name, length) for length in range(1, MAX_GRAM_LENGTH + 1)))
+
+def _join_path(directory_path: str, name: str) -> str:
+    """
+    Returns the absolute path of a name in a directory.
+    """
+    return directory_path.rstrip("/") + "/" + name
+
+class NameIndex:
+    """
+    An index of every file and directory in a filesystem by name, so finding a name does not walk the filesystem.
+    Each name is indexed by its n-grams, so substring and glob searches only look at names that can match
+    and their cost grows with the number of matches rather than with the size of the filesystem.
+    The index is built once from a filesystem and then kept up to date with add and remove as the filesystem changes.
+    Adding a directory only indexes the directory itself: its contents are indexed one level at a time, the first time something
+    searches in it or changes inside it, so adding a large shared directory costs the same as adding a file.
+
+    Attributes:
+        paths_by_name (dict[str, dict[str, bool]]): The absolute path of every indexed file and directory with a name, and whether each is a directory.
+        names_by_gram (dict[str, set[str]]): The names containing each n-gram.
+    """
+
+    def __init__(self, root: dict | None = None) -> None:
+        """
+        Initializes the index, with everything in a root directory if one is given.
+
+        Parameters:
+            root (dict | None): The root directory of a filesystem, i.e. filesystem["/"].
+        """
+        self.paths_by_name: dict[str, dict[str, bool]] = {}
+        self.names_by_gram: dict[str, set[str]] = {}
+        self._unindexed: dict[str, dict] = {} # The added directories whose contents are not indexed yet, by absolute path
+        if root is not None:
+            self._add_children("/", root)
+
+    def _add_entry(self, path: str, name: str, is_directory: bool):
+        """
+        Indexes one file or directory.
+        """
+        paths = self.paths_by_name.get(name)
+        if paths is None:
+            paths = self.paths_by_name[name] = {}
+            for gram in _all_grams(name):
+                self.names_by_gram.setdefault(gram, set()).add(name)
+        paths[path] = is_directory
+
+    def _remove_entry(self, path: str, name: str):
+        """
+        Removes one file or directory from the index.
+        """
+        paths = self.paths_by_name.get(name)
+        if paths is None or paths.pop(path, None) is None or paths:
+            return
+        del self.paths_by_name[name]
+        for gram in _all_grams(name):
+            names = self.names_by_gram[gram]
+            names.discard(name)
+            if not names:
+                del self.names_by_gram[gram]
+
+    def _add_children(self, directory_path: str, directory: dict):
+        """
+        Indexes everything in a directory, recursively.
+        """
+        for name, value in directory.items():
+            path = _join_path(directory_path, name)
+            self._add_entry(path, name, isinstance(value, dict))
+            if isinstance(value, dict):
+                self._add_children(path, value)
+
+    def _remove_children(self, directory_path: str, directory: dict):
+        """
+        Removes everything in a directory from the index, recursively, skipping the directories whose contents were never indexed.
+        """
+        for name, value in directory.items():
+            path = _join_path(directory_path, name)
+            self._remove_entry(path, name)
+            if isinstance(value, dict) and self._unindexed.pop(path, None) is None:
+                self._remove_children(path, value)
+
+    def _index_contents(self, directory_path: str):
+        """
+        Indexes the entries of an added directory, leaving the contents of the directories in it for later.
+        """
+        for name, value in self._unindexed.pop(directory_path).items():
+            path = _join_path(directory_path, name)
+            self._add_entry(path, name, isinstance(value, dict))
+            if isinstance(value, dict) and value:
+                self._unindexed[path] = value
+
+    def _index_path(self, directory_path: str):
+        """
+        Indexes the contents of every directory on a path that has not been indexed yet, from the root directory down,
+        before the directory at the path is changed.
+        """
+        path = ""
+        for name in directory_path.strip("/").split("/") if directory_path.strip("/") else []:
+            path += "/" + name
+            if path in self._unindexed:
+                self._index_contents(path)
+
+    def _index_under(self, directory_path: str):
+        """
+        Indexes everything in a directory that has not been indexed yet, before searching it.
+        """
+        self._index_path(directory_path)
+        prefix = directory_path.rstrip("/") + "/"
+        while True:
+            paths = [path for path in self._unindexed if path.startswith(prefix)]
+            if not paths:
+                return
+            for path in paths:
+                self._index_contents(path)
+
+    def add(self, directory_path: str, name: str, value):
+        """
+        Indexes a file or directory added to the filesystem. The contents of a directory are indexed when first needed.
+
+        Parameters:
+            directory_path (str): The absolute path of the directory it was added to.
+            name (str): The name of the file or directory.
+            value: The file content, or a dict for a directory.
+        """
+        self._index_path(directory_path)
+        path = _join_path(directory_path, name)
+        self._add_entry(path, name, isinstance(value, dict))
+        if isinstance(value, dict) and value:
+            self._unindexed[path] = value
+
+    def remove(self, directory_path: str, name: str, value):
+        """
+        Removes a file or directory removed from the filesystem from the index, with everything in it.
+
+        Parameters:
+            directory_path (str): The absolute path of the directory it was removed from.
+            name (str): The name of the file or directory.
+            value: The file content or directory dict that was removed.
+        """
+        self._index_path(directory_path)
+        path = _join_path(directory_path, name)
+        self._remove_entry(path, name)
+        if isinstance(value, dict) and self._unindexed.pop(path, None) is None:
+            self._remove_children(path, value)
+
+    def _candidate_names(self, literals: list[str]):
+        """
+        Returns the names containing the n-grams of all the literal parts of a search term. Every name that can match is returned,
+        along with a few that still need to be checked.
+        """
+        gram_sets = []
+        for literal in literals:
+            for gram in _grams(literal, MAX_GRAM_LENGTH):
+                names = self.names_by_gram.get(gram)
+                if names is None:
+                    return set()
+                gram_sets.append(names)
+        if not gram_sets:
+            return self.paths_by_name.keys()
+        gram_sets.sort(key=len)
+        return gram_sets[0].intersection(*gram_sets[1:])
+
+    def search(self, term: str, under: str = "/", show_hidden: bool = False) -> list[tuple[str, bool]]:
+        """
+        Finds the files and directories whose name contains a term, or matches it if the term is a glob pattern such as '*.log'.
+
+        Parameters:
+            term (str): The substring or glob pattern to look for.
+            under (str): The absolute path of the directory to search in.
+            show_hidden (bool): Whether to include names starting with '.'.
+
+        Returns:
+            list[tuple[str, bool]]: The absolute path of each match and whether it is a directory, sorted by path.
+        """
+        if any(character in term for character in GLOB_CHARACTERS):
+            matches = lambda name: fnmatchcase(name, term)
+            literals = [literal for literal in _GLOB_WILDCARDS.split(term) if literal]
+        else:
+            matches = lambda name: term in name
+            literals = [term] if term else []
+        self._index_under(under)
+        prefix = under.rstrip("/") + "/"
+        found = []
+        for name in self._candidate_names(literals):
+            if (show_hidden or not name.startswith(".")) and matches(name):
+                found.extend((path, is_directory) for path, is_directory in self.paths_by_name[name].items() if path.startswith(prefix))
+        return sorted(found)
+
+    def exists(self, name: str, under: str = "/") -> bool:
+        """
+        Checks whether a file or directory with exactly this name is anywhere in a directory.
+
+        Parameters:
+            name (str): The name to look for.
+            under (str): The absolute path of the directory to look in.
+
+        Returns:
+            bool: True if the name is found.
+        """
+        self._index_under(under)
+        prefix = under.rstrip("/") + "/"
+        return any(path.startswith(prefix) for path in self.paths_by_name.get(name, ()))
@@ -0,0 +1,57 @@
+class Directory(dict):
+    """
+    A directory of a terminal's filesystem that can be shared between filesystems and copied on write.
+    Sharing a directory marks it instead of copying it, so downloading or unzipping a directory costs the same however large it is.
+    A shared directory is never changed: writing inside it first replaces it with a copy of its own entries, one level at a time,
+    so a write only copies the shared directories on the path from the root directory to the directory it changes.
+
+    Attributes:
+        shared (bool): Whether the directory may be referenced from more than one place, and so must be copied before it is changed.
+    """
+
+    __slots__ = ("shared",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Initializes a directory that is not shared, with the given entries.
+        """
+        super().__init__(*args, **kwargs)
+        self.shared = False
+
+    def share(self) -> "Directory":
+        """
+        Marks the directory as shared so it can be placed in another directory or filesystem without copying it.
+
+        Returns:
+            Directory: The directory itself.
+        """
+        self.shared = True
+        return self
+
+    def writable_copy(self) -> "Directory":
+        """
+        Returns a directory with the same entries that is not shared. The directories in it are now referenced
+        from both directories, so they are marked as shared in turn.
+
+        Returns:
+            Directory: The copy.
+        """
+        copy = Directory(self)
+        for value in copy.values():
+            if isinstance(value, Directory):
+                value.shared = True
+        return copy
+
+def as_directory(value):
+    """
+    Turns the plain dicts of a filesystem, such as those loaded from JSON, into Directory nodes. Other values are returned as they are.
+
+    Parameters:
+        value: A file content, or a dict for a directory.
+
+    Returns:
+        The file content, or the directory as a Directory.
+    """
+    if not isinstance(value, dict) or isinstance(value, Directory):
+        return value
+    return Directory({name: as_directory(child) for name, child in value.items()})
@@ -0,0 +1,201 @@
+import asyncio
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from time import monotonic, sleep
+from utility import Utility
+
+# A render job's output, one step at a time: the bytes to write and the time in seconds to wait before the job's next step
+RenderSteps = Iterator[tuple[bytes, float]]
+
+class RenderJob:
+    """
+    A handle to an animation running on the render loop. It can be stopped the same way as a ThreadControl.
+
+    Attributes:
+        stop_event (threading.Event): Set to ask the animation to finish. The animation decides when it is safe to stop.
+        error (BaseException | None): The exception the animation raised, if it failed.
+        finished_event (threading.Event): Set once the animation has written its last output.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a handle for an animation that has not been submitted yet.
+        """
+        self.stop_event = threading.Event()
+        self.error: BaseException | None = None
+        self._steps: RenderSteps | None = None
+        self._due_time = 0.0
+        self.finished_event = threading.Event()
+
+    def is_finished(self) -> bool:
+        """
+        Checks whether the animation has written its last output.
+
+        Returns:
+            bool: True if the animation is finished.
+        """
+        return self.finished_event.is_set()
+
+    def wait(self):
+        """
+        Waits for the animation to finish.
+
+        Raises:
+            BaseException: The exception the animation raised, if it failed.
+        """
+        self.finished_event.wait()
+        if self.error:
+            raise self.error
+
+    def stop(self, wait_before_continueing_after_thread_stop_for: float = 0.0):
+        """
+        Signals the animation to stop and waits for it to finish.
+
+        Args:
+            wait_before_continueing_after_thread_stop_for (float, optional): Time in seconds to wait after the animation stops before continuing execution.
+        """
+        self.stop_event.set()
+        self.finished_event.wait()
+        sleep(wait_before_continueing_after_thread_stop_for)
+
+class RenderLoop:
+    """
+    A single thread that owns terminal output for every animation.
+    Animations are submitted as jobs through a queue and produce their output as generators of steps. On each tick the loop advances every
+    job that is due and joins their output into one write: each job's output for the tick stays in one piece and is never split by
+    another job's escape sequences. Where the output lands on screen is up to each job's own cursor movements.
+    Output is flushed at most once per tick, which caps how often the terminal is written to.
+    If a write fails, the jobs whose output was lost finish with the error, so nothing waits on them forever, and the loop carries on.
+
+    Attributes:
+        tick_interval (float): The minimum time in seconds between two writes to the terminal.
+        ticks (int): The number of ticks that wrote output.
+        bytes_written (int): The total number of bytes written.
+    """
+
+    _shared: 'RenderLoop | None' = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, tick_interval: float = 1 / 120) -> None:
+        """
+        Initializes the render loop and starts its thread.
+
+        Args:
+            tick_interval (float): The minimum time in seconds between two writes to the terminal.
+        """
+        self.tick_interval = tick_interval
+        self.ticks = 0
+        self.bytes_written = 0
+        self._job_queue: queue.Queue[RenderJob] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="render-loop", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def shared(cls) -> 'RenderLoop':
+        """
+        Returns the render loop shared by the whole game, starting it on first use.
+
+        Returns:
+            RenderLoop: The shared render loop.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def start_job(self, make_steps: Callable[[threading.Event], RenderSteps]) -> RenderJob:
+        """
+        Submits an animation to the render loop.
+
+        Args:
+            make_steps (Callable[[threading.Event], RenderSteps]): Called with the job's stop event, returns the generator of the animation's steps.
+
+        Returns:
+            RenderJob: A handle to stop or wait for the animation.
+        """
+        job = RenderJob()
+        job._steps = make_steps(job.stop_event)
+        self._job_queue.put(job)
+        return job
+
+    def _run(self):
+        """
+        Runs the render loop forever: collects new jobs, advances the jobs that are due, and writes their combined output once per tick.
+        """
+        active_jobs: list[RenderJob] = []
+        last_write_time = 0.0
+        while True:
+            # Sleep until the next job is due, or until a new job arrives
+            timeout = None
+            if active_jobs:
+                next_due_time = min(job._due_time for job in active_jobs)
+                timeout = max(next_due_time - monotonic(), last_write_time + self.tick_interval - monotonic(), 0.0)
+            try:
+                new_job = self._job_queue.get(timeout=timeout)
+                new_job._due_time = monotonic()
+                active_jobs.append(new_job)
+                while True:
+                    new_job = self._job_queue.get_nowait()
+                    new_job._due_time = monotonic()
+                    active_jobs.append(new_job)
+            except queue.Empty:
+                pass
+
+            now = monotonic()
+            if now < last_write_time + self.tick_interval:
+                continue
+            regions = []
+            written_jobs = []
+            finished_jobs = []
+            for job in active_jobs:
+                if job._due_time > now:
+                    continue
+                region = []
+                try:
+                    while True:
+                        output, delay = next(job._steps)
+                        region.append(output)
+                        if delay > 0:
+                            job._due_time = now + delay
+                            break
+                except StopIteration:
+                    finished_jobs.append(job)
+                except Exception as error:
+                    job.error = error
+                    finished_jobs.append(job)
+                if region:
+                    regions.append(b"".join(region))
+                    written_jobs.append(job)
+            output = b"".join(regions)
+            if output:
+                try:
+                    Utility.write_bytes(output)
+                except (OSError, ValueError) as error:
+                    # The terminal cannot be written to, e.g. stdout was closed or its pipe broke
+                    for job in written_jobs:
+                        if job not in finished_jobs:
+                            job.error = error
+                            finished_jobs.append(job)
+                else:
+                    self.ticks += 1
+                    self.bytes_written += len(output)
+                last_write_time = now
+            for job in finished_jobs:
+                active_jobs.remove(job)
+                job.finished_event.set()
+
+async def play_steps_async(steps: RenderSteps):
+    """
+    Plays an animation's steps on the running asyncio event loop instead of the render loop thread.
+    Output is written as soon as each step produces it, and waiting between steps yields to the other tasks on the event loop,
+    so any number of animations can play together on one thread.
+
+    Args:
+        steps (RenderSteps): The generator of the animation's steps.
+    """
+    for output, delay in steps:
+        if output:
+            Utility.write_bytes(output)
+        if delay:
+            await asyncio.sleep(delay)
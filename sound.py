@@ -1,8 +1,18 @@
-from time import sleep
+import asyncio
+from time import sleep, monotonic
 import threading
-from playsound import playsound
+try:
+    from playsound import playsound
+except ImportError:
+    playsound = None
 
 from utility import Utility
+from audio_mixer import AudioMixer, Voice, WavFormatError, create_default_output
+from sound_registry import SoundRegistry
+from sound_store import read_sound, playable_wav_path
+
+# Seconds past a sound's length that play_async waits for its voice to finish, in case the mixer never finishes it
+PLAY_FINISH_SLACK = 1.0
 
 class Sound:
     """
@@ -28,6 +38,95 @@ class Sound:
     COMPLETE_NOTIFICATION = Utility.resource_path('sounds/complete_notification.wav')
     HACKERS_ANIMATION = Utility.resource_path('sounds/hackers_animation.wav')
 
+    _mixer: AudioMixer | None = None
+    _mixer_lock = threading.Lock()
+    _registry: SoundRegistry | None = None
+    _registry_lock = threading.Lock()
+
+    @staticmethod
+    def registry() -> SoundRegistry:
+        """
+        Returns the index of the game's sounds, validating every sound file on first use.
+
+        Returns:
+            SoundRegistry: The index of the sounds.
+        """
+        with Sound._registry_lock:
+            if Sound._registry is None:
+                sounds = {name: value for name, value in vars(Sound).items() if name.isupper() and isinstance(value, str)}
+                Sound._registry = SoundRegistry(sounds)
+            return Sound._registry
+
+    @staticmethod
+    def preload():
+        """
+        Starts decoding every sound on a background thread, so that the first play of each sound does not wait on the disk.
+        Call it early, while something else like the intro animation keeps the player busy.
+        """
+        mixer = Sound.mixer()
+        if mixer is not None:
+            Sound.registry().preload(mixer.load)
+
+    @staticmethod
+    def mixer() -> AudioMixer | None:
+        """
+        Returns the mixer all sounds play through, creating it on first use.
+
+        Returns:
+            AudioMixer | None: The mixer, or None if no audio output is available, in which case sounds fall back to playsound.
+        """
+        with Sound._mixer_lock:
+            if Sound._mixer is None:
+                output = create_default_output()
+                if output is not None:
+                    Sound._mixer = AudioMixer(output, decoder=read_sound)
+            return Sound._mixer
+
+    @staticmethod
+    def _playable_wav_path(sound_file: str) -> str | None:
+        """
+        Returns a WAV file playsound can open, restoring it from its sound store if needed. Called on the playsound thread,
+        since restoring a sound reads and writes files. A sound that cannot be restored is marked missing.
+
+        Parameters:
+            sound_file (str): The path to the sound file to be played.
+
+        Returns:
+            str | None: The path of the WAV file, or None if the sound cannot be played.
+        """
+        try:
+            return playable_wav_path(sound_file)
+        except (OSError, WavFormatError) as error:
+            Sound.registry().mark_missing(sound_file, error)
+            return None
+
+    @staticmethod
+    def _start(sound_file: str) -> Voice | None:
+        """
+        Starts a single play of a sound file on the mixer, or on a playsound thread if there is no mixer.
+        A sound that is missing or cannot be decoded is skipped, so a missing sound never stops the game.
+
+        Parameters:
+            sound_file (str): The path to the sound file to be played.
+
+        Returns:
+            Voice | None: The playing voice, or None if the sound is not played by the mixer.
+        """
+        if not Sound.registry().is_available(sound_file):
+            return None
+        mixer = Sound.mixer()
+        if mixer is None:
+            if playsound is not None:
+                def sound_thread():
+                    wav_path = Sound._playable_wav_path(sound_file)
+                    if wav_path is not None:
+                        playsound(wav_path)
+                threading.Thread(target=sound_thread, daemon=True).start()
+            return None
+        try:
+            return mixer.play(sound_file)
+        except (OSError, WavFormatError):
+            return None
 
     @staticmethod
     def play(sound_file: str = MAC_OS_STARTUP_MODERN_SOUND, loop: int = 1, pause: float = 0.0):
@@ -39,12 +138,74 @@ class Sound:
             loop (int): The number of times the sound file is played.
             pause (float): The duration (in seconds) to wait between each play.
         """
-        def sound_thread():
-            playsound(sound_file)
         for i in range(loop):
-            threading.Thread(target=sound_thread).start()
+            Sound._start(sound_file)
             sleep(pause)
 
+    @staticmethod
+    def play_looping(sound_file: str, duration: float | None = None, stop_event: threading.Event | None = None) -> Voice | None:
+        """
+        Plays the specified sound file over and over without gaps, until the duration has passed or the stop event is set. Returns right away.
+
+        Parameters:
+            sound_file (str): The path to the sound file to be played.
+            duration (float | None): How long to play for, in seconds. None plays until the stop event is set or the voice is stopped.
+            stop_event (threading.Event | None): An event that stops the sound once it is set, such as a RenderJob's finished_event.
+
+        Returns:
+            Voice | None: The playing voice, or None if the sound is not played by the mixer.
+        """
+        if not Sound.registry().is_available(sound_file):
+            return None
+        mixer = Sound.mixer()
+        if mixer is None:
+            if playsound is not None:
+                def sound_thread():
+                    end_time = None if duration is None else monotonic() + duration
+                    wav_path = Sound._playable_wav_path(sound_file)
+                    while wav_path is not None and not (stop_event and stop_event.is_set()) and (end_time is None or monotonic() < end_time):
+                        playsound(wav_path)
+                threading.Thread(target=sound_thread, daemon=True).start()
+            return None
+        try:
+            return mixer.play(sound_file, loop=True, duration=duration, stop_event=stop_event)
+        except (OSError, WavFormatError):
+            return None
+
+    @staticmethod
+    async def play_async(sound_file: str = MAC_OS_STARTUP_MODERN_SOUND, loop: int = 1, pause: float = 0.0):
+        """
+        Plays the specified sound file a given number of times with a pause between each play, on the running asyncio event loop.
+        Finishes once every play has finished, so sounds can be sequenced with await and asyncio.gather.
+        A play that has not finished PLAY_FINISH_SLACK seconds after the sound's length is stopped and no longer waited on.
+
+        Parameters:
+            sound_file (str): The path to the sound file to be played.
+            loop (int): The number of times the sound file is played.
+            pause (float): The duration (in seconds) to wait between the start of each play.
+        """
+        def finish_play(play: asyncio.Future):
+            if not play.done():
+                play.set_result(None)
+
+        async def wait_for_play(voice: Voice, play: asyncio.Future):
+            try:
+                await asyncio.wait_for(play, voice.duration + PLAY_FINISH_SLACK)
+            except asyncio.TimeoutError:
+                voice.stop()
+
+        event_loop = asyncio.get_running_loop()
+        plays = []
+        for i in range(loop):
+            voice = Sound._start(sound_file)
+            if voice is not None:
+                play = event_loop.create_future()
+                # Voices finish on the mixer thread, so the result is handed back to the event loop
+                voice.add_done_callback(lambda _voice, play=play: event_loop.call_soon_threadsafe(finish_play, play))
+                plays.append(asyncio.create_task(wait_for_play(voice, play)))
+            await asyncio.sleep(pause)
+        await asyncio.gather(*plays)
+
     @staticmethod
     def crash():
         """
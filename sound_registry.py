@@ -0,0 +1,149 @@
+import os
+import threading
+from collections.abc import Callable
+from audio_mixer import WavFormatError
+from sound_store import read_sound_info, stored_sound_path
+
+class SoundAsset:
+    """
+    A sound file that was checked to exist and to be decodable.
+
+    Attributes:
+        name (str): The name the game knows the sound by, such as DIGITAL_TYPING.
+        file_path (str): The WAV path of the sound. The sound may be stored compressed next to it instead.
+        size (int): The size in bytes of the file the sound is stored in.
+        sample_rate (int): The number of frames per second.
+        channels (int): The number of channels.
+        duration (float): The length of the sound in seconds.
+    """
+
+    def __init__(self, name: str, file_path: str, size: int, sample_rate: int, channels: int, duration: float) -> None:
+        """
+        Initializes the index entry of a sound file.
+
+        Parameters:
+            name (str): The name the game knows the sound by.
+            file_path (str): The path of the WAV file.
+            size (int): The size of the file in bytes.
+            sample_rate (int): The number of frames per second.
+            channels (int): The number of channels.
+            duration (float): The length of the sound in seconds.
+        """
+        self.name = name
+        self.file_path = file_path
+        self.size = size
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.duration = duration
+
+class SoundRegistry:
+    """
+    An index of the game's sound files, checked once when the registry is built. Only the headers are read, so building it is cheap;
+    the sounds themselves are decoded later, ideally in the background by preload before they are first played.
+    A sound that is missing or cannot be decoded is recorded once with the reason and is then skipped without touching the disk again.
+
+    Attributes:
+        assets (dict[str, SoundAsset]): The valid sounds, by file path.
+        missing (dict[str, str]): The reason each invalid sound cannot be played, by file path.
+    """
+
+    def __init__(self, sounds: dict[str, str]) -> None:
+        """
+        Initializes the registry and validates every sound.
+
+        Parameters:
+            sounds (dict[str, str]): The file path of each sound, by name.
+        """
+        self.assets: dict[str, SoundAsset] = {}
+        self.missing: dict[str, str] = {}
+        self._lock = threading.Lock()
+        for name, file_path in sounds.items():
+            self._index(name, file_path)
+
+    def _index(self, name: str, file_path: str) -> SoundAsset | None:
+        """
+        Validates a sound file and records it as an asset or as missing.
+
+        Parameters:
+            name (str): The name the game knows the sound by.
+            file_path (str): The path of the WAV file.
+
+        Returns:
+            SoundAsset | None: The asset, or None if the sound cannot be played.
+        """
+        try:
+            info = read_sound_info(file_path)
+            asset = SoundAsset(name, file_path, os.path.getsize(stored_sound_path(file_path)), info.sample_rate, info.channels, info.duration)
+        except (OSError, WavFormatError) as error:
+            with self._lock:
+                self.missing[file_path] = str(error)
+            return None
+        with self._lock:
+            self.assets[file_path] = asset
+        return asset
+
+    def get(self, file_path: str) -> SoundAsset | None:
+        """
+        Looks up a sound, validating it first if it is not one of the sounds the registry was built with.
+
+        Parameters:
+            file_path (str): The path of the WAV file.
+
+        Returns:
+            SoundAsset | None: The asset, or None if the sound is missing or cannot be decoded.
+        """
+        with self._lock:
+            if file_path in self.missing:
+                return None
+            asset = self.assets.get(file_path)
+        if asset is None:
+            asset = self._index(os.path.basename(file_path), file_path)
+        return asset
+
+    def is_available(self, file_path: str) -> bool:
+        """
+        Checks whether a sound can be played.
+
+        Parameters:
+            file_path (str): The path of the WAV file.
+
+        Returns:
+            bool: True if the sound exists and can be decoded.
+        """
+        return self.get(file_path) is not None
+
+    def mark_missing(self, file_path: str, error: Exception):
+        """
+        Records that a sound failed to play, so it is skipped from then on.
+
+        Parameters:
+            file_path (str): The path of the WAV file.
+            error (Exception): Why the sound could not be played.
+        """
+        with self._lock:
+            self.assets.pop(file_path, None)
+            self.missing[file_path] = str(error)
+
+    def preload(self, load: Callable[[str], object]) -> threading.Thread:
+        """
+        Decodes every valid sound on a background thread, shortest first so the common effects are ready soonest.
+        A sound that fails to load is moved to missing.
+
+        Parameters:
+            load (Callable[[str], object]): Decodes a sound and keeps it in memory, such as AudioMixer.load.
+
+        Returns:
+            threading.Thread: The thread doing the loading.
+        """
+        def preload_thread():
+            with self._lock:
+                assets = sorted(self.assets.values(), key=lambda asset: asset.duration)
+            for asset in assets:
+                try:
+                    load(asset.file_path)
+                except (OSError, WavFormatError) as error:
+                    self.mark_missing(asset.file_path, error)
+
+        thread = threading.Thread(target=preload_thread, name="sound-preload", daemon=True)
+        thread.start()
+        return thread
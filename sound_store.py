@@ -0,0 +1,243 @@
+import lzma
+import os
+import struct
+import sys
+import wave
+from pathlib import Path
+import numpy as np
+from audio_mixer import PcmBuffer, WavInfo, WavFormatError, decode_pcm, read_wav, read_wav_info, read_wav_pcm
+from utility import Utility
+
+# File extension used for compressed sound files
+SOUND_STORE_EXTENSION = ".sndz"
+
+# Sound store layout (all integers little endian):
+#   header: magic, format version, flags, WAVE format code, sample rate, channels, bits per sample, frame count
+#   body:   the xz compressed samples. Integer samples are stored as the difference to the previous sample of the same channel,
+#           which is small for audio and compresses far better than the samples themselves. Decoding restores the WAV data exactly.
+SOUND_STORE_MAGIC = b"HTPS"
+SOUND_STORE_VERSION = 1
+
+# Header flag marking a store whose samples are stored as per channel differences
+SOUND_STORE_FLAG_DELTA = 0x1
+
+_HEADER = struct.Struct("<4sHHHIHHI")
+
+# The sample type the differences of each integer sample size are taken in. 24-bit samples are widened to 32 bits first
+_DELTA_DTYPES = {8: np.uint8, 16: np.dtype("<i2"), 24: np.dtype("<i4"), 32: np.dtype("<i4")}
+_WAVE_FORMAT_PCM = 0x0001
+
+class SoundStoreError(WavFormatError):
+    """
+    Raised when a file is not a sound store or uses a format version this module cannot read.
+    """
+
+def compressed_sound_path(wav_file_path: str | Path) -> Path:
+    """
+    Returns the path of the sound store stored alongside a WAV file.
+
+    Parameters:
+        wav_file_path (str | Path): The path of the WAV file.
+
+    Returns:
+        Path: The path of the sound store, e.g. sounds/dial_tone.sndz for sounds/dial_tone.wav.
+    """
+    return Path(wav_file_path).with_suffix(SOUND_STORE_EXTENSION)
+
+def stored_sound_path(file_path: str | Path) -> str:
+    """
+    Returns the file a sound is actually read from: the WAV file if it exists, otherwise its sound store.
+    The game refers to sounds by their WAV path; the executable only ships the sound stores.
+
+    Parameters:
+        file_path (str | Path): The WAV path of the sound.
+
+    Returns:
+        str: The path of the file to read.
+    """
+    if os.path.exists(file_path):
+        return str(file_path)
+    return str(compressed_sound_path(file_path))
+
+def _sample_data_to_deltas(sample_data: bytes, channels: int, bits_per_sample: int) -> np.ndarray:
+    """
+    Turns integer WAV sample data into the difference of each sample to the previous sample of its channel.
+    Differences wrap around like the integer type they are taken in, so the original samples are restored exactly.
+    """
+    if bits_per_sample == 24:
+        sample_bytes = np.frombuffer(sample_data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = ((sample_bytes[:, 0] << 8) | (sample_bytes[:, 1] << 16) | (sample_bytes[:, 2] << 24)) >> 8
+    else:
+        samples = np.frombuffer(sample_data, dtype=_DELTA_DTYPES[bits_per_sample])
+    samples = samples.reshape(-1, channels)
+    return np.diff(samples, axis=0, prepend=np.zeros((1, channels), dtype=samples.dtype))
+
+def _deltas_to_sample_data(deltas: np.ndarray, bits_per_sample: int) -> bytes:
+    """
+    Restores integer WAV sample data from the per channel differences made by _sample_data_to_deltas.
+    """
+    samples = np.cumsum(deltas, axis=0, dtype=deltas.dtype)
+    if bits_per_sample == 24:
+        return samples.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    return samples.tobytes()
+
+def write_sound_store(wav_file_path: str | Path, sound_store_path: str | Path | None = None) -> Path:
+    """
+    Compresses a WAV file into a sound store without losing anything.
+
+    Parameters:
+        wav_file_path (str | Path): The path of the WAV file.
+        sound_store_path (str | Path | None): The path of the sound store to write. Defaults to the WAV path with the .sndz extension.
+
+    Returns:
+        Path: The path of the sound store written.
+
+    Raises:
+        WavFormatError: If the WAV file cannot be read.
+    """
+    sound_store_path = Path(sound_store_path) if sound_store_path else compressed_sound_path(wav_file_path)
+    audio_format, sample_rate, channels, bits_per_sample, sample_data = read_wav_pcm(str(wav_file_path))
+    frame_count = len(sample_data) // (bits_per_sample // 8 * channels)
+    flags = 0
+    if audio_format == _WAVE_FORMAT_PCM and bits_per_sample in _DELTA_DTYPES:
+        sample_data = _sample_data_to_deltas(sample_data, channels, bits_per_sample).tobytes()
+        flags |= SOUND_STORE_FLAG_DELTA
+    header = _HEADER.pack(SOUND_STORE_MAGIC, SOUND_STORE_VERSION, flags, audio_format, sample_rate, channels, bits_per_sample, frame_count)
+    with open(sound_store_path, "wb") as file:
+        file.write(header)
+        file.write(lzma.compress(sample_data, preset=9 | lzma.PRESET_EXTREME))
+    return sound_store_path
+
+def _read_header(file_path: str | Path, data: bytes) -> tuple[int, int, int, int, int, int]:
+    """
+    Checks and unpacks the header of a sound store.
+
+    Returns:
+        tuple[int, int, int, int, int, int]: The flags, WAVE format code, sample rate, channels, bits per sample and frame count.
+    """
+    if len(data) < _HEADER.size:
+        raise SoundStoreError(f"'{file_path}' is not a sound store.")
+    magic, version, flags, audio_format, sample_rate, channels, bits_per_sample, frame_count = _HEADER.unpack_from(data)
+    if magic != SOUND_STORE_MAGIC:
+        raise SoundStoreError(f"'{file_path}' is not a sound store.")
+    if version != SOUND_STORE_VERSION:
+        raise SoundStoreError(f"'{file_path}' uses sound store version {version}, expected {SOUND_STORE_VERSION}.")
+    return flags, audio_format, sample_rate, channels, bits_per_sample, frame_count
+
+def read_sound_store_pcm(sound_store_path: str | Path) -> tuple[int, int, int, int, bytes]:
+    """
+    Decompresses a sound store back into the exact sample data of the WAV file it was made from.
+
+    Parameters:
+        sound_store_path (str | Path): The path of the sound store.
+
+    Returns:
+        tuple[int, int, int, int, bytes]: The format code, sample rate, number of channels, bits per sample and the sample data.
+
+    Raises:
+        OSError: If the file cannot be read.
+        SoundStoreError: If the file is not a sound store or is damaged.
+    """
+    with open(sound_store_path, "rb") as file:
+        data = file.read()
+    flags, audio_format, sample_rate, channels, bits_per_sample, frame_count = _read_header(sound_store_path, data)
+    try:
+        sample_data = lzma.decompress(data[_HEADER.size:])
+    except lzma.LZMAError as error:
+        raise SoundStoreError(f"'{sound_store_path}' is damaged: {error}") from None
+    if flags & SOUND_STORE_FLAG_DELTA:
+        deltas = np.frombuffer(sample_data, dtype=_DELTA_DTYPES[bits_per_sample]).reshape(-1, channels)
+        sample_data = _deltas_to_sample_data(deltas, bits_per_sample)
+    if len(sample_data) != frame_count * bits_per_sample // 8 * channels:
+        raise SoundStoreError(f"'{sound_store_path}' is damaged: expected {frame_count} frames.")
+    return audio_format, sample_rate, channels, bits_per_sample, sample_data
+
+def read_sound(file_path: str) -> PcmBuffer:
+    """
+    Reads and decodes a sound by its WAV path, from the WAV file or else from its sound store.
+
+    Parameters:
+        file_path (str): The WAV path of the sound.
+
+    Returns:
+        PcmBuffer: The decoded audio.
+
+    Raises:
+        OSError: If neither file can be read.
+        WavFormatError: If the file cannot be decoded.
+    """
+    if os.path.exists(file_path):
+        return read_wav(file_path)
+    audio_format, sample_rate, channels, bits_per_sample, sample_data = read_sound_store_pcm(compressed_sound_path(file_path))
+    return decode_pcm(sample_data, audio_format, sample_rate, channels, bits_per_sample)
+
+def read_sound_info(file_path: str) -> WavInfo:
+    """
+    Reads the format and length of a sound by its WAV path, from the header of the WAV file or else of its sound store.
+
+    Parameters:
+        file_path (str): The WAV path of the sound.
+
+    Returns:
+        WavInfo: The format and length of the audio.
+
+    Raises:
+        OSError: If neither file can be read.
+        WavFormatError: If the file is not a sound file or uses an unsupported sample format.
+    """
+    if os.path.exists(file_path):
+        return read_wav_info(file_path)
+    sound_store_path = compressed_sound_path(file_path)
+    with open(sound_store_path, "rb") as file:
+        header = file.read(_HEADER.size)
+    _flags, _audio_format, sample_rate, channels, bits_per_sample, frame_count = _read_header(sound_store_path, header)
+    return WavInfo(sample_rate, channels, bits_per_sample, frame_count)
+
+def playable_wav_path(file_path: str) -> str:
+    """
+    Returns a WAV file other players such as playsound can open. A sound that only exists as a sound store is restored to a WAV file
+    in the application support directory the first time it is asked for.
+
+    Parameters:
+        file_path (str): The WAV path of the sound.
+
+    Returns:
+        str: The path of a WAV file with the sound.
+    """
+    if os.path.exists(file_path):
+        return file_path
+    extracted_path = Utility.get_app_support_directory() / "sounds" / Path(file_path).name
+    if not extracted_path.exists():
+        extracted_path.parent.mkdir(parents=True, exist_ok=True)
+        audio_format, sample_rate, channels, bits_per_sample, sample_data = read_sound_store_pcm(compressed_sound_path(file_path))
+        if audio_format != _WAVE_FORMAT_PCM:
+            raise SoundStoreError(f"'{file_path}' is not PCM and cannot be restored with the wave module.")
+        temporary_path = extracted_path.with_suffix(".tmp")
+        with wave.open(str(temporary_path), "wb") as wav_file:
+            wav_file.setnchannels(channels)
+            wav_file.setsampwidth(bits_per_sample // 8)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(sample_data)
+        os.replace(temporary_path, extracted_path)
+    return str(extracted_path)
+
+if __name__ == "__main__":
+    def main():
+        """
+        Compresses WAV files into sound stores.
+
+        Usage:
+            python sound_store.py <wav file> [<wav file> ...]
+        """
+
+        args = sys.argv[1:]
+        if not args:
+            print("Usage: python sound_store.py <wav file> [<wav file> ...]")
+            sys.exit(1)
+        for wav_file_path in args:
+            sound_store_path = write_sound_store(wav_file_path)
+            wav_size = os.path.getsize(wav_file_path)
+            sound_store_size = os.path.getsize(sound_store_path)
+            print(f"{wav_file_path} -> {sound_store_path} ({wav_size:,} -> {sound_store_size:,} bytes)")
+
+    main()
@@ -1,13 +1,16 @@
-import json
 import glob, os, sys
 from time import sleep, time
 from pathlib import Path
 from utility import Utility
 from text_color import TextColor
-from ascii_animation import play_ascii_animation, load_ascii_art_animation_from_json
+from text_style import style_text
+from ascii_animation import play_ascii_animation, load_ascii_art_animation_from_json, PlaybackPlan
 from messenger_terminal import HackerMessenger, CorporationMessenger, MessageTerminal
 from animation import Animation
 from sound import Sound
+from filesystem_database import FilesystemDatabase, open_filesystem_storage
+from name_index import NameIndex
+from persistent_directory import Directory, as_directory
 
 class User:
     """
@@ -67,6 +70,13 @@ class Terminal:
         active_user (User): Currently active user on the terminal.\n
         messenger (MessageTerminal): Associated messenger instance for the terminal.\n
         messenger_messages (list): List of messages for the messenger.\n
+        playback_plans (dict): Compiled playback plans for movie files opened on the terminal, keyed by path.\n
+        journal (FilesystemJournal | FilesystemDatabase): Records each change to the filesystem on disk, and compacts the changes into the saved filesystem.\n
+        database (FilesystemDatabase): The journal if the filesystem is saved in the SQLite database, which then answers ls, find and mission checks with indexed queries; otherwise None.\n
+        node_cache (dict): Directories of the filesystem already looked up by _resolve_path, keyed by normalized path.\n
+        name_index (NameIndex): Every file and directory of the filesystem by name, used by find and exists. Built on first use.\n
+        filesystem_cache_hits (int): Number of times refresh_filesystem found the filesystem in memory up to date.\n
+        filesystem_cache_misses (int): Number of times refresh_filesystem had to load the filesystem from disk.\n
         in_ssh_session (bool): Indicates if the terminal is currently in an SSH session.\n
         is_user_terminal (bool): Indicates if the terminal is the user's terminal.\n
         exit_requested (bool): Indicates if exit from the terminal has been requested.\n
@@ -106,7 +116,15 @@ class Terminal:
         filesystem_dir = app_support_dir / "filesystems"
         filesystem_dir.mkdir(parents=True, exist_ok=True)
         self.filesystem_filename = filesystem_dir / f"{terminal_name}_filesystem.json"
-        self.filesystem_exists = os.path.exists(self.filesystem_filename)
+        self.journal = open_filesystem_storage(self.filesystem_filename, terminal_name, lambda: self.filesystem)
+        self.database = self.journal if isinstance(self.journal, FilesystemDatabase) else None
+        self.filesystem_exists = self.journal.exists()
+        self.filesystem_cache_hits = 0
+        self.filesystem_cache_misses = 0
+        self.node_cache: dict[str, dict] = {}
+        self._node_cache_root = None
+        self.name_index = None
+        self._name_index_root = None
         self.valid_users: list[User] = []
         self.active_user = None
         self.messenger = CorporationMessenger(terminal_name)
@@ -116,6 +134,8 @@ class Terminal:
         Terminal.messengers.append(self.messenger)
         self.exit_requested = False
         self.commands = self.get_commands()
+        # Compiled playback plans for the movie files opened on this terminal, keyed by path
+        self.playback_plans: dict[str, PlaybackPlan] = {}
         Terminal.terminals.append(self)
 
         if self.filesystem_exists:
@@ -140,12 +160,11 @@ class Terminal:
         """
 
         if "etc" not in self.filesystem["/"]:
-            self.filesystem["/"]["etc"] = {}
+            self._set_node([], "etc", {})
 
         # Check if the password file exists: if not, create it with a user asked password:
         if ".passwd" not in self.filesystem["/"]["etc"]:
-            self.filesystem["/"]["etc"][".passwd"] = ""
-            self.save_filesystem()
+            self._set_node(["etc"], ".passwd", "")
 
 
     def get_commands(self):
@@ -205,9 +224,7 @@ class Terminal:
 
         Utility.hide_cursor()
         animated_text = "Please log in."
-        login_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="\n", delay_between_chars=0.03)
-        Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)), pause=0.083)
-        login_text_thread.stop(0.5)
+        Animation.type_text_with_sound(animated_text, end_text="\n", pause_after=0.5)
         Utility.show_cursor()
         username = input("Enter your username: ")
         password = input("Enter your password: ")
@@ -220,9 +237,7 @@ class Terminal:
         """
         Utility.hide_cursor()
         animated_text = "You need to create a new user before being able to login."
-        create_new_user_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="\n", delay_between_chars=0.03)
-        Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+4), pause=0.083)
-        create_new_user_text_thread.stop(0.5)
+        Animation.type_text_with_sound(animated_text, end_text="\n", pause_after=0.5)
         Utility.show_cursor()
         username = input("Create username: ")
         password = input("Create password: ")
@@ -241,31 +256,269 @@ class Terminal:
 
     def load_filesystem(self):
         """
-        Loads the terminal's filesystem from a JSON file.\n
+        Loads the terminal's filesystem from its JSON file, with the changes recorded in its journal since it was saved.\n
         If the file is not found, a new filesystem is created with default structure.
         """
-        try:
-            with open(self.filesystem_filename) as file:
-                return json.load(file)
-        except FileNotFoundError:
+        filesystem = self.journal.load()
+        if filesystem is None:
             return self.create_new_filesystem() # Create a new filesystem and immediately use it if one does not exist
+        filesystem["/"] = as_directory(filesystem["/"])
+        return filesystem
+
+    def refresh_filesystem(self):
+        """
+        Makes sure the filesystem in memory matches the one saved on disk, loading it again only if the saved files were changed
+        by something other than this terminal. Checking costs a stat of the saved files, however large the filesystem is.
+
+        Returns:
+            dict: The terminal's filesystem.
+        """
+        with self.journal.lock:
+            if self.journal.is_current():
+                self.filesystem_cache_hits += 1
+            else:
+                self.filesystem_cache_misses += 1
+                self.filesystem = self.load_filesystem()
+            return self.filesystem
 
     def save_filesystem(self, filesystem=None):
         """
-        Saves the current state of the filesystem to a JSON file.
+        Saves the whole filesystem to its JSON file, compacting the changes recorded in the journal into it.
+        Changes are already saved as they are made, so this is only needed to write a new filesystem for the first time and on exit.
+        The file is written atomically on a background thread, so saving never holds up the prompt.
 
         Args:
             filesystem (dict, optional): The filesystem structure to be saved. If not provided, the terminal's current filesystem is used.
         """
-        filesystem = filesystem or self.filesystem
+        if filesystem is not None:
+            filesystem["/"] = as_directory(filesystem["/"])
+            self.filesystem = filesystem
+            self.journal.dirty = True
+        self.journal.compact_in_background()
 
-        # Ensure the directory for the filesystem file exists before saving.
-        filesystem_dir = self.filesystem_filename.parent
-        filesystem_dir.mkdir(parents=True, exist_ok=True)
+    def _set_node(self, directory_parts: list[str], name: str, value):
+        """
+        Sets a file or directory in a directory of the filesystem, and records the change in the journal.
+        A shared Directory is placed as it is, without copying it.
+
+        Args:
+            directory_parts (list[str]): The names leading from the root directory to the directory to change.
+            name (str): The name of the file or directory to set.
+            value: The file content, or a dict for a directory.
+        """
+        with self.journal.lock:
+            value = as_directory(value)
+            directory = self._writable_directory(directory_parts)
+            if isinstance(directory.get(name), dict) or isinstance(value, dict):
+                self._invalidate_node_cache([*directory_parts, name])
+            if self._name_index_root is self.filesystem:
+                if name in directory:
+                    self.name_index.remove("/" + "/".join(directory_parts), name, directory[name])
+                self.name_index.add("/" + "/".join(directory_parts), name, value)
+            directory[name] = value
+            self.journal.record_set([*directory_parts, name], value)
+
+    def _copy_node(self, source_parts: list[str], directory_parts: list[str], name: str):
+        """
+        Copies a file or directory of the filesystem into a directory of the filesystem, and records the change in the journal.
+        A directory is shared rather than copied, so copying costs the same however large the directory is.
+
+        Args:
+            source_parts (list[str]): The names leading from the root directory to the file or directory to copy.
+            directory_parts (list[str]): The names leading from the root directory to the directory to copy it to.
+            name (str): The name of the copy.
+        """
+        with self.journal.lock:
+            value = self._resolve_parts(source_parts)
+            if isinstance(value, Directory):
+                value.share()
+            directory = self._writable_directory(directory_parts)
+            if isinstance(directory.get(name), dict) or isinstance(value, dict):
+                self._invalidate_node_cache([*directory_parts, name])
+            if self._name_index_root is self.filesystem:
+                if name in directory:
+                    self.name_index.remove("/" + "/".join(directory_parts), name, directory[name])
+                self.name_index.add("/" + "/".join(directory_parts), name, value)
+            directory[name] = value
+            self.journal.record_copy(source_parts, [*directory_parts, name])
+
+    def _delete_node(self, directory_parts: list[str], name: str):
+        """
+        Deletes a file or directory from a directory of the filesystem, and records the change in the journal.
+
+        Args:
+            directory_parts (list[str]): The names leading from the root directory to the directory to change.
+            name (str): The name of the file or directory to delete.
+        """
+        with self.journal.lock:
+            directory = self._writable_directory(directory_parts)
+            if isinstance(directory.get(name), dict):
+                self._invalidate_node_cache([*directory_parts, name])
+            if self._name_index_root is self.filesystem and name in directory:
+                self.name_index.remove("/" + "/".join(directory_parts), name, directory[name])
+            del directory[name]
+            self.journal.record_delete([*directory_parts, name])
+
+    @staticmethod
+    def _split_path(path: str) -> list[str]:
+        """
+        Splits a filesystem path into the names leading from the root directory, ignoring empty parts from leading, trailing or doubled slashes.
+        '.' parts are dropped and '..' parts remove the name before them, never going above the root directory.
+
+        Args:
+            path (str): The path, taken from the root directory.
+
+        Returns:
+            list[str]: The names in the path.
+        """
+        parts = []
+        for part in path.split("/"):
+            if part == "..":
+                if parts:
+                    parts.pop()
+            elif part and part != ".":
+                parts.append(part)
+        return parts
+
+    def _normalize_path(self, path: str) -> str:
+        """
+        Turns a path into the absolute path it refers to, such as '/home/mike/Documents' for '../mike/./Documents' in '/home/mike'.
+
+        Args:
+            path (str): An absolute path, or a path relative to the current directory.
+
+        Returns:
+            str: The absolute path, without '.', '..' or empty parts and without a trailing slash except for the root directory.
+        """
+        if not path.startswith("/"):
+            path = self.current_path + "/" + path
+        return "/" + "/".join(self._split_path(path))
+
+    def _resolve_path(self, path: str):
+        """
+        Looks up the file or directory a path refers to. Every lookup of a path goes through here, so '.' and '..' mean the same for all commands.
+        Directories are kept in node_cache by normalized path, so looking up a directory again costs a single dict lookup
+        instead of a walk from the root directory.
+
+        Args:
+            path (str): An absolute path, or a path relative to the current directory.
+
+        Returns:
+            The file content or directory dict at the path, or None if nothing is there.
+        """
+        return self._resolve_parts(self._split_path(self._normalize_path(path)))
+
+    def _resolve_parts(self, parts: list[str]):
+        """
+        Looks up the file or directory at the names leading from the root directory, using and filling node_cache.
+
+        Args:
+            parts (list[str]): The names leading from the root directory, as returned by _split_path.
+
+        Returns:
+            The file content or directory dict at the path, or None if nothing is there.
+        """
+        if self._node_cache_root is not self.filesystem:
+            # The whole filesystem was replaced, so nothing cached refers to it
+            self.node_cache.clear()
+            self._node_cache_root = self.filesystem
+        key = "/" + "/".join(parts)
+        node = self.node_cache.get(key)
+        if node is not None:
+            return node
+        node = self.filesystem["/"]
+        for part in parts:
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        if isinstance(node, dict):
+            self.node_cache[key] = node
+        return node
+
+    def _writable_directory(self, parts: list[str]) -> dict:
+        """
+        Looks up a directory to change it. Any shared directory on the path from the root directory is replaced with a copy first,
+        so the change is not seen by the other filesystems or directories sharing it.
+
+        Args:
+            parts (list[str]): The names leading from the root directory to the directory.
+
+        Returns:
+            dict: The directory, which can be changed in place.
+
+        Raises:
+            KeyError: If the path is not a directory.
+        """
+        directory = self.filesystem["/"]
+        if isinstance(directory, Directory) and directory.shared:
+            directory = self.filesystem["/"] = directory.writable_copy()
+            self.node_cache.pop("/", None)
+        for index, part in enumerate(parts):
+            child = directory.get(part) if isinstance(directory, dict) else None
+            if not isinstance(child, dict):
+                raise KeyError("/" + "/".join(parts[:index + 1]))
+            if isinstance(child, Directory) and child.shared:
+                child = directory[part] = child.writable_copy()
+                self.node_cache.pop("/" + "/".join(parts[:index + 1]), None)
+            directory = child
+        return directory
+
+    def _make_directories(self, parts: list[str]) -> dict:
+        """
+        Looks up a directory, creating it and any missing directories above it.
+
+        Args:
+            parts (list[str]): The names leading from the root directory to the directory.
+
+        Returns:
+            dict: The directory.
+        """
+        for index, part in enumerate(parts):
+            if not isinstance(self._resolve_parts(parts[:index + 1]), dict):
+                self._set_node(parts[:index], part, {})  # Create a new directory if it does not exist
+        return self._resolve_parts(parts)
+
+    def _get_name_index(self) -> NameIndex:
+        """
+        Returns the name index of the filesystem, building it if this is the first search since the filesystem was loaded.
+        From then on _set_node and _delete_node keep it up to date.
 
-        # Save the filesystem structure to the file
-        with open(self.filesystem_filename, "w") as file:
-            json.dump(filesystem, file, indent=4)
+        Returns:
+            NameIndex: The name index.
+        """
+        with self.journal.lock:
+            if self._name_index_root is not self.filesystem:
+                self.name_index = NameIndex(self.filesystem["/"])
+                self._name_index_root = self.filesystem
+            return self.name_index
+
+    def exists(self, name: str, under: str = "/") -> bool:
+        """
+        Checks whether a file or directory with exactly this name is anywhere in a directory, without printing anything.
+
+        Args:
+            name (str): The name of the file or directory.
+            under (str, optional): The path of the directory to look in, taken from the root directory. Defaults to the whole filesystem.
+
+        Returns:
+            bool: True if the name is found.
+        """
+        under = "/" + "/".join(self._split_path(under))
+        if self.database is not None:
+            return self.database.name_exists(name, under)
+        return self._get_name_index().exists(name, under)
+
+    def _invalidate_node_cache(self, parts: list[str]):
+        """
+        Forgets the cached directories at and below a path, before the directory there is replaced or deleted.
+
+        Args:
+            parts (list[str]): The names leading from the root directory to the changed directory.
+        """
+        key = "/" + "/".join(parts)
+        prefix = key + "/"
+        for cached_path in [cached_path for cached_path in self.node_cache if cached_path == key or cached_path.startswith(prefix)]:
+            del self.node_cache[cached_path]
 
     def create_new_filesystem(self):
         """
@@ -309,6 +562,7 @@ class Terminal:
                 "usr": {}
                 }
             }
+        base_structure["/"] = as_directory(base_structure["/"])
         return base_structure
 
     def load_valid_users(self):
@@ -337,14 +591,7 @@ class Terminal:
             The content of the file or None if the file does not exist.
         """
 
-        parts = file_path.strip("/").split("/")
-        node = self.filesystem["/"]
-        for part in parts:
-            if part in node:
-                node = node[part]
-            else:
-                return None #File not found
-        return node
+        return self._resolve_parts(self._split_path(file_path))
 
     def login_user(self, username, password):
         """
@@ -369,17 +616,13 @@ class Terminal:
                     Utility.hide_cursor()
                     Utility.clear_screen()
                     animated_text = f"Logged in as {user.username}!"
-                    logged_in_as_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="\n", delay_between_chars=0.03)
-                    Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+2), pause=0.083)
-                    logged_in_as_text_thread.stop(0.5)
+                    Animation.type_text_with_sound(animated_text, end_text="\n", pause_after=0.5)
                     sleep(1)
                 return True
         if not user_found:
             Utility.hide_cursor()
             animated_text = "Login failed. Invalid username or password."
-            create_new_user_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="\n", delay_between_chars=0.03)
-            Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+4), pause=0.083)
-            create_new_user_text_thread.stop(0.5)
+            Animation.type_text_with_sound(animated_text, end_text="\n", pause_after=0.5)
             self.active_user = None
             return False
         return user_found
@@ -411,7 +654,7 @@ class Terminal:
         # Ensure the etc directory and password file exist before creating a user:
         self.ensure_password_file_exists()
         # Update the password file with the new user's password
-        self.filesystem["/"]["etc"][".passwd"] = password
+        self._set_node(["etc"], ".passwd", password)
 
         # Create home directory for the new user
         self.create_user_home_directory(username)
@@ -435,13 +678,12 @@ class Terminal:
 
         # Ensure the "home" directory exists
         if "home" not in self.filesystem["/"]:
-            self.filesystem["/"]["home"] = {}
+            self._set_node([], "home", {})
 
         # Create the new user's home directories
         base_dirs = ["Desktop", "Documents", "Downloads", "Movies", "Music", "Pictures"]
         user_home = {dir_name: {} for dir_name in base_dirs}
-        self.filesystem["/"]["home"][username] = user_home
-        self.save_filesystem()
+        self._set_node(["home"], username, user_home)
 
     def execute(self, command):
         """
@@ -489,33 +731,26 @@ class Terminal:
         """
         show_all = '-a' in args or '-al' in args # Check if '-a' or '-al' flag is present in command arguments
 
-        # Start from the root of the filesystem
-        node = self.filesystem["/"]
-
-        # If not in the root directory, navigate to the current directory
-        if self.current_path != "/":
-            parts = self.current_path.strip("/").split("/")  # Remove leading '/' and split
-            for part in parts:
-                if part and part in node:  # Check each part of the path exists in the filesystem
-                    node = node[part]
-                else:
-                    print(f"Directory '{part}' not found.")
-                    return
+        # Look up the entries of the current directory, with a query of the database if there is one
+        if self.database is not None:
+            entries = self.database.list_directory(self.current_path)
+        else:
+            node = self._resolve_path(self.current_path)
+            entries = [(item, isinstance(node[item], dict)) for item in node] if isinstance(node, dict) else None
+        if entries is None:
+            print(f"Directory '{self.current_path}' not found.")
+            return
 
         # List the contents of the current directory
-        if isinstance(node, dict):
-            for item in node:
-                if not show_all and item.startswith("."):
-                    continue # Skip hidden files and directories unles -a or -al flag is present
-                elif item.endswith(".zip"):
-                    print(f"{TextColor.YELLOW.value}{item}{TextColor.RESET.value}", end=" ")
-                elif not isinstance(node[item], dict): # it's a file
-                    print(f"{TextColor.WHITE.value}{item}{TextColor.RESET.value}", end=" ") # File printed to console
-                else: # it's a directory
-                    print(f"{TextColor.BLUE.value}{item}{TextColor.RESET.value}", end=" ") # Directory printed to console
-        elif node is None:
-            # The current node is a file, not a directory
-            print("Current path is a file, not a directory")
+        for item, is_directory in entries:
+            if not show_all and item.startswith("."):
+                continue # Skip hidden files and directories unles -a or -al flag is present
+            elif item.endswith(".zip"):
+                print(style_text(item, TextColor.YELLOW), end=" ")
+            elif not is_directory: # it's a file
+                print(style_text(item, TextColor.WHITE), end=" ") # File printed to console
+            else: # it's a directory
+                print(style_text(item, TextColor.BLUE), end=" ") # Directory printed to console
         print("\n") # Print a newline after listing the contents
 
     def navigate_to(self, new_path):
@@ -525,33 +760,19 @@ class Terminal:
         Args:
             new_path (str): The path to navigate to.
         """
-        # Normalize the new path for absolute paths or construct one for relative paths
-        if not new_path.startswith("/"):
-            # For relative paths, append the new path to the current_path
-            new_path = (self.current_path if self.current_path.endswith("/") else self.current_path + "/") + new_path
-
-        # Split the path into parts, ignoring empty strings that result from consecutive slashes
-        parts = list(filter(None, new_path.split("/")))
-
-        # Start from the root of the filesystem and initialize an empty path to build upon
-        node = self.filesystem["/"]
-        temp_path = "/"
-
-        for part in parts:
-            # For each part of the path, try to navigate down the filesystem hierarchy
-            if part in node:
-                if not isinstance(node[part], dict):
-                    print(f"{part}' is a file, not a directory.")
-                    return
-                node = node[part]
-                temp_path += ("" if temp_path.endswith("/") else "/") + part
-            else:
-                print(f"Directory '{part}' not found.")
-                return
+        # Resolve '.' and '..' against the current directory, never going above the root directory
+        normalized_path = self._normalize_path(new_path)
+        parent_path, name = normalized_path.rsplit("/", 1)
+        parent_node = self._resolve_path(parent_path or "/")
+        if normalized_path != "/" and (not isinstance(parent_node, dict) or name not in parent_node):
+            print(f"Directory '{new_path}' not found.")
+            return
+        if not isinstance(self._resolve_path(normalized_path), dict):
+            print(f"'{name}' is a file, not a directory.")
+            return
 
         # Update the current path if navigation was successful
-        # Remove the trailing slash for consistency except for the root directory
-        self.current_path = temp_path
+        self.current_path = normalized_path
 
     def cd(self, args):
         """
@@ -565,12 +786,7 @@ class Terminal:
             return
 
         new_path = args[0]
-        if new_path == "..":
-            # Move up to the parent directory, but not above the root directory
-            if self.current_path != "/":
-                self.current_path = "/".join(self.current_path.rstrip("/").split("/")[:-1])
-                self.current_path = self.current_path if self.current_path else "/"
-        elif new_path == "~":
+        if new_path == "~":
             # Reset to home directory
             self.current_path = f"/home/{self.active_user.username}" if self.active_user else "/home"
         else:
@@ -587,21 +803,17 @@ class Terminal:
             print("No directory name specified")
             return
         new_dir = args[0]
-        node = self.filesystem["/"]
-        parts = self.current_path.strip("/").split("/")
-        for part in parts:
-            if part in node:
-                node = node[part]
-            else:
-                print(f"Path '{'/'.join(parts)}' not found.")
+        node = self._resolve_path(self.current_path)
+        if not isinstance(node, dict):
+            print(f"Path '{self.current_path}' not found.")
+            return
         if new_dir in node:
             print(f"Directory '{new_dir}' already exists.")
             return
         elif self.current_path == "/home":
             print(f"Cannot create directory in {self.current_path.lstrip("/")} directory. This is a protected directory.")
         else:
-            node[new_dir] = {}
-        self.save_filesystem()
+            self._set_node(self._split_path(self.current_path), new_dir, {})
 
     def touch(self, args):
         """
@@ -615,16 +827,9 @@ class Terminal:
             return
         file_path = args[0]
 
-        # Determine if the path is absolute or relative
-        if file_path.startswith("/"):
-            # Absolute path
-            full_path = file_path.strip("/")
-        else:
-            # Relative path: combine current path
-            full_path = os.path.join(self.current_path, file_path).strip("/")
-
-        # Split the full path into parts and traverse the filesystem
-        dir_path, filename = os.path.split(full_path)
+        # Split the full path into the directory and the file name
+        dir_path, filename = self._normalize_path(file_path).rsplit("/", 1)
+        dir_path = dir_path or "/"
 
         # Get the node for the directory containing the file
         dir_node = self._get_node_by_path(dir_path)
@@ -642,9 +847,8 @@ class Terminal:
             else:
                 print(f"File '{filename}' already exists.")
         else:
-            dir_node[filename] = None
+            self._set_node(self._split_path(dir_path), filename, None)
             print(f"File '{filename}' created successfully.")
-        self.save_filesystem()
 
     def cat(self, args):
         """
@@ -658,26 +862,13 @@ class Terminal:
             return
 
         filename = args[0]
-        # Determine the full path to the file
-        if filename.startswith("/"):
-            parts = filename.strip("/").split("/")
-            file_name = parts.pop()
-            node = self.filesystem["/"]
-        else:
-            # Relative path
-            parts = (self.current_path.strip("/") + "/" + filename).strip("/").split("/")
-            file_name = parts.pop()
-            node = self.filesystem["/"]
-
-        # Split the full path into parts and traverse the filesystem
-        for part in parts:
-            if part in "":
-                continue # Skip empty parts from consecutive slashes
-            if part in node:
-                node = node[part]
-            else:
-                print(f"Path '{'/'.join(parts)}' not found.")
-                return
+        # Determine the full path to the file and look up the directory containing it
+        parts = self._split_path(self._normalize_path(filename))
+        file_name = parts.pop() if parts else ""
+        node = self._resolve_parts(parts)
+        if not isinstance(node, dict):
+            print(f"Path '{'/'.join(parts)}' not found.")
+            return
 
         # Check if the file exists and print its content
         if file_name in node and file_name.endswith(".zip"):
@@ -705,26 +896,13 @@ class Terminal:
             return
 
         filename = args[0]
-        # Determine the full path to the file
-        if filename.startswith("/"):
-            parts = filename.strip("/").split("/")
-            file_name = parts.pop()
-            node = self.filesystem["/"]
-        else:
-            # Relative path
-            parts = (self.current_path.strip("/") + "/" + filename).strip("/").split("/")
-            file_name = parts.pop()
-            node = self.filesystem["/"]
-
-        # Split the full path into parts and traverse the filesystem
-        for part in parts:
-            if part in "":
-                continue # Skip empty parts from consecutive slashes
-            if part in node:
-                node = node[part]
-            else:
-                print(f"Path '{'/'.join(parts)}' not found.")
-                return
+        # Determine the full path to the file and look up the directory containing it
+        parts = self._split_path(self._normalize_path(filename))
+        file_name = parts.pop() if parts else ""
+        node = self._resolve_parts(parts)
+        if not isinstance(node, dict):
+            print(f"Path '{'/'.join(parts)}' not found.")
+            return
         if file_name in node and file_name.endswith(".zip"):
             print(f"'{file_name}' is a zipped directory. Use 'unzip' to extract its contents.")
         elif file_name in node and isinstance(node[file_name], str):
@@ -732,7 +910,11 @@ class Terminal:
         elif file_name in node and isinstance(node[file_name], list):
             Utility.clear_screen()
             Utility.hide_cursor()
-            play_ascii_animation(node[file_name], frames_per_second=12, loop_num_times=-2)
+            movie_path = "/" + "/".join(part for part in parts + [file_name] if part)
+            playback_plan = self.playback_plans.get(movie_path)
+            if playback_plan is None or not playback_plan.matches(node[file_name], -2):
+                playback_plan = self.playback_plans[movie_path] = PlaybackPlan(node[file_name], -2)
+            play_ascii_animation(node[file_name], frames_per_second=12, loop_num_times=-2, plan=playback_plan)
             Utility.show_cursor()
         elif file_name in node and isinstance(node[file_name], dict):
             print(f"{file_name} is a directory.")
@@ -762,8 +944,10 @@ class Terminal:
             return
         file_path = args[0]
 
-        full_path = os.path.join(self.current_path, file_path) if not file_path.startswith('/') else file_path
-        parts = full_path.strip('/').split('/')
+        parts = self._split_path(self._normalize_path(file_path))
+        if not parts:
+            print("Cannot remove the root directory.")
+            return
         filename = parts.pop()
         parent_path = '/'.join(parts)
         parent_node = self._get_node_by_path(parent_path)
@@ -775,16 +959,15 @@ class Terminal:
         # Delete the target file or directory
         if filename in parent_node:
             if filename in parent_node and filename.endswith(".zip"):
-                del parent_node[filename]
+                self._delete_node(parts, filename)
                 print(f"File '{filename}' has been deleted.")
             elif isinstance(parent_node[filename], dict) and not recursive:
                 print(f"'{filename}' is a directory. Use '-rf' to remove directories.")
             else:
-                del parent_node[filename]
+                self._delete_node(parts, filename)
                 print(f"File '{filename}' has been deleted.")
         else:
             print(f"File '{filename}' not found.")
-        self.save_filesystem()
 
 
 
@@ -810,8 +993,10 @@ class Terminal:
             return
         dir_path = args[0]
 
-        full_path = os.path.join(self.current_path, dir_path) if not dir_path.startswith('/') else dir_path
-        parts = full_path.strip('/').split('/')
+        parts = self._split_path(self._normalize_path(dir_path))
+        if not parts:
+            print("Cannot remove the root directory.")
+            return
         dirname = parts.pop()
         parent_path = '/'.join(parts)
         parent_node = self._get_node_by_path(parent_path)
@@ -824,7 +1009,7 @@ class Terminal:
         if dirname in parent_node:
             if isinstance(parent_node[dirname], dict):  # It's a directory
                 if recursive or not parent_node[dirname]:  # Recursive or empty
-                    del parent_node[dirname]  # Delete the directory
+                    self._delete_node(parts, dirname)  # Delete the directory
                     print(f"Directory '{dirname}' has been deleted.")
                 else:
                     print(f"Directory '{dirname}' is not empty. Use '-rf' to remove non-empty directories.")
@@ -832,7 +1017,6 @@ class Terminal:
                 print(f"'{dirname}' is a file, not a directory. Use 'rm' to remove files.")
         else:
             print(f"Directory '{dirname}' not found.")
-        self.save_filesystem()
 
     def ssh(self, args):
         """
@@ -852,9 +1036,7 @@ class Terminal:
             Sound.play(Sound.CONNECTING_TO_COMPUTER_OVER_MODEM_SHORT, pause = 9)
             connecting_to_ip_text_thread.stop(1)
             animated_text = f"Terminal with IP address '{ip_address}' not found."
-            ip_address_not_found_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="\n", delay_between_chars=0.03)
-            Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+4), pause=0.083)
-            ip_address_not_found_text_thread.stop(0.5)
+            Animation.type_text_with_sound(animated_text, end_text="\n", pause_after=0.5)
             return
         if target_terminal:
             connecting_to_ip_text_thread = Animation.animated_text(static_text=f"Connecting to {ip_address}", animated_text=f"...", end_text="Connected\n", delay_between_chars=0.2, continue_thread_after_stop_for=0.1)
@@ -876,9 +1058,7 @@ class Terminal:
                     Utility.hide_cursor()
                     target_terminal.in_ssh_session = True
                     animated_text = f"Logged into {target_terminal.terminal_name} terminal as {username}."
-                    logged_in_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="\n", delay_between_chars=0.03)
-                    Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+3), pause=0.083)
-                    logged_in_text_thread.stop(0.5)
+                    Animation.type_text_with_sound(animated_text, end_text="\n", pause_after=0.5)
                     sleep(1)
                     Utility.clear_screen()
                     while not target_terminal.exit_requested:
@@ -909,19 +1089,12 @@ class Terminal:
         Retrieves the node (directory or file) in the filesystem corresponding to the given path.
 
         Args:
-            path (str): The filesystem path to the node.
+            path (str): The filesystem path to the node, taken from the root directory.
 
         Returns:
             The filesystem node corresponding to the path or None if the path does not exist.
         """
-        node = self.filesystem["/"]
-        parts = path.strip('/').split('/')
-        for part in parts:
-            if part in node:
-                node = node[part]
-            else:
-                return None  # Path not found
-        return node
+        return self._resolve_parts(self._split_path(path))
 
 
     def download(self, args=[]):
@@ -943,8 +1116,6 @@ class Terminal:
         target_path = args[0]
         # Call the method to start the download process
         self._start_download(target_path)
-        self.save_filesystem()
-        Terminal.terminals[0].save_filesystem()
 
 
     def _start_download(self, target_path):
@@ -954,27 +1125,21 @@ class Terminal:
         Args:
             target_path (str): The path of the file or directory to download.
         """
-        # Normalize path and find file or directory in the remote filesystem
-        if not target_path.startswith("/"):
-            # Relative path: combine with current_path
-            full_path = os.path.join(self.current_path, target_path).strip("/")
-        else:
-            # Absolute path: start from root
-            full_path = target_path.strip("/")
-
-        node = self.filesystem["/"]  # Start from the root of the filesystem
-        parts = full_path.split("/")
+        # Normalize path and find the directory containing the file or directory in the remote filesystem
+        parts = self._split_path(self._normalize_path(target_path))
+        if not parts:
+            print("Cannot download the root directory.")
+            return
         filename = parts.pop()
-        # If full_path was absolute, parts[0] will be an empty string; skip in loop
-        for part in parts:
-            if part:  # Skip empty strings, which occur if path starts with '/'
-                if part in node:
-                    node = node[part]
-                else:
-                    print(f"Path '{'/'.join(parts[:parts.index(part)+1])}' not found.")
-                    return
+        node = self._resolve_parts(parts)
+        if not isinstance(node, dict):
+            print(f"Path '{'/'.join(parts)}' not found.")
+            return
+        if filename not in node:
+            print(f"'{filename}' not found.")
+            return
 
-        # At this point, 'node' should be the item (file or directory) to download
+        # At this point, 'node' should be the directory holding the item (file or directory) to download
         item_name = filename
         if isinstance(node[item_name], dict):  # It's a directory
             self._zip_and_download_directory(item_name, node[item_name])
@@ -1002,10 +1167,9 @@ class Terminal:
                 zip_name = f"{base_name}_{counter}.zip"
                 counter += 1
 
-            # Simulate zipping by copying the directory under a new '.zip' name
-            user_terminal.filesystem["/"]["home"][user_terminal_username]["Downloads"][zip_name] = directory.copy()
+            # Simulate zipping by sharing the directory under a new '.zip' name; either side copies what it changes later
+            user_terminal._set_node(["home", user_terminal_username, "Downloads"], zip_name, as_directory(directory).share())
             print(f"Directory '{directory_name}' has been downloaded and zipped as '{zip_name}'.")
-            user_terminal.save_filesystem()
 
 
     def _download_file(self, file_name, content):
@@ -1019,9 +1183,8 @@ class Terminal:
         user_terminal = next((t for t in Terminal.terminals if t.is_user_terminal))
         user_terminal_username = user_terminal.valid_users[0].username
         if user_terminal:
-            user_terminal.filesystem["/"]["home"][user_terminal_username]["Downloads"][file_name] = content
+            user_terminal._set_node(["home", user_terminal_username, "Downloads"], file_name, content)
             print(f"File '{file_name}' has been downloaded.")
-            user_terminal.save_filesystem()
 
     def unzip(self, args=[]):
         """
@@ -1035,18 +1198,9 @@ class Terminal:
             return
 
         zip_path = args[0]
-        # Handle both absolute and relative paths
-        if not zip_path.startswith("/"):
-            # It's a relative path; build the full path
-            full_zip_path = os.path.join(self.current_path, zip_path)
-        else:
-            # It's an absolute path
-            full_zip_path = zip_path
-
-        # Normalize path (remove redundant slashes)
-        full_zip_path = os.path.normpath(full_zip_path)
-        # Split the path to get directory path and zip file name
-        dir_path, zip_name = os.path.split(full_zip_path)
+        # Split the full path to get directory path and zip file name
+        dir_path, zip_name = self._normalize_path(zip_path).rsplit("/", 1)
+        dir_path = dir_path or "/"
 
         if not zip_name.endswith('.zip'):
             print("Error: The file is not a .zip file.")
@@ -1067,13 +1221,12 @@ class Terminal:
 
         # 'Unzipping': Check if the zip file contains directory structure
         if isinstance(dir_node[zip_name], dict):
-            # Create a new directory next to the zip file with the same contents
-            dir_node[new_dir_name] = dir_node[zip_name].copy() # Make a copy of the directory content
+            # Create a new directory next to the zip file sharing the same contents
+            self._copy_node([*self._split_path(dir_path), zip_name], self._split_path(dir_path), new_dir_name)
             print(f"'{zip_name}' has been unzipped to '{new_dir_name}' in directory '{dir_path}'.")
         else:
-            dir_node[new_dir_name] = {}  # Make an empty directory
+            self._set_node(self._split_path(dir_path), new_dir_name, {})  # Make an empty directory
             print(f"'{zip_name}' has been unzipped to '{new_dir_name}' in directory '{dir_path}'.")
-        self.save_filesystem()
 
 
 
@@ -1088,11 +1241,10 @@ class Terminal:
             print("No password specified")
             return
         new_password = args[0]
-        self.filesystem["/"]["etc"][".passwd"] = new_password
+        self._set_node(["etc"], ".passwd", new_password)
         if self.active_user != None:
             self.active_user.password = new_password
         print("Password updated successfully.")
-        self.save_filesystem()
 
     def ifconfig(self, args=[]):
         """
@@ -1145,9 +1297,7 @@ class Terminal:
         while True:
             Utility.hide_cursor()
             animated_text = "Are you sure you want to reset the game? This will delete all saved data. (y/n): "
-            create_new_user_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="", delay_between_chars=0.03)
-            Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+7), pause=0.083)
-            create_new_user_text_thread.stop(0.5)
+            Animation.type_text_with_sound(animated_text, end_text="", pause_after=0.5)
             Utility.show_cursor()
             confirmation = input("")
             if confirmation.lower() in ["y", "n", "yes", "no"]:
@@ -1155,23 +1305,22 @@ class Terminal:
             else:
                 Utility.hide_cursor()
                 animated_text = "Invalid choice. Please enter 'y' or 'n'.\n"
-                create_new_user_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="", delay_between_chars=0.03)
-                Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+4), pause=0.083)
-                create_new_user_text_thread.stop(0.5)
+                Animation.type_text_with_sound(animated_text, end_text="", pause_after=0.5)
                 Utility.show_cursor()
         if confirmation.lower() in ["y", "yes"]:
             try:
                 app_support_directory = Utility.get_app_support_directory()
                 filesystem_dir = app_support_directory / "filesystems"
                 filesystem_dir.mkdir(parents=True, exist_ok=True)
-                json_files = glob.glob(str(filesystem_dir / "*.json"))
+                # Stop recording changes first, so no compaction writes a filesystem back after it is deleted
+                for terminal in Terminal.terminals:
+                    terminal.journal.close()
+                json_files = [f for pattern in ("*.json", "*.journal", "*.generation", "*.bak", "*.db", "*.db-wal", "*.db-shm") for f in glob.glob(str(filesystem_dir / pattern))]
                 for f in json_files:
                     os.remove(f)
                 Utility.hide_cursor()
                 animated_text = "Game reset successfully. Exiting game."
-                create_new_user_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="", delay_between_chars=0.03)
-                Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+2), pause=0.083)
-                create_new_user_text_thread.stop(1.5)
+                Animation.type_text_with_sound(animated_text, end_text="", pause_after=1.5)
                 Utility.show_cursor()
                 Utility.clear_screen()
                 sys.exit(0)
@@ -1182,9 +1331,7 @@ class Terminal:
         else:
             Utility.hide_cursor()
             animated_text = "Game reset cancelled."
-            create_new_user_text_thread = Animation.animated_text(static_text="", animated_text=animated_text, end_text="\n", delay_between_chars=0.03)
-            Sound.play(Sound.DIGITAL_TYPING, loop=int((len(animated_text)*0.03*10)+2), pause=0.083)
-            create_new_user_text_thread.stop(1)
+            Animation.type_text_with_sound(animated_text, end_text="\n", pause_after=1)
             Utility.clear_screen()
             Utility.show_cursor()
 
@@ -1197,33 +1344,18 @@ class Terminal:
             filename (str): The name of the file to add or update.
             content (str, optional): The content to be written to the file. Defaults to None.
         """
-        # Ensure the path starts with a slash for consistency
-        if not path.startswith("/"):
-            path = "/" + path
+        # The path is taken from the root directory, with or without a leading slash
+        parts = self._split_path(path)
 
-        parts = path.strip("/").split("/")  # Split the path into parts
-        node = self.filesystem["/"]  # Start from the root
-
-        # Traverse the path, creating directories as needed
-        for part in parts:
-            if part not in node:
-                node[part] = {}  # Create a new directory if it does not exist
-            node = node[part]  # Move down to the next level in the path
+        # Look up the directory, creating directories as needed
+        node = self._make_directories(parts)
 
         # Check if the file exists and if its content is different
-        if filename in node:
-            if node[filename] == content:
-                # The file exists with the same content; do nothing
-                return
-            else:
-                # The file exists but with different content; update it
-                node[filename] = content
-        else:
-            # The file does not exist; add it
-            node[filename] = content if content is not None else None
-
-        # Save the updated filesystem
-        self.save_filesystem()
+        if filename in node and node[filename] == content:
+            # The file exists with the same content; do nothing
+            return
+        # The file does not exist or has different content; add or update it
+        self._set_node(parts, filename, content)
 
     def echo(self, args):
         """
@@ -1248,16 +1380,11 @@ class Terminal:
         # Remove leading and trailing quotes from text
         text = text.strip("\"")
 
-        # Normalize the file path
-        if not file_path.startswith("/"):
-            # Relative path: combine with current_path
-            full_path = os.path.join(self.current_path, file_path).strip("/")
-        else:
-            # Absolute path
-            full_path = file_path.strip("/")
-
-        # Split the path to get the directory and file name
-        parts = full_path.split("/")
+        # Normalize the file path and split it to get the directory and file name
+        parts = self._split_path(self._normalize_path(file_path))
+        if not parts:
+            print("Cannot write to '/': Is a directory.")
+            return
         filename = parts.pop()
         dir_path = "/".join(parts)
 
@@ -1277,20 +1404,19 @@ class Terminal:
 
         # Write or append to the file
         if mode == "overwrite":
-            node[filename] = text  # Overwrite or create the file
+            self._set_node(parts, filename, text)  # Overwrite or create the file
             print(f"Written to '{filename}'.")
         elif mode == "append":
             if filename in node:
-                node[filename] += "\n" + text  # Append to the existing file
+                self._set_node(parts, filename, node[filename] + "\n" + text)  # Append to the existing file
             else:
-                node[filename] = text  # Create a new file if it does not exist
+                self._set_node(parts, filename, text)  # Create a new file if it does not exist
             print(f"Appended to '{filename}'.")
 
-        self.save_filesystem()
-
     def find(self, args=[]):
         """
-        Searches for files or directories within the filesystem that match the provided search term.
+        Searches for files or directories within the filesystem whose name contains the provided search term,
+        or matches it if the term is a glob pattern such as '*.log'. The search uses the name index instead of walking the filesystem.
 
         Args:
             args (list): A list containing the search term and, optionally, a path to limit the search.
@@ -1310,46 +1436,18 @@ class Terminal:
             print("Missing filename argument.")
 
         search_term = args[0]
-        start_path = self.current_path
+        # Search the current directory, or the absolute or relative path if one is given
+        start_path = self._normalize_path(args[1]) if len(args) > 1 else self.current_path
 
-        # Check if a path argument is given
-        if len(args) > 1:
-            # Check if the provided path is absolute or relative
-            if args[1].startswith('/'):
-                start_path = args[1]
-            else:
-                # If the path is not absolute, construct it relative to the current directory
-                start_path = os.path.join(self.current_path, args[1]).replace("//", "/")
-
-        def _search_directory(directory, term, show_hidden, path):
-            found_items = []
-            for item, content in directory.items():
-                # Construct the full path of the item
-                item_path = os.path.join(path, item).replace("//", "/")
-                # Check if the item is a directory or a file
-                if isinstance(content, dict): # it's a directory
-                    if (show_hidden or not item.startswith(".")) and term in item:
-                        found_items.append(item_path + '/')
-                    # Recursively search in the directory
-                    found_items += _search_directory(content, term, show_hidden, item_path)
-                else:   # File
-                    if (show_hidden or not item.startswith(".")) and term in item:
-                        found_items.append(item_path)
-            return found_items
-
-        # Convert start_path to directory structures
-        parts = start_path.strip("/").split("/")
-        node = self.filesystem["/"]
-        for part in parts:
-            if part: # avoid empty strings
-                try:
-                    node = node[part]
-                except KeyError:
-                    print(f"Path '{start_path}' not found.")
-                    return
+        # Look up the directory to search
+        node = self._resolve_path(start_path)
+        if not isinstance(node, dict):
+            print(f"Path '{start_path}' not found.")
+            return
 
-        # Perform the search
-        found_paths = _search_directory(node, search_term, show_hidden, start_path)
+        # Perform the search with the database or the name index, marking directories with a trailing slash
+        name_index = self.database if self.database is not None else self._get_name_index()
+        found_paths = [path + "/" if is_directory else path for path, is_directory in name_index.search(search_term, start_path, show_hidden)]
         if found_paths:
             for path in found_paths:
                 print(path)
@@ -1370,25 +1468,16 @@ class Terminal:
             content (str): The content to append to the file.
         """
 
-        # Ensure path consistency and load or create the filesystem
-        full_path = os.path.join(path, filename).strip("/")
-        parts = full_path.split("/")
+        # Ensure path consistency and look up or create the directory
+        parts = self._split_path(path + "/" + filename)
         file_name = parts.pop()  # Remove the file name from the path
-        node = self.filesystem["/"]
-
-        # Traverse or create the path
-        for part in parts:
-            if part not in node:
-                node[part] = {}
-            node = node[part]
+        node = self._make_directories(parts)
 
         # Append to the file
         if file_name in node:
-            node[file_name] += "\n" + content  # Start content on a new line
+            self._set_node(parts, file_name, node[file_name] + "\n" + content)  # Start content on a new line
         else:
-            node[file_name] = content
-
-        self.save_filesystem()
+            self._set_node(parts, file_name, content)
 
     def clear_screen(self, args=[]):
         """
@@ -1406,14 +1495,14 @@ class Terminal:
         Args:
             args (list): Additional arguments passed to the method, not used in this implementation.
         """
-        self._animate_typing_text_with_sound("Exiting terminal", end_text="", delay_between_chars=0.03, loop_offset=1)
+        self._animate_typing_text_with_sound("Exiting terminal", end_text="", delay_between_chars=0.03)
         text_animation_thread = Animation.animated_text(static_text="Exiting terminal", animated_text="...", end_text="\n", delay_between_chars=0.1, continue_thread_after_stop_for=1)
         text_animation_thread.stop(0.01)
         self.save_filesystem()
         sleep(1)
         self.exit_requested = True
 
-    def _animate_typing_text_with_sound(self, text, end_text = "\n", delay_between_chars=0.03, loop_offset = 0):
+    def _animate_typing_text_with_sound(self, text, end_text = "\n", delay_between_chars=0.03):
         """
         Simulates typing text on the terminal with accompanying sound effects.
 
@@ -1421,12 +1510,9 @@ class Terminal:
             text (str): The text to animate.
             end_text (str, optional): Text to append after the animation ends. Defaults to newline.
             delay_between_chars (float, optional): The delay between each character's appearance.
-            loop_offset (int, optional): Additional loops of typing sound after the text is completed.
         """
         Utility.hide_cursor()
-        animated_text_thread = Animation.animated_text(static_text="", animated_text=text, end_text=end_text, delay_between_chars=delay_between_chars, continue_thread_after_stop_for=0)
-        Sound.play(Sound.DIGITAL_TYPING, loop=int((len(text)*0.03*10) + loop_offset), pause=0.083)
-        animated_text_thread.stop(0.0)
+        Animation.type_text_with_sound(text, end_text=end_text, delay_between_chars=delay_between_chars)
 
     def update_mission_state(self, mission_id, completed: bool):
         """
@@ -1439,11 +1525,11 @@ class Terminal:
         # Special directory name that is hidden from the user
         hidden_dir = ".game_states"
         if hidden_dir not in self.filesystem["/"]:
-            self.filesystem["/"][hidden_dir] = {}
+            self._set_node([], hidden_dir, {})
 
-        # Update the mission state
-        self.filesystem["/"][hidden_dir][mission_id] = completed
-        self.save_filesystem()
+        # Update the mission state, unless it is already saved
+        if self.filesystem["/"][hidden_dir].get(mission_id) != completed:
+            self._set_node([hidden_dir], mission_id, completed)
 
     def is_mission_completed(self, mission_id):
         """
@@ -1457,6 +1543,8 @@ class Terminal:
         """
         # Special directory name that is hidden from the user
         hidden_dir = ".game_states"
+        if self.database is not None:
+            return self.database.read(f"/{hidden_dir}/{mission_id}", False)
         if hidden_dir in self.filesystem["/"]:
             return self.filesystem["/"][hidden_dir].get(mission_id, False)
         return False
@@ -38,7 +38,10 @@ class TextColor(Enum):
         Returns:
             TextColor: An instance of the TextColor enum representing a random color.
         """
-        return choice([color for color in cls if color != cls.RAINBOW])
+        return choice(_SOLID_COLORS)
 
 
- 
\ No newline at end of file
+ 
+
+# Every color TextColor.random picks from, built once
+_SOLID_COLORS = tuple(color for color in TextColor if color != TextColor.RAINBOW)
@@ -0,0 +1,92 @@
+from functools import lru_cache
+from text_color import TextColor
+
+def _character_colors(text: str, style: TextColor, rainbow_index: int = 0) -> tuple[list[str], int]:
+    """
+    Works out the color escape code of every character of a text, cycling through the rainbow colors if the style is RAINBOW.
+
+    Parameters:
+        text (str): The text to style.
+        style (TextColor): The style of the text.
+        rainbow_index (int): The rainbow color the first character gets when the style is RAINBOW.
+
+    Returns:
+        tuple[list[str], int]: The color of each character, and the rainbow color the next character would get.
+    """
+    if style != TextColor.RAINBOW:
+        return [style.value] * len(text), rainbow_index
+    rainbow = TextColor.RAINBOW.value
+    colors = [rainbow[(rainbow_index + offset) % len(rainbow)] for offset in range(len(text))]
+    return colors, (rainbow_index + len(text)) % len(rainbow)
+
+@lru_cache(maxsize=1024)
+def style_text(text: str, style: TextColor, rainbow_index: int = 0) -> str:
+    """
+    Styles a text with a color, or with a rainbow of colors. Adjacent characters of the same color share one escape code, whitespace
+    never gets a code of its own since it shows no color, and the text ends with a single reset.
+
+    Parameters:
+        text (str): The text to style.
+        style (TextColor): The style of the text.
+        rainbow_index (int): The rainbow color the first character gets when the style is RAINBOW.
+
+    Returns:
+        str: The styled text.
+    """
+    colors, _next_rainbow_index = _character_colors(text, style, rainbow_index)
+    styled_text = []
+    active_color = None
+    for char, color in zip(text, colors):
+        if color != active_color and not char.isspace():
+            styled_text.append(color)
+            active_color = color
+        styled_text.append(char)
+    if active_color is None and style != TextColor.RAINBOW:
+        styled_text.insert(0, style.value)
+    styled_text.append(TextColor.RESET.value)
+    return "".join(styled_text)
+
+@lru_cache(maxsize=1024)
+def style_text_bytes(text: str, style: TextColor, rainbow_index: int = 0) -> bytes:
+    """
+    Styles a text like style_text and encodes it, ready to be written to the terminal.
+
+    Parameters:
+        text (str): The text to style.
+        style (TextColor): The style of the text.
+        rainbow_index (int): The rainbow color the first character gets when the style is RAINBOW.
+
+    Returns:
+        bytes: The encoded styled text.
+    """
+    return style_text(text, style, rainbow_index).encode("utf-8")
+
+@lru_cache(maxsize=256)
+def style_glyphs(text: str, style: TextColor, rainbow_index: int = 0) -> tuple[tuple[bytes, ...], int]:
+    """
+    Styles each character of a text on its own, for typing it out one character at a time.
+    Every glyph sets its own color, so it draws correctly whatever was written before it. No glyph resets the color; write a reset once the text is complete.
+
+    Parameters:
+        text (str): The text to style.
+        style (TextColor): The style of the text.
+        rainbow_index (int): The rainbow color the first character gets when the style is RAINBOW.
+
+    Returns:
+        tuple[tuple[bytes, ...], int]: The encoded glyphs, and the rainbow color the character after the text would get.
+    """
+    colors, next_rainbow_index = _character_colors(text, style, rainbow_index)
+    return tuple((color + char).encode("utf-8") for char, color in zip(text, colors)), next_rainbow_index
+
+def next_rainbow_index(text: str, rainbow_index: int = 0) -> int:
+    """
+    Returns the rainbow color the character after a rainbow text gets.
+
+    Parameters:
+        text (str): The rainbow text.
+        rainbow_index (int): The rainbow color the first character of the text gets.
+
+    Returns:
+        int: The rainbow color of the next character.
+    """
+    return (rainbow_index + len(text)) % len(TextColor.RAINBOW.value)
@@ -1,5 +1,6 @@
 from datetime import datetime
 import os, sys
+import shutil
 from pathlib import Path
 import threading
 from time import sleep
@@ -19,6 +20,18 @@ class Utility:
         """
         os.system(f"printf '\e[8;{height};{width}t'")
     
+    @staticmethod
+    def get_terminal_size() -> tuple[int, int]:
+        """
+        Gets the size of the terminal the game is running in.
+        When the size cannot be detected, e.g. when output is redirected, the size set by set_terminal_window_size in main.py is assumed.
+
+        Returns:
+            tuple[int, int]: The number of columns and lines of the terminal.
+        """
+        terminal_size = shutil.get_terminal_size(fallback=(150, 46))
+        return terminal_size.columns, terminal_size.lines
+
     @staticmethod
     def get_current_time():
         """
@@ -66,6 +79,29 @@ class Utility:
         sys.stdout.write(f"\033[{num_lines + 1}A")
 
 
+    @staticmethod
+    def write_bytes(data: bytes):
+        """
+        Writes pre-encoded output straight to the terminal with as few system calls as possible, bypassing the text layer of sys.stdout.
+        Any text still buffered in sys.stdout is flushed first so output stays in order.
+
+        Args:
+            data (bytes): The encoded output to write.
+        """
+        sys.stdout.flush()
+        try:
+            file_descriptor = sys.stdout.fileno()
+        except (AttributeError, OSError, ValueError):
+            # sys.stdout has been replaced by something without a file descriptor, e.g. when output is captured
+            sys.stdout.write(data.decode("utf-8"))
+            sys.stdout.flush()
+            return
+        view = memoryview(data)
+        while view:
+            # os.write may write only part of the data to a pipe or a busy terminal
+            written = os.write(file_descriptor, view)
+            view = view[written:]
+
     @staticmethod
     def hide_cursor():
         """